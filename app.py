@@ -4,6 +4,7 @@ import streamlit as st
 from src.chain.rag_chain import prepare_context, stream_answer
 from src.config import CLASSIFIER_MODEL, LLM_MODEL, validate_env
 from src.security import validate_user_input
+from src.utils.chat_history import ChatHistory
 
 # 환경 변수 검증
 validate_env()
@@ -63,8 +64,8 @@ def _truncate_ingredient_section(answer: str) -> str:
     return updated
 
 # 4. 세션 상태 초기화
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+if "history" not in st.session_state:
+    st.session_state.history = ChatHistory()
 if "disclaimer_accepted" not in st.session_state:
     st.session_state.disclaimer_accepted = False
 
@@ -196,7 +197,7 @@ with st.sidebar:
     )
 
     if st.button("대화 초기화"):
-        st.session_state.messages = []
+        st.session_state.history.clear()
         st.rerun()
 
 # 6. 메인 영역 제목
@@ -204,44 +205,62 @@ st.title("💊 FDA 의약품 정보 Q&A")
 st.caption("OpenFDA 데이터베이스 실시간 검색 기반")
 
 # 7. 대화 기록 표시 (상세 출처 표시 로직 포함)
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        content = message["content"]
-        
-        # 나머지 성분 부분을 expander로 분리하여 렌더링
-        if "**📋 나머지 성분 목록" in content:
-            parts = content.split("**📋 나머지 성분 목록")
-            st.markdown(parts[0], unsafe_allow_html=True)
-            
-            expander_content = "**📋 나머지 성분 목록" + parts[1].split("---")[0]
-            remaining_content = "---".join(parts[1].split("---")[1:]) if "---" in parts[1] else ""
-            
-            title_line = expander_content.split("\n")[0]
-            items = "\n".join([line for line in expander_content.split("\n")[1:] if line.strip()])
-            
-            with st.expander(title_line):
-                st.markdown(items, unsafe_allow_html=True)
-            
-            if remaining_content.strip():
-                st.markdown(remaining_content, unsafe_allow_html=True)
+def _render_answer(content: str):
+    """답변 렌더링 (나머지 성분 부분은 expander로 분리)"""
+    if "**📋 나머지 성분 목록" in content:
+        parts = content.split("**📋 나머지 성분 목록")
+        st.markdown(parts[0], unsafe_allow_html=True)
+
+        expander_content = "**📋 나머지 성분 목록" + parts[1].split("---")[0]
+        remaining_content = "---".join(parts[1].split("---")[1:]) if "---" in parts[1] else ""
+
+        title_line = expander_content.split("\n")[0]
+        items = "\n".join([line for line in expander_content.split("\n")[1:] if line.strip()])
+
+        with st.expander(title_line):
+            st.markdown(items, unsafe_allow_html=True)
+
+        if remaining_content.strip():
+            st.markdown(remaining_content, unsafe_allow_html=True)
+    else:
+        st.markdown(content, unsafe_allow_html=True)
+
+
+def _render_search_info(turn):
+    """검색 정보와 원본 데이터(출처) 표시"""
+    if turn.search_info:
+        info = turn.search_info
+        st.caption(f"🔍 검색: {info['category']} → \"{info['keyword']}\"")
+
+    if turn.sources:
+        with st.expander("📋 원본 데이터 보기"):
+            for i, (brand, generic, manufacturer) in enumerate(turn.sources, 1):
+                st.markdown(f"**{i}. {brand}** ({generic})")
+                st.caption(f"제조사: {manufacturer}")
+
+
+history = st.session_state.history
+
+# 오래된 턴은 요약만 보관 → 펼쳤을 때만 렌더링
+if history.archived_count:
+    if st.toggle(f"이전 대화 {history.archived_count}개 보기", key="show_archived_turns"):
+        if history.dropped:
+            st.caption(f"(가장 오래된 대화 {history.dropped}개는 보관 한도를 넘어 삭제되었습니다)")
+        for summary in history.summaries:
+            st.markdown(f"**Q.** {summary.question}")
+            st.caption(summary.answer_preview)
+
+for turn in history.turns:
+    with st.chat_message("user"):
+        st.markdown(turn.question)
+    with st.chat_message("assistant"):
+        if turn.error:
+            st.error(turn.error)
+        elif turn.pending:
+            st.caption("(답변 생성이 중단되었습니다)")
         else:
-            st.markdown(content, unsafe_allow_html=True)
-        
-        # Assistant 메시지인 경우 검색 정보와 원본 데이터 표시 (app.py 기능)
-        if message["role"] == "assistant":
-            if "search_info" in message:
-                info = message["search_info"]
-                st.caption(f"🔍 검색: {info['category']} → \"{info['keyword']}\"")
-
-            if "sources" in message and message["sources"]:
-                with st.expander("📋 원본 데이터 보기"):
-                    for i, src in enumerate(message["sources"][:3], 1):
-                        openfda = src.get("openfda", {})
-                        brand = openfda.get("brand_name", ["N/A"])[0] if openfda.get("brand_name") else "N/A"
-                        generic = openfda.get("generic_name", ["N/A"])[0] if openfda.get("generic_name") else "N/A"
-                        manufacturer = openfda.get("manufacturer_name", ["N/A"])[0] if openfda.get("manufacturer_name") else "N/A"
-                        st.markdown(f"**{i}. {brand}** ({generic})")
-                        st.caption(f"제조사: {manufacturer}")
+            _render_answer(turn.answer)
+        _render_search_info(turn)
 
 # 8. 공통 답변 생성 로직 함수 (중복 제거를 위해 정의)
 def process_user_input(user_query):
@@ -253,38 +272,52 @@ def process_user_input(user_query):
 
     safe_input = validation.sanitized_input
 
-    # 사용자 메시지 추가 및 표시
-    st.session_state.messages.append({"role": "user", "content": safe_input})
+    # 질문은 답변 생성 전에 기록 (생성 실패/중단 시에도 대화 기록에 남음)
+    history = st.session_state.history
+    turn = history.add_question(safe_input)
+
+    # 사용자 메시지 표시
     with st.chat_message("user"):
         st.markdown(safe_input)
 
     # 답변 생성 및 표시
+    context_data = None
     with st.chat_message("assistant"):
-        with st.spinner("OpenFDA 데이터베이스 검색 중..."):
-            context_data = prepare_context(safe_input)
-
-        response_placeholder = st.empty()
-        full_response = ""
-
-        for chunk in stream_answer(context_data):
-            full_response += chunk
-            response_placeholder.markdown(full_response + "▌", unsafe_allow_html=True)
-
-        full_response = _truncate_ingredient_section(full_response)
-        response_placeholder.markdown(full_response, unsafe_allow_html=True)
-
-    # 메시지 저장 (출처 정보 포함)
-    st.session_state.messages.append({
-        "role": "assistant",
-        "content": full_response,
-        "sources": context_data.get("raw_results", [])[:5],
-        "search_info": {
-            "category": context_data["category"],
-            "keyword": context_data["keyword"],
-        }
-    })
+        try:
+            with st.spinner("OpenFDA 데이터베이스 검색 중..."):
+                context_data = prepare_context(safe_input)
+
+            response_placeholder = st.empty()
+            full_response = ""
+
+            for chunk in stream_answer(context_data):
+                full_response += chunk
+                response_placeholder.markdown(full_response + "▌", unsafe_allow_html=True)
+
+            full_response = _truncate_ingredient_section(full_response)
+            response_placeholder.markdown(full_response, unsafe_allow_html=True)
+        except Exception as e:
+            history.fail_turn(
+                turn,
+                f"답변 생성 중 오류가 발생했습니다: {type(e).__name__}",
+                search_info=_search_info(context_data),
+            )
+        else:
+            # 턴 저장 (출처는 화면 표시용 요약만)
+            history.complete_turn(
+                turn,
+                full_response,
+                context_data.get("raw_results", []),
+                search_info=_search_info(context_data),
+            )
     st.rerun()
 
+
+def _search_info(context_data):
+    if context_data is None:
+        return None
+    return {"category": context_data["category"], "keyword": context_data["keyword"]}
+
 # 9. 입력 이벤트 처리
 # 예시 질문 클릭 시
 if "pending_question" in st.session_state:
@@ -0,0 +1,81 @@
+"""
+Homeopathy 필터 벤치마크
+기존 중첩 루프 구현과 LabelFilter를 limit 크기별로 비교 (API 호출 없음, 합성 데이터 사용)
+
+사용법:
+    python -m evaluation.scripts.benchmark_label_filter
+"""
+import random
+import string
+import timeit
+
+from src.api.label_filter import LabelFilter
+
+LIMITS = [20, 100, 500, 1000]
+SPL_ELEMENT_CHARS = 20_000  # 실제 spl_product_data_elements는 수만 자까지 길어짐
+HOMEOPATHIC_RATIO = 0.1
+
+
+def legacy_filter(results: list[dict]) -> list[dict]:
+    """기존 OpenFDAClient.search_drug_label 내부 필터 (비교 기준)"""
+    filtered_results = []
+    for result in results:
+        is_homeopathic = False
+        openfda = result.get("openfda", {})
+        if not openfda:
+            is_homeopathic = True
+        if not is_homeopathic:
+            product_types = openfda.get("product_type", [])
+            for pt in product_types:
+                pt_lower = pt.lower()
+                if "homeopathic" in pt_lower or "unapproved homeopathic" in pt_lower:
+                    is_homeopathic = True
+                    break
+        if not is_homeopathic:
+            is_drug = any("human" in pt.lower() and "drug" in pt.lower() for pt in product_types)
+            if is_drug and not openfda.get("application_number"):
+                is_homeopathic = True
+        if not is_homeopathic:
+            spl_elements = result.get("spl_product_data_elements", [])
+            if isinstance(spl_elements, list):
+                for elem in spl_elements:
+                    elem_lower = elem.lower()
+                    if "homeopathic" in elem_lower or "unapproved homeopathic" in elem_lower:
+                        is_homeopathic = True
+                        break
+        if not is_homeopathic:
+            filtered_results.append(result)
+    return filtered_results
+
+
+def make_results(n: int, rng: random.Random) -> list[dict]:
+    """합성 라벨 결과 생성 (일부는 spl 텍스트 끝에 HOMEOPATHIC 포함)"""
+    results = []
+    for _ in range(n):
+        text = "".join(rng.choices(string.ascii_letters + " ", k=SPL_ELEMENT_CHARS))
+        if rng.random() < HOMEOPATHIC_RATIO:
+            text += " HOMEOPATHIC"
+        results.append({
+            "openfda": {
+                "product_type": ["HUMAN OTC DRUG"],
+                "application_number": ["M013"],
+            },
+            "spl_product_data_elements": [text, "inactive ingredients water"],
+        })
+    return results
+
+
+def main():
+    rng = random.Random(42)
+    label_filter = LabelFilter()
+    print(f"{'limit':>6} {'legacy(ms)':>12} {'LabelFilter(ms)':>16} {'speedup':>8}")
+    for limit in LIMITS:
+        results = make_results(limit, rng)
+        assert legacy_filter(results) == label_filter.filter(results)
+        legacy = min(timeit.repeat(lambda: legacy_filter(results), number=5, repeat=3)) / 5
+        new = min(timeit.repeat(lambda: label_filter.filter(results), number=5, repeat=3)) / 5
+        print(f"{limit:>6} {legacy * 1000:>12.2f} {new * 1000:>16.2f} {legacy / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
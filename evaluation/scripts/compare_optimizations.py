@@ -1,6 +1,8 @@
 """
 여러 최적화 버전을 일괄 비교 평가하는 스크립트
+분류 + OpenFDA 검색은 질문당 한 번만 수행하고, 설정별로 후처리와 답변 생성만 다시 실행
 """
+import argparse
 import json
 import sys
 from datetime import datetime
@@ -20,9 +22,17 @@ from ragas.metrics import (
 from datasets import Dataset
 
 # 프로젝트 모듈
-from src.chain.optimized_rag_chain import prepare_context, generate_answer
-from src.config import validate_env
+from src.chain.optimized_rag_chain import (
+    Retrieval,
+    retrieve,
+    retrieval_limit,
+    prepare_context_from,
+    generate_answer,
+)
+from src.config import validate_env, PARALLEL_WORKERS
 from src.optimization_config import ALL_CONFIGS
+from src.api.rate_limiter import PRIORITY_BATCH
+from src.utils.parallel import run_parallel
 
 # Colorama 초기화
 init(autoreset=True)
@@ -57,36 +67,84 @@ def load_test_dataset(filepath: str) -> List[Dict]:
     return data
 
 
-def generate_rag_responses_for_config(test_data: List[Dict], config) -> List[Dict]:
-    """특정 설정으로 RAG 답변 생성"""
-    results = []
-    
+def retrieve_all(
+    test_data: List[Dict], configs, workers: int = PARALLEL_WORKERS, checkpoint: str = None
+) -> List[Retrieval]:
+    """
+    모든 질문의 분류 + 검색을 한 번씩 수행 (모든 설정이 필요로 하는 최대 개수까지)
+    실패한 질문은 None (해당 질문은 모든 설정에서 실패로 처리)
+    checkpoint를 지정하면 검색 결과를 기록해 두고 다시 실행할 때 재사용
+    (모든 설정의 답변 생성이 끝날 때까지 유지, main()에서 정리)
+    """
+    limit = retrieval_limit(configs)
+
+    def failed_item(item: Dict, error: BaseException) -> None:
+        print_error(f"검색 실패: {item['question'][:30]}... - {str(error)}")
+        return None
+
+    with tqdm(total=len(test_data), desc="분류 + 검색", bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}') as pbar:
+        results = run_parallel(
+            lambda item: retrieve(item['question'], limit).to_dict(),
+            test_data,
+            workers=workers,
+            key=lambda i, item: f"{i}:{limit}:{item['question']}",
+            checkpoint=checkpoint,
+            on_error=failed_item,
+            on_done=lambda i, result: pbar.update(1),
+            priority=PRIORITY_BATCH,
+            keep_checkpoint=True,
+        )
+    return [Retrieval.from_dict(result) if result is not None else None for result in results]
+
+
+def generate_rag_responses_for_config(
+    test_data: List[Dict],
+    config,
+    retrievals: List[Retrieval],
+    workers: int = PARALLEL_WORKERS,
+    checkpoint: str = None,
+) -> List[Dict]:
+    """
+    미리 가져온 검색 결과(retrievals)에 설정별 후처리를 적용해 답변 생성
+    (workers개 동시 처리, 결과는 데이터셋 순서, checkpoint를 지정하면 중단된 실행을 이어서 처리)
+    checkpoint는 다른 설정이 끝날 때까지 유지 (뒤 설정에서 중단돼도 앞 설정은 다시 생성하지 않음)
+    """
+    def answer_item(pair) -> Dict:
+        item, retrieval = pair
+        if retrieval is None:
+            raise RuntimeError("분류/검색 단계 실패")
+        context_data = prepare_context_from(retrieval, config)
+        answer = generate_answer(context_data, config)
+        return {
+            'question': item['question'],
+            'answer': answer,
+            'contexts': [context_data['context']],
+            'ground_truth': item['ground_truth'],
+        }
+
+    def failed_item(pair, error: BaseException) -> Dict:
+        item, _ = pair
+        print_error(f"질문 처리 실패: {item['question'][:30]}... - {str(error)}")
+        return {
+            'question': item['question'],
+            'answer': "답변 생성 실패",
+            'contexts': [""],
+            'ground_truth': item['ground_truth'],
+        }
+
     desc = f"{config.name} 답변 생성"
-    for item in tqdm(test_data, desc=desc, bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}'):
-        question = item['question']
-        
-        try:
-            context_data = prepare_context(question, config)
-            answer = generate_answer(context_data, config)
-            
-            result = {
-                'question': question,
-                'answer': answer,
-                'contexts': [context_data['context']],
-                'ground_truth': item['ground_truth'],
-            }
-            results.append(result)
-            
-        except Exception as e:
-            print_error(f"질문 처리 실패: {question[:30]}... - {str(e)}")
-            results.append({
-                'question': question,
-                'answer': "답변 생성 실패",
-                'contexts': [""],
-                'ground_truth': item['ground_truth'],
-            })
-    
-    return results
+    with tqdm(total=len(test_data), desc=desc, bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}') as pbar:
+        return run_parallel(
+            answer_item,
+            list(zip(test_data, retrievals)),
+            workers=workers,
+            key=lambda i, pair: f"{i}:{pair[0]['question']}",
+            checkpoint=checkpoint,
+            on_error=failed_item,
+            on_done=lambda i, result: pbar.update(1),
+            priority=PRIORITY_BATCH,
+            keep_checkpoint=True,
+        )
 
 
 def evaluate_config(results: List[Dict], config_name: str) -> Dict:
@@ -204,6 +262,11 @@ def save_comparison_results(all_results: Dict[str, Dict], df: pd.DataFrame, outp
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="RAG 최적화 버전 일괄 비교 평가")
+    parser.add_argument("--workers", type=int, default=PARALLEL_WORKERS, help="동시 답변 생성 수")
+    parser.add_argument("--fresh", action="store_true", help="이전 실행의 중간 결과를 버리고 처음부터 생성")
+    args = parser.parse_args()
+
     print_header("🔬 RAG 최적화 버전 일괄 비교 평가")
     
     # 환경 변수 검증
@@ -219,6 +282,9 @@ def main():
     test_dataset_path = base_dir / "test_dataset.json"
     output_dir = base_dir / "evaluation_results"
     output_dir.mkdir(exist_ok=True)
+    if args.fresh:
+        for checkpoint_path in output_dir.glob("*.checkpoint.jsonl"):
+            checkpoint_path.unlink()
     
     try:
         # 1. 테스트 데이터셋 로드
@@ -226,7 +292,15 @@ def main():
         test_data = load_test_dataset(str(test_dataset_path))
         print_success(f"{len(test_data)}개 테스트 케이스 로드")
         
-        # 2. 각 설정별로 평가
+        # 2. 분류 + 검색 (모든 설정 공통, 질문당 한 번)
+        print_progress(f"분류 + 검색 중... (질문당 최대 {retrieval_limit(ALL_CONFIGS)}건)")
+        retrievals = retrieve_all(
+            test_data, ALL_CONFIGS, workers=args.workers,
+            checkpoint=str(output_dir / "retrieval.checkpoint.jsonl"),
+        )
+        print_success(f"{sum(r is not None for r in retrievals)}/{len(retrievals)}개 질문 검색 완료")
+
+        # 3. 각 설정별로 후처리 + 답변 생성 + 평가
         print_header(f"📝 {len(ALL_CONFIGS)}개 설정 평가 시작")
         
         all_results = {}
@@ -236,7 +310,10 @@ def main():
             
             # 답변 생성
             print_progress("답변 생성 중...")
-            rag_results = generate_rag_responses_for_config(test_data, config)
+            checkpoint_path = output_dir / f"{config.name}.checkpoint.jsonl"
+            rag_results = generate_rag_responses_for_config(
+                test_data, config, retrievals, workers=args.workers, checkpoint=str(checkpoint_path)
+            )
             print_success(f"{len(rag_results)}개 답변 생성 완료")
             
             # 평가
@@ -253,11 +330,15 @@ def main():
                 if 'answer_relevancy' in eval_result:
                     print(f"  Answer Relevancy: {eval_result['answer_relevancy']:.4f}")
         
-        # 3. 비교 결과 출력
+        # 모든 설정의 답변 생성이 끝났으므로 중간 결과 정리
+        for checkpoint_path in output_dir.glob("*.checkpoint.jsonl"):
+            checkpoint_path.unlink()
+
+        # 4. 비교 결과 출력
         if all_results:
             df = compare_results(all_results)
             
-            # 4. 결과 저장
+            # 5. 결과 저장
             save_comparison_results(all_results, df, output_dir)
         
         print_header("✅ 모든 평가 완료")
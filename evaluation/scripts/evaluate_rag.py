@@ -2,6 +2,7 @@
 RAG 시스템 평가 스크립트
 Ragas 라이브러리를 사용한 의약품 정보 Q&A 시스템 평가
 """
+import argparse
 import json
 import sys
 import asyncio
@@ -25,7 +26,10 @@ from datasets import Dataset
 
 # 프로젝트 모듈
 from src.chain.rag_chain import prepare_context, generate_answer
-from src.config import validate_env
+from src.chain.answer_cache import get_answer_cache
+from src.config import validate_env, PARALLEL_WORKERS
+from src.api.rate_limiter import PRIORITY_BATCH
+from src.utils.parallel import run_parallel
 
 # Colorama 초기화 (Windows 호환)
 init(autoreset=True)
@@ -70,40 +74,50 @@ def load_test_dataset(filepath: str) -> List[Dict]:
     print_success(f"총 {len(data)}개의 테스트 케이스 로드 완료")
     return data
 
-def generate_rag_responses(test_data: List[Dict]) -> List[Dict]:
-    """RAG 시스템으로 답변 생성"""
-    print_progress("RAG 시스템 답변 생성 중...")
-    
-    results = []
-    
+def _answer_item(item: Dict) -> Dict:
+    """질문 하나의 컨텍스트 준비 + 답변 생성 (Ragas 평가 형식)"""
+    context_data = prepare_context(item['question'])
+    answer = generate_answer(context_data)
+    return {
+        'question': item['question'],
+        'answer': answer,
+        'contexts': [context_data['context']],  # 리스트 형태로
+        'ground_truth': item['ground_truth'],
+    }
+
+def _failed_item(item: Dict, error: BaseException) -> Dict:
+    """재시도 후에도 실패한 질문은 빈 답변으로 추가"""
+    print_error(f"질문 처리 실패: {item['question'][:50]}... - {str(error)}")
+    return {
+        'question': item['question'],
+        'answer': "답변 생성 실패",
+        'contexts': [""],
+        'ground_truth': item['ground_truth'],
+    }
+
+def generate_rag_responses(test_data: List[Dict], workers: int = PARALLEL_WORKERS, checkpoint: str = None) -> List[Dict]:
+    """
+    RAG 시스템으로 답변 생성 (workers개 동시 처리, 결과는 데이터셋 순서)
+    checkpoint를 지정하면 중단된 실행을 이어서 처리
+    """
+    print_progress(f"RAG 시스템 답변 생성 중... (동시 {workers}개)")
+
+    # 답변 캐시를 끄고 모든 질문을 실제 파이프라인으로 생성 (비슷한 질문의 재사용이 지표를 왜곡하지 않도록)
+    get_answer_cache().enabled = False
+
     # tqdm을 사용한 진행 표시
-    for item in tqdm(test_data, desc="답변 생성", bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]'):
-        question = item['question']
-        
-        try:
-            # 컨텍스트 준비 및 답변 생성
-            context_data = prepare_context(question)
-            answer = generate_answer(context_data)
-            
-            # Ragas 평가에 필요한 형식으로 구성
-            result = {
-                'question': question,
-                'answer': answer,
-                'contexts': [context_data['context']],  # 리스트 형태로
-                'ground_truth': item['ground_truth'],
-            }
-            results.append(result)
-            
-        except Exception as e:
-            print_error(f"질문 처리 실패: {question[:50]}... - {str(e)}")
-            # 실패해도 빈 답변으로 추가
-            results.append({
-                'question': question,
-                'answer': "답변 생성 실패",
-                'contexts': [""],
-                'ground_truth': item['ground_truth'],
-            })
-    
+    with tqdm(total=len(test_data), desc="답변 생성", bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]') as pbar:
+        results = run_parallel(
+            _answer_item,
+            test_data,
+            workers=workers,
+            key=lambda i, item: f"{i}:{item['question']}",
+            checkpoint=checkpoint,
+            on_error=_failed_item,
+            on_done=lambda i, result: pbar.update(1),
+            priority=PRIORITY_BATCH,
+        )
+
     print_success(f"{len(results)}개 답변 생성 완료")
     return results
 
@@ -217,6 +231,11 @@ def save_results(results: Dict, output_file: str):
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="RAG 시스템 Ragas 평가")
+    parser.add_argument("--workers", type=int, default=PARALLEL_WORKERS, help="동시 답변 생성 수")
+    parser.add_argument("--fresh", action="store_true", help="이전 실행의 중간 결과를 버리고 처음부터 생성")
+    args = parser.parse_args()
+
     print_header("🔬 FDA 의약품 정보 RAG 시스템 평가")
     
     # 환경 변수 검증
@@ -230,13 +249,16 @@ def main():
     # 파일 경로 설정
     test_dataset_path = Path(__file__).parent / "test_dataset.json"
     output_path = Path(__file__).parent / "evaluation_results.json"
+    checkpoint_path = Path(__file__).parent / "evaluation_results.checkpoint.jsonl"
+    if args.fresh:
+        checkpoint_path.unlink(missing_ok=True)
     
     try:
         # 1. 테스트 데이터셋 로드
         test_data = load_test_dataset(str(test_dataset_path))
         
         # 2. RAG 시스템으로 답변 생성
-        rag_results = generate_rag_responses(test_data)
+        rag_results = generate_rag_responses(test_data, workers=args.workers, checkpoint=str(checkpoint_path))
         
         # 3. Ragas로 평가
         eval_result = evaluate_rag_system(rag_results)
@@ -0,0 +1,45 @@
+"""
+질문 목록에 대한 답변을 한 번에 생성합니다 (FAQ 사전 생성 등).
+생성된 답변은 답변 캐시에도 저장되므로, 같은 프로세스의 이후 질문은 바로 응답합니다.
+
+사용법:
+    python scripts/answer_batch.py questions.txt -o answers.jsonl
+    python scripts/answer_batch.py questions.txt --concurrency 16
+
+questions.txt: 한 줄에 질문 하나 (빈 줄/#으로 시작하는 줄은 무시)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.chain.rag_chain import answer_batch
+from src.config import BATCH_CONCURRENCY
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="질문 목록 일괄 답변 생성")
+    parser.add_argument("questions", help="질문 파일 (한 줄에 하나)")
+    parser.add_argument("-o", "--output", default="answers.jsonl", help="결과 JSONL 경로 (입력 순서로 저장)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="동시 검색/생성 수")
+    args = parser.parse_args()
+
+    with open(args.questions, encoding="utf-8") as f:
+        questions = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+    results = [None] * len(questions)
+    failed = 0
+    for done, result in enumerate(answer_batch(questions, concurrency=args.concurrency), 1):
+        results[result.index] = result.to_dict()
+        if result.error is not None:
+            failed += 1
+            print(f"[{done}/{len(questions)}] ❌ {result.question}: {result.error}")
+        else:
+            print(f"[{done}/{len(questions)}] ✅ {result.question}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        for row in results:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    print(f"✅ 답변 {len(questions) - failed}건 / 실패 {failed}건: {args.output}")
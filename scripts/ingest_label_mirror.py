@@ -0,0 +1,43 @@
+"""
+OpenFDA drug/label bulk 다운로드를 로컬 SQLite 미러에 적재합니다.
+
+사용법:
+    python scripts/ingest_label_mirror.py --download
+    python scripts/ingest_label_mirror.py drug-label-0001-of-0013.json.zip ...
+    python scripts/ingest_label_mirror.py --sync            # 변경분만 반영 (야간 작업용)
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.label_mirror import LabelMirror, download_and_ingest, ingest_files, sync_updates
+from src.config import LABEL_MIRROR_PATH
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenFDA 라벨 로컬 미러 적재")
+    parser.add_argument("files", nargs="*", help="적재할 bulk 파일 (.json.zip / .json)")
+    parser.add_argument("--download", action="store_true", help="OpenFDA에서 전체 파티션을 내려받아 적재")
+    parser.add_argument("--sync", action="store_true", help="마지막 동기화 이후 변경된 라벨만 API로 반영")
+    parser.add_argument("--since", default="", help="동기화 기준 effective_time (YYYYMMDD, 기본: 마지막 동기화 시점)")
+    parser.add_argument("--db", default=LABEL_MIRROR_PATH, help="미러 SQLite 경로")
+    args = parser.parse_args()
+
+    if not (args.download or args.sync or args.files):
+        parser.error("--download, --sync 또는 적재할 파일을 지정하세요.")
+
+    mirror = LabelMirror(args.db)
+    if args.sync:
+        stats = sync_updates(mirror, since=args.since)
+    elif args.download:
+        stats = download_and_ingest(
+            mirror, work_dir=os.path.dirname(os.path.abspath(args.db)), on_progress=print
+        )
+    else:
+        stats = ingest_files(mirror, args.files, on_progress=print)
+    print(
+        f"✅ 추가 {stats.inserted} / 갱신 {stats.updated} / 변경 없음 {stats.unchanged} / 삭제 {stats.removed} "
+        f"(미러 전체 {mirror.count()}건, 기준 시점 {mirror.latest_effective_time()}): {args.db}"
+    )
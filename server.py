@@ -0,0 +1,217 @@
+"""
+FDA 의약품 정보 Q&A - ASGI 서비스 (Starlette)
+- POST /context        : 분류 + 검색 결과 (JSON)
+- POST /answer         : 전체 답변 (JSON)
+- POST /answer/stream  : 답변 스트리밍 (Server-Sent Events)
+- GET  /health         : 상태 + OpenFDA 스케줄러/캐시 통계 + LLM 인스턴스 재사용 통계
+
+실행: WEB_CONCURRENCY=4 uvicorn server:app
+- 워커 프로세스끼리는 상태를 공유하지 않음: OpenFDA 요청 스케줄러(레이트 리밋), 메모리 라벨/답변 캐시,
+  single-flight 병합, 이름 색인은 모두 프로세스별
+- 워커 수는 --workers 대신 WEB_CONCURRENCY로 지정 (config가 OpenFDA 한도를 워커 수로 나눔)
+- 라벨 캐시를 워커 간에 공유하려면 LABEL_DISK_CACHE_PATH(SQLite) 또는 LABEL_BACKEND=mirror 사용
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.api.async_openfda_client import close_async_client
+from src.api.openfda_client import get_client
+from src.chain.llm_registry import registry_stats
+from src.chain.rag_chain import aprepare_context, astream_answer, agenerate_answer
+from src.config import (
+    SERVER_MAX_CONCURRENCY,
+    SERVER_QUEUE_TIMEOUT,
+    SERVER_REQUEST_TIMEOUT,
+    validate_env,
+)
+from src.security import validate_user_input
+from src.utils.chat_history import compact_sources
+
+# 환경 변수 검증
+validate_env()
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    질문 처리 경로의 동시 요청 수 제한
+    슬롯은 응답 본문(SSE 스트림 포함)을 다 보낼 때까지 유지, queue_timeout 안에 못 얻으면 503
+    """
+
+    def __init__(self, app: ASGIApp, limit: int, queue_timeout: float, exempt_paths: tuple = ("/health",)):
+        self.app = app
+        self.queue_timeout = queue_timeout
+        self.exempt_paths = exempt_paths
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            response = JSONResponse({"error": "서버가 혼잡합니다. 잠시 후 다시 시도하세요."}, status_code=503)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._semaphore.release()
+
+
+class BadRequest(Exception):
+    """잘못된 요청 본문 (400)"""
+
+
+async def _read_question(request: Request) -> str:
+    """요청 본문의 question 검증 (app.py와 같은 입력 검증 적용)"""
+    try:
+        body = await request.json()
+    except ValueError:
+        raise BadRequest("JSON 본문이 필요합니다.")
+    question = body.get("question") if isinstance(body, dict) else None
+    if not isinstance(question, str):
+        raise BadRequest("question 필드가 필요합니다.")
+
+    validation = validate_user_input(question)
+    if not validation.is_valid:
+        raise BadRequest(validation.error_message)
+    return validation.sanitized_input
+
+
+def _context_payload(context_data: dict) -> dict:
+    """context_data → 응답 JSON (라벨 원문 대신 출처 요약)"""
+    return {
+        "question": context_data["question"],
+        "category": context_data["category"],
+        "keyword": context_data["keyword"],
+        "context": context_data["context"],
+        "sources": [
+            {"brand_name": brand, "generic_name": generic, "manufacturer_name": manufacturer}
+            for brand, generic, manufacturer in compact_sources(context_data.get("raw_results", []))
+        ],
+        "cached": "cached_answer" in context_data,
+    }
+
+
+def _error(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+async def context_endpoint(request: Request) -> JSONResponse:
+    try:
+        question = await _read_question(request)
+        context_data = await asyncio.wait_for(aprepare_context(question), SERVER_REQUEST_TIMEOUT)
+    except BadRequest as e:
+        return _error(str(e), 400)
+    except asyncio.TimeoutError:
+        return _error("처리 시간이 초과되었습니다.", 504)
+    return JSONResponse(_context_payload(context_data))
+
+
+async def _answer(question: str) -> dict:
+    context_data = await aprepare_context(question)
+    answer = await agenerate_answer(context_data)
+    return dict(_context_payload(context_data), answer=answer)
+
+
+async def answer_endpoint(request: Request) -> JSONResponse:
+    try:
+        question = await _read_question(request)
+        payload = await asyncio.wait_for(_answer(question), SERVER_REQUEST_TIMEOUT)
+    except BadRequest as e:
+        return _error(str(e), 400)
+    except asyncio.TimeoutError:
+        return _error("처리 시간이 초과되었습니다.", 504)
+    return JSONResponse(payload)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_events(question: str) -> AsyncIterator[str]:
+    """
+    SSE 이벤트 순서: context (분류/출처) → token (답변 조각) 반복 → done
+    처리 한도를 넘기거나 실패하면 error 이벤트로 종료
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SERVER_REQUEST_TIMEOUT
+    chunks = None
+    try:
+        context_data = await asyncio.wait_for(aprepare_context(question), deadline - loop.time())
+        yield _sse("context", _context_payload(context_data))
+
+        chunks = astream_answer(context_data)
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), deadline - loop.time())
+            except StopAsyncIteration:
+                break
+            yield _sse("token", {"text": chunk})
+        yield _sse("done", {})
+    except asyncio.TimeoutError:
+        yield _sse("error", {"error": "처리 시간이 초과되었습니다."})
+    except Exception as e:
+        yield _sse("error", {"error": f"답변 생성 중 오류가 발생했습니다: {type(e).__name__}"})
+    finally:
+        if chunks is not None:
+            await chunks.aclose()
+
+
+async def stream_endpoint(request: Request):
+    try:
+        question = await _read_question(request)
+    except BadRequest as e:
+        return _error(str(e), 400)
+    return StreamingResponse(
+        _stream_events(question),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def health_endpoint(request: Request) -> JSONResponse:
+    client = get_client()
+    return JSONResponse({
+        "status": "ok",
+        "scheduler": client.scheduler_stats(),
+        "cache": client.cache_stats(),
+        "llm_registry": registry_stats(),
+    })
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    yield
+    # 종료 시 서버 루프의 비동기 OpenFDA 클라이언트(keep-alive 커넥션) 정리
+    await close_async_client()
+
+
+app = Starlette(
+    lifespan=lifespan,
+    routes=[
+        Route("/context", context_endpoint, methods=["POST"]),
+        Route("/answer", answer_endpoint, methods=["POST"]),
+        Route("/answer/stream", stream_endpoint, methods=["POST"]),
+        Route("/health", health_endpoint, methods=["GET"]),
+    ],
+    middleware=[
+        Middleware(
+            ConcurrencyLimitMiddleware,
+            limit=SERVER_MAX_CONCURRENCY,
+            queue_timeout=SERVER_QUEUE_TIMEOUT,
+        ),
+    ],
+)
@@ -0,0 +1,240 @@
+"""
+OpenFDA 비동기 API 클라이언트
+- 여러 필드 동시 검색(fan-out): 분류한 필드에서 결과가 없을 때 나머지 필드를 한 번에 조회
+"""
+import asyncio
+import json
+import weakref
+from typing import Callable, Iterable, Optional
+
+import httpx
+
+from src.config import (
+    OPENFDA_BASE_URL,
+    OPENFDA_API_KEY,
+    OPENFDA_LABEL_ENDPOINT,
+    SEARCH_LIMIT,
+    HTTP_TIMEOUT,
+    HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_RETRY_STATUS,
+)
+from src.api.cache import TTLCache
+from src.api.disk_cache import DiskLabelCache
+from src.api.openfda_client import (
+    get_client,
+    sanitize_search_term,
+    build_search_query,
+    project_approved,
+    aread_projected,
+    retry_delay,
+)
+from src.api.label_record import LabelRecord
+from src.utils.singleflight import AsyncSingleFlight
+from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND
+
+# search_many 기본 검색 필드 (병합 시 이 순서대로 우선)
+FANOUT_FIELDS = (
+    "openfda.brand_name",
+    "openfda.generic_name",
+    "indications_and_usage",
+)
+
+
+class AsyncOpenFDAClient:
+    """
+    asyncio 기반 OpenFDA 클라이언트
+    - 캐시는 기본적으로 동기 클라이언트(get_client())와 공유
+    - async with 또는 aclose()로 커넥션 풀 정리
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_POOL_MAXSIZE,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        cache: TTLCache | None = None,
+        disk_cache: DiskLabelCache | None = None,
+    ):
+        self.base_url = OPENFDA_BASE_URL
+        self.api_key = OPENFDA_API_KEY
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.http = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        shared = get_client()
+        self.cache = cache if cache is not None else shared.cache
+        self.disk_cache = disk_cache if disk_cache is not None else shared.disk_cache
+        self.scheduler = shared.scheduler
+        self._search_flight = AsyncSingleFlight()
+        self._refreshing: dict = {}
+
+    async def __aenter__(self) -> "AsyncOpenFDAClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """커넥션 풀 정리"""
+        await self.http.aclose()
+
+    def _build_params(self, search_query: str, limit: int) -> dict:
+        """API 요청 파라미터 생성"""
+        params = {"search": search_query, "limit": limit}
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return params
+
+    def _backoff_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 지수 백오프 + jitter)"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        return retry_delay(attempt, retry_after, self.backoff_factor)
+
+    async def _make_request(
+        self, url: str, params: dict, project: Optional[Callable[[dict], Optional[dict]]] = None
+    ) -> dict:
+        """
+        API 요청 실행 (429/5xx 재시도) 및 응답 반환
+        project가 있으면 본문을 받는 대로 동기 클라이언트와 같은 파서로 라벨 단위 투영 (raw_count 포함)
+        → 전체 본문을 메모리에 올리지 않음
+        """
+        for attempt in range(self.max_retries + 1):
+            # 재시도도 한도에 포함되므로 시도마다 토큰 획득
+            if not await self.scheduler.acquire_async():
+                return {"error": "OpenFDA rate limit exceeded (client queue)", "results": []}
+            response = None
+            try:
+                async with self.http.stream("GET", url, params=params) as response:
+                    if response.status_code == 404:
+                        return {"error": "No results found", "results": []}
+                    if response.status_code not in HTTP_RETRY_STATUS or attempt >= self.max_retries:
+                        response.raise_for_status()
+                        if project is None:
+                            return json.loads(await response.aread())
+                        return await aread_projected(response.aiter_text(), project)
+            except httpx.HTTPStatusError as e:
+                return {"error": str(e), "results": []}
+            except (httpx.HTTPError, ValueError) as e:
+                # 연결 오류는 재시도, 스트리밍 중 끊김/잘린 본문은 일시적 오류로 처리
+                if response is not None or attempt >= self.max_retries:
+                    return {"error": str(e), "results": []}
+            await asyncio.sleep(self._backoff_delay(attempt, response))
+        return {"error": "OpenFDA request failed after retries", "results": []}
+
+    async def search_drug_label(self, field: str, term: str, limit: int = SEARCH_LIMIT) -> list[LabelRecord]:
+        """
+        의약품 라벨 정보 검색 (OpenFDAClient.search_drug_label의 비동기 버전)
+        - field: 검색 필드
+        - term: 검색어
+        - limit: 최대 결과 수
+        """
+        safe_term = sanitize_search_term(term)
+        if not safe_term:
+            return []
+
+        cache_key = (field, safe_term.lower(), limit)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+        # 디스크 캐시: stale이면 즉시 반환하고 백그라운드 태스크로 갱신 (SQLite I/O는 워커 스레드에서)
+        if self.disk_cache is not None:
+            stored = await asyncio.to_thread(self.disk_cache.get, cache_key)
+            if stored is not None:
+                results, is_stale = stored
+                if is_stale:
+                    self._schedule_refresh(cache_key, field, safe_term, limit)
+                elif self.cache is not None:
+                    self.cache.set(cache_key, results)
+                return list(results)
+
+        # 같은 검색이 진행 중이면 그 결과를 공유
+        results = await self._search_flight.do(
+            cache_key, lambda: self._fetch_and_store(cache_key, field, safe_term, limit)
+        )
+        return list(results)
+
+    async def _fetch_and_store(self, cache_key: tuple, field: str, safe_term: str, limit: int) -> list[dict]:
+        """API 호출 + Homeopathy 필터링 + 필드 투영 후 캐시에 저장 (일시적 오류는 저장하지 않음)"""
+        url = f"{self.base_url}{OPENFDA_LABEL_ENDPOINT}"
+        params = self._build_params(build_search_query(field, safe_term), limit)
+        data = await self._make_request(url, params, project=project_approved)
+        results = data.get("results", [])
+
+        if data.get("error") in (None, "No results found"):
+            if self.cache is not None:
+                self.cache.set(cache_key, results)
+            if self.disk_cache is not None:
+                await asyncio.to_thread(self.disk_cache.set, cache_key, results)
+        return results
+
+    def _schedule_refresh(self, cache_key: tuple, field: str, safe_term: str, limit: int):
+        """stale 항목 갱신 태스크 등록 (같은 키는 동시에 한 번만)"""
+        if cache_key in self._refreshing:
+            return
+        # 태스크는 생성 시점의 context를 복사하므로 갱신 요청만 백그라운드 우선순위로 실행됨
+        with request_priority(PRIORITY_BACKGROUND):
+            task = asyncio.create_task(self._fetch_and_store(cache_key, field, safe_term, limit))
+        self._refreshing[cache_key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(cache_key, None))
+
+    async def search_many(
+        self,
+        term: str,
+        fields: Iterable[str] = FANOUT_FIELDS,
+        limit: int = SEARCH_LIMIT,
+    ) -> list[dict]:
+        """
+        여러 필드를 동시에 검색하고 결과 병합
+        - 필드 순서대로 우선순위를 두며, 같은 라벨(id)은 한 번만 포함
+        """
+        per_field = await asyncio.gather(
+            *(self.search_drug_label(field, term, limit) for field in fields)
+        )
+        return merge_results(per_field)
+
+
+def merge_results(result_lists: Iterable[list[dict]]) -> list[dict]:
+    """여러 검색 결과를 순서를 유지하며 병합 (라벨 id 기준 중복 제거)"""
+    merged = []
+    seen_ids: set = set()
+    for results in result_lists:
+        for result in results:
+            label_id = result.get("id") or result.get("set_id") or id(result)
+            if label_id in seen_ids:
+                continue
+            seen_ids.add(label_id)
+            merged.append(result)
+    return merged
+
+
+# 이벤트 루프별 클라이언트 (httpx.AsyncClient는 생성된 루프에 묶임)
+# 약한 참조이므로 종료된 루프와 그 클라이언트는 루프가 해제될 때 함께 정리됨
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenFDAClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncOpenFDAClient:
+    """
+    현재 이벤트 루프에서 공유할 AsyncOpenFDAClient 반환
+    루프를 끝내기 전에 close_async_client()로 커넥션 풀을 정리 (서버는 lifespan 종료 시 호출)
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncOpenFDAClient()
+    return client
+
+
+async def close_async_client():
+    """현재 루프의 클라이언트 정리 (서버 종료 시 / asyncio.run()으로 실행한 코루틴 끝에서 호출)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
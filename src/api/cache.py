@@ -0,0 +1,82 @@
+"""OpenFDA 라벨 검색 결과 캐시 - 메모리 LRU + 항목별 TTL"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Hashable, Optional
+
+
+@dataclass
+class CacheStats:
+    """캐시 통계 (적중/실패/축출 카운터)"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+class TTLCache:
+    """
+    크기 제한 LRU + 항목별 TTL 캐시 (스레드 안전)
+    - maxsize: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 축출)
+    - ttl: 기본 만료 시간(초), set()에서 항목별로 변경 가능
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """값 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """값 저장 (ttl 미지정 시 기본 TTL 사용)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """특정 항목 삭제"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """전체 삭제 (통계는 유지)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,115 @@
+"""OpenFDA 라벨 검색 결과 디스크 캐시 (SQLite) - 재시작 후에도 유지"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+from src.api.label_record import LabelRecord
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, LabelRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_value(value: Any) -> Any:
+    """라벨 목록은 LabelRecord로 복원"""
+    if isinstance(value, list):
+        return [LabelRecord.from_dict(item) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+class DiskLabelCache:
+    """
+    SQLite 기반 영속 캐시 (stale-while-revalidate 지원)
+    - fresh_ttl: 이 시간(초) 이내의 항목은 신선한 것으로 간주
+    - max_stale: 이 시간(초)까지는 만료된 항목도 반환 (백그라운드 갱신 대상)
+    - purge_interval: 열 때와 이후 이 간격(초)마다 set()에서 max_stale을 넘긴 항목 삭제
+      (다시 조회되지 않는 키가 파일에 계속 쌓이지 않도록)
+    여러 Streamlit 워커가 같은 파일을 공유할 수 있도록 WAL 모드를 사용
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fresh_ttl: float = 24 * 3600,
+        max_stale: float = 7 * 24 * 3600,
+        purge_interval: float = 3600,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = max_stale
+        self.purge_interval = purge_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS label_cache (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS label_cache_fetched_at ON label_cache(fetched_at)")
+        self._conn.commit()
+        self._next_purge = 0.0
+        self.purge_expired()
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return json.dumps(key, ensure_ascii=False)
+
+    def get(self, key: Hashable) -> Optional[tuple[Any, bool]]:
+        """
+        값 조회
+        반환: (값, stale 여부) 또는 None (없거나 max_stale 초과)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM label_cache WHERE key = ?",
+                (self._encode_key(key),),
+            ).fetchone()
+        if row is None:
+            return None
+
+        payload, fetched_at = row
+        age = time.time() - fetched_at
+        if age > self.max_stale:
+            return None
+        return _decode_value(json.loads(payload)), age > self.fresh_ttl
+
+    def set(self, key: Hashable, value: Any):
+        """값 저장 (기존 항목은 덮어쓰기)"""
+        payload = json.dumps(value, ensure_ascii=False, default=_encode_value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO label_cache (key, payload, fetched_at) VALUES (?, ?, ?)",
+                (self._encode_key(key), payload, now),
+            )
+            if now >= self._next_purge:
+                self._purge_locked(now)
+            self._conn.commit()
+
+    def _purge_locked(self, now: float) -> int:
+        cursor = self._conn.execute("DELETE FROM label_cache WHERE fetched_at < ?", (now - self.max_stale,))
+        self._next_purge = now + self.purge_interval
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """max_stale을 넘긴 항목 삭제, 삭제된 개수 반환"""
+        with self._lock:
+            removed = self._purge_locked(time.time())
+            self._conn.commit()
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
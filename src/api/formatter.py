@@ -1,6 +1,8 @@
 """OpenFDA API 응답을 LLM 컨텍스트용 텍스트로 포맷"""
 from typing import Optional
 
+from src.config import CONTEXT_TOKEN_BUDGET, CONTEXT_MAX_RESULTS
+
 
 # 라벨 데이터에서 추출할 필드와 라벨 매핑
 LABEL_FIELD_MAP = {
@@ -20,11 +22,21 @@ LABEL_FIELD_MAP = {
     "storage_and_handling": "Storage and Handling",
 }
 
+# openfda 객체 안에 있는 필드
+OPENFDA_NESTED_FIELDS = ("brand_name", "generic_name", "manufacturer_name")
+
+# 검색 결과에서 남길 필드 (LABEL_FIELD_MAP + 식별/필터/동기화용 메타데이터, label_record.LabelRecord 참고)
+# spl_product_data_elements 등 나머지 대용량 섹션은 버림
+PROJECTED_OPENFDA_FIELDS = OPENFDA_NESTED_FIELDS + ("product_type", "application_number")
+PROJECTED_LABEL_FIELDS = ("id", "set_id", "version", "effective_time") + tuple(
+    field for field in LABEL_FIELD_MAP if field not in OPENFDA_NESTED_FIELDS
+)
+
 
 def _extract_value(data: dict, key: str) -> Optional[str]:
     """딕셔너리에서 값 추출 (리스트면 첫 번째 요소, 중첩 openfda 필드 처리)"""
     # openfda 중첩 필드 확인
-    if key in ["brand_name", "generic_name", "manufacturer_name"]:
+    if key in OPENFDA_NESTED_FIELDS:
         openfda = data.get("openfda") or {}
         value = openfda.get(key, [])
     else:
@@ -65,3 +77,163 @@ def format_label_results(results: list[dict]) -> str:
         body = format_drug_label(label)
         parts.append(f"{header}\n{body}")
     return "\n\n".join(parts)
+
+
+# ── 토큰 예산 기반 컨텍스트 구성 ─────────────────────────
+
+# 라벨 식별 필드 (예산과 무관하게 항상 포함)
+IDENTITY_FIELDS = ("brand_name", "generic_name", "manufacturer_name")
+
+# 분류 카테고리별 필드 가중치 (0이면 질문에서 요청하지 않는 한 제외)
+CATEGORY_FIELD_WEIGHTS = {
+    "brand_name": {
+        "purpose": 1.0,
+        "indications_and_usage": 1.5,
+        "active_ingredient": 1.2,
+        "dosage_and_administration": 1.0,
+        "warnings": 1.0,
+        "do_not_use": 0.8,
+        "stop_use": 0.6,
+        "drug_interactions": 0.6,
+        "contraindications": 0.8,
+        "pregnancy_or_breast_feeding": 0.5,
+        "storage_and_handling": 0.0,
+    },
+    "generic_name": {
+        "purpose": 1.0,
+        "indications_and_usage": 1.5,
+        "active_ingredient": 0.8,
+        "dosage_and_administration": 1.0,
+        "warnings": 1.2,
+        "do_not_use": 0.8,
+        "stop_use": 0.6,
+        "drug_interactions": 0.8,
+        "contraindications": 1.0,
+        "pregnancy_or_breast_feeding": 0.5,
+        "storage_and_handling": 0.0,
+    },
+    "indication": {
+        "purpose": 1.5,
+        "indications_and_usage": 2.0,
+        "active_ingredient": 1.5,
+        "dosage_and_administration": 0.5,
+        "warnings": 0.6,
+        "do_not_use": 0.4,
+        "stop_use": 0.3,
+        "drug_interactions": 0.3,
+        "contraindications": 0.4,
+        "pregnancy_or_breast_feeding": 0.2,
+        "storage_and_handling": 0.0,
+    },
+}
+
+# 질문에 등장하면 해당 필드 가중치를 높이는 표현
+QUESTION_FIELD_HINTS = {
+    "dosage_and_administration": ["복용", "용량", "용법", "먹어야", "몇 번", "몇번", "얼마나", "dose", "dosage"],
+    "warnings": ["주의", "경고", "부작용", "위험", "warning", "side effect"],
+    "do_not_use": ["먹으면 안", "먹지 말", "사용하지 말", "금지"],
+    "stop_use": ["중단", "그만"],
+    "drug_interactions": ["같이", "함께", "병용", "상호작용", "interaction"],
+    "contraindications": ["금기", "contraindication"],
+    "pregnancy_or_breast_feeding": ["임신", "임산부", "수유", "pregnan", "breast"],
+    "active_ingredient": ["성분", "ingredient"],
+    "storage_and_handling": ["보관", "storage"],
+}
+
+QUESTION_HINT_BOOST = 2.0
+FIELD_TOKEN_CAP = 200           # 가중치 1.0 필드의 최대 토큰 (기존 800자 절단과 비슷한 수준)
+MIN_FIELD_TOKENS = 25           # 이보다 적게 배정되면 필드 생략
+CHARS_PER_TOKEN = 4             # 영문 라벨 텍스트 기준 토큰 추정치
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (영문 기준 약 4자당 1토큰)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _truncate_to_tokens(text: str, tokens: int) -> str:
+    """토큰 예산에 맞춰 단어 경계에서 자르기"""
+    max_chars = tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    if cut < max_chars // 2:
+        cut = max_chars
+    return text[:cut].rstrip() + "..."
+
+
+def field_weights(category: str, question: str = "") -> dict[str, float]:
+    """카테고리 + 질문 표현에 따른 필드별 가중치"""
+    weights = dict(CATEGORY_FIELD_WEIGHTS.get(category, CATEGORY_FIELD_WEIGHTS["brand_name"]))
+    question_lower = question.lower()
+    for field, hints in QUESTION_FIELD_HINTS.items():
+        if any(hint in question_lower for hint in hints):
+            weights[field] = max(weights.get(field, 0.0), 1.0) * QUESTION_HINT_BOOST
+    return weights
+
+
+def build_context(
+    results: list[dict],
+    category: str = "brand_name",
+    question: str = "",
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+    max_results: int = CONTEXT_MAX_RESULTS,
+) -> str:
+    """
+    토큰 예산 안에서 라벨 검색 결과를 컨텍스트로 구성
+    - 식별 필드(브랜드/성분/제조사)는 항상 포함
+    - 나머지 필드는 (필드 가중치 × 결과 순위 가중치) 순으로 예산을 배정
+    - 예산이 부족하면 우선순위가 낮은 필드부터 생략
+    """
+    if not results:
+        return "(No search results found)"
+
+    results = results[:max_results]
+    weights = field_weights(category, question)
+
+    # 1. 식별 필드 (항상 포함)
+    sections: list[dict[str, str]] = []
+    remaining = token_budget
+    for i, label in enumerate(results, 1):
+        identity = {}
+        for field in IDENTITY_FIELDS:
+            value = _extract_value(label, field)
+            if value:
+                identity[field] = value
+                remaining -= estimate_tokens(f"[{LABEL_FIELD_MAP[field]}] {value}")
+        remaining -= estimate_tokens(f"── Result {i} ──")
+        sections.append(identity)
+
+    # 2. 본문 필드 후보 (우선순위 높은 순)
+    candidates = []
+    for rank, label in enumerate(results):
+        rank_weight = 1.0 / (1.0 + 0.5 * rank)
+        for field, weight in weights.items():
+            if weight <= 0:
+                continue
+            value = _extract_value(label, field)
+            if not value:
+                continue
+            wanted = min(estimate_tokens(value), int(FIELD_TOKEN_CAP * weight))
+            candidates.append((weight * rank_weight, rank, field, value, wanted))
+    candidates.sort(key=lambda c: c[0], reverse=True)
+
+    # 3. 예산 배정
+    for _, rank, field, value, wanted in candidates:
+        granted = min(wanted, remaining)
+        if granted < MIN_FIELD_TOKENS and granted < wanted:
+            continue
+        sections[rank][field] = _truncate_to_tokens(value, granted)
+        remaining -= granted + estimate_tokens(f"[{LABEL_FIELD_MAP[field]}] ")
+
+    # 4. 원래 결과 순서 / LABEL_FIELD_MAP 필드 순서로 출력
+    parts = []
+    for i, section in enumerate(sections, 1):
+        lines = [
+            f"[{display_name}] {section[field]}"
+            for field, display_name in LABEL_FIELD_MAP.items()
+            if field in section
+        ]
+        body = "\n".join(lines) if lines else "(No data available)"
+        parts.append(f"── Result {i} ──\n{body}")
+    return "\n\n".join(parts)
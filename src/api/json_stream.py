@@ -0,0 +1,144 @@
+"""
+대용량 JSON 스트리밍 파서
+{"meta": {...}, "results": [ {...}, {...}, ... ]} 형태에서 results 배열 원소를 하나씩 반환
+전체 문서를 메모리에 올리지 않고 청크 단위로 읽음 (OpenFDA bulk 파일 / API 응답 공용)
+- iter_array_items: 파일 객체에서 읽기 (동기)
+- aiter_array_items: 비동기 청크 스트림에서 읽기 (httpx 응답 등)
+"""
+import json
+from typing import Any, AsyncIterator, Generator, Iterator, TextIO
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+_decoder = json.JSONDecoder()
+
+# 파서가 입력이 더 필요할 때 내보내는 표시 (드라이버가 feed() 후 재개)
+_NEED_INPUT = object()
+
+
+class _ChunkReader:
+    """
+    청크 단위 버퍼 + 현재 위치
+    입력을 직접 읽지 않고 _NEED_INPUT을 내보내 드라이버(동기/비동기)가 feed()하도록 함
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def feed(self, chunk: str):
+        """다음 청크 추가 (소비한 앞부분은 버림), 빈 문자열이면 입력 끝"""
+        if not chunk:
+            self.eof = True
+            return
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def fill(self) -> Generator[object, None, bool]:
+        """다음 청크 요청, 더 읽을 게 없으면 False"""
+        if self.eof:
+            return False
+        yield _NEED_INPUT
+        return not self.eof
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not (yield from self.fill()):
+                return
+
+    def peek(self):
+        yield from self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Unexpected end of JSON input")
+        return self.buffer[self.pos]
+
+    def expect(self, char: str):
+        if (yield from self.peek()) != char:
+            raise ValueError(f"Expected {char!r} at position {self.pos}")
+        self.pos += 1
+
+    def _may_continue(self, value: Any, end: int) -> bool:
+        """디코딩한 값이 다음 청크에서 이어질 수 있는지 (버퍼 끝에 닿은 값 또는 잘린 숫자)"""
+        if end == len(self.buffer):
+            return True
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return all(ch in _NUMBER_CHARS for ch in self.buffer[end:])
+
+    def decode_value(self):
+        """현재 위치의 JSON 값 하나를 디코딩 (값이 청크 경계에 걸리면 더 읽어서 재시도)"""
+        yield from self.skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not (yield from self.fill()):
+                    raise
+                continue
+            # 숫자는 청크 끝에서 잘린 채로 디코딩될 수 있음 ("1.5"가 "1." + "5"로 나뉘면 1로 읽힘)
+            # → 값 뒤가 버퍼 끝까지 숫자 구성 문자뿐이면 더 읽어서 다시 디코딩
+            if not self.eof and self._may_continue(value, end) and (yield from self.fill()):
+                continue
+            self.pos = end
+            return value
+
+
+def _parse(reader: _ChunkReader, key: str):
+    """
+    최상위 객체의 key 배열 원소를 하나씩 내보냄 (입력이 필요하면 _NEED_INPUT)
+    - key 이외의 최상위 값(meta 등)은 디코딩 후 버림
+    - key가 없으면 아무것도 반환하지 않음
+    """
+    yield from reader.expect("{")
+    if (yield from reader.peek()) == "}":
+        return
+
+    while True:
+        name = yield from reader.decode_value()
+        yield from reader.expect(":")
+        if name == key and (yield from reader.peek()) == "[":
+            reader.pos += 1
+            if (yield from reader.peek()) == "]":
+                return
+            while True:
+                yield (yield from reader.decode_value())
+                separator = yield from reader.peek()
+                reader.pos += 1
+                if separator == "]":
+                    return
+                if separator != ",":
+                    raise ValueError(f"Expected ',' or ']' at position {reader.pos - 1}")
+
+        yield from reader.decode_value()
+        separator = yield from reader.peek()
+        reader.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' at position {reader.pos - 1}")
+
+
+def iter_array_items(fp: TextIO, key: str = "results", chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """파일 객체에서 최상위 객체의 key 배열 원소를 하나씩 반환 (key가 없으면 아무것도 반환하지 않음)"""
+    reader = _ChunkReader()
+    for event in _parse(reader, key):
+        if event is _NEED_INPUT:
+            reader.feed(fp.read(chunk_size))
+        else:
+            yield event
+
+
+async def aiter_array_items(chunks: AsyncIterator[str], key: str = "results") -> AsyncIterator[Any]:
+    """비동기 텍스트 청크 스트림에서 key 배열 원소를 하나씩 반환 (iter_array_items와 같은 파서)"""
+    reader = _ChunkReader()
+    for event in _parse(reader, key):
+        if event is _NEED_INPUT:
+            chunk = await anext(chunks, None)
+            while chunk == "":
+                chunk = await anext(chunks, None)
+            reader.feed(chunk or "")
+        else:
+            yield event
@@ -0,0 +1,66 @@
+"""
+Homeopathy / 비승인 의약품 필터
+값싼 메타데이터 검사 → 긴 텍스트 검사 순으로 조기 종료
+- API 응답: 스트리밍 파싱 중 라벨마다 적용 (openfda_client.project_approved)
+- 로컬 미러: 적재 시 적용 (label_mirror.LabelMirror.ingest_labels)
+"""
+from typing import Iterable
+
+# 제외 대상 표현 ("unapproved homeopathic"은 "homeopathic"에 포함되므로 별도 검사 불필요)
+UNAPPROVED_MARKERS = ("homeopathic",)
+
+
+class LabelFilter:
+    """
+    라벨 필터 (스레드 안전, 상태 없음)
+    - markers: 소문자 표현 목록. product_type / spl_product_data_elements에 포함되면 제외
+    CPython에서는 대소문자 무시 정규식보다 lower() 후 부분 문자열 검색이 훨씬 빨라
+    정규식 대신 미리 소문자로 만든 표현 튜플을 매처로 사용
+    """
+
+    def __init__(self, markers: Iterable[str] = UNAPPROVED_MARKERS):
+        self.markers = tuple(marker.lower() for marker in markers)
+
+    def _contains_marker(self, text: str) -> bool:
+        text = text.lower()
+        for marker in self.markers:
+            if marker in text:
+                return True
+        return False
+
+    def is_unapproved(self, result: dict) -> bool:
+        """Homeopathy / 비승인 의약품 여부 판단"""
+        # 1. OpenFDA 메타데이터가 없는 경우 (매칭되지 않은 비승인 약물 등)
+        openfda = result.get("openfda")
+        if not openfda:
+            return True
+
+        # 2. product_type 확인 (짧은 문자열 → 한 번에 합쳐서 검사)
+        product_types = openfda.get("product_type") or []
+        if self._contains_marker(" | ".join(product_types)):
+            return True
+
+        # 3. HUMAN OTC/PRESCRIPTION DRUG인데 application_number가 없으면 승인받지 않은(unapproved) 제품일 확률 높음
+        if not openfda.get("application_number"):
+            for pt in product_types:
+                pt_lower = pt.lower()
+                if "human" in pt_lower and "drug" in pt_lower:
+                    return True
+
+        # 4. spl_product_data_elements 확인 (가장 비싼 검사 → 마지막, 요소당 한 번의 lower()/검색)
+        spl_elements = result.get("spl_product_data_elements")
+        if isinstance(spl_elements, list):
+            contains_marker = self._contains_marker
+            for elem in spl_elements:
+                if contains_marker(elem):
+                    return True
+
+        return False
+
+    def filter(self, results: list[dict]) -> list[dict]:
+        """승인 의약품만 남긴 결과 반환 (이미 받은 결과 목록용)"""
+        is_unapproved = self.is_unapproved
+        return [result for result in results if not is_unapproved(result)]
+
+
+default_filter = LabelFilter()
@@ -0,0 +1,496 @@
+"""
+OpenFDA drug/label 로컬 미러 (SQLite FTS5)
+- OpenFDA bulk 다운로드(zip 압축 JSON)를 스트리밍으로 적재 (전체 파일을 메모리에 올리지 않음)
+- OpenFDAClient와 같은 search_drug_label(field, term) 인터페이스로 검색
+- set_id/version/effective_time 기준 증분 동기화 (sync_updates)
+"""
+import io
+import json
+import sqlite3
+import tempfile
+import threading
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+import requests
+
+from src.config import (
+    OPENFDA_DOWNLOAD_INDEX_URL,
+    SEARCH_LIMIT,
+    OPENFDA_PAGE_SIZE,
+    OPENFDA_MAX_SKIP,
+    HTTP_TIMEOUT,
+)
+from src.api.json_stream import iter_array_items
+from src.api.label_filter import default_filter
+from src.api.label_record import LabelRecord
+from src.api.openfda_client import sanitize_search_term
+from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND
+
+# OpenFDA 검색 필드 → FTS 컬럼
+FIELD_COLUMNS = {
+    "openfda.brand_name": "brand_name",
+    "openfda.generic_name": "generic_name",
+    "indications_and_usage": "indications_and_usage",
+}
+
+INGEST_BATCH_SIZE = 500
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS labels (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    set_id TEXT,
+    brand_name TEXT,
+    generic_name TEXT,
+    indications_and_usage TEXT,
+    doc TEXT NOT NULL,
+    version INTEGER,
+    effective_time TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS labels_fts USING fts5(
+    brand_name, generic_name, indications_and_usage,
+    content='labels', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS labels_ai AFTER INSERT ON labels BEGIN
+    INSERT INTO labels_fts(rowid, brand_name, generic_name, indications_and_usage)
+    VALUES (new.rowid, new.brand_name, new.generic_name, new.indications_and_usage);
+END;
+CREATE TRIGGER IF NOT EXISTS labels_ad AFTER DELETE ON labels BEGIN
+    INSERT INTO labels_fts(labels_fts, rowid, brand_name, generic_name, indications_and_usage)
+    VALUES ('delete', old.rowid, old.brand_name, old.generic_name, old.indications_and_usage);
+END;
+CREATE TABLE IF NOT EXISTS mirror_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 검색 컬럼이 바뀐 경우에만 FTS 항목 재색인 (version/doc만 바뀐 경우는 색인 유지)
+_UPDATE_TRIGGER = """
+CREATE TRIGGER labels_au AFTER UPDATE OF brand_name, generic_name, indications_and_usage ON labels BEGIN
+    INSERT INTO labels_fts(labels_fts, rowid, brand_name, generic_name, indications_and_usage)
+    VALUES ('delete', old.rowid, old.brand_name, old.generic_name, old.indications_and_usage);
+    INSERT INTO labels_fts(rowid, brand_name, generic_name, indications_and_usage)
+    VALUES (new.rowid, new.brand_name, new.generic_name, new.indications_and_usage);
+END
+"""
+
+
+def _joined(values) -> str:
+    if isinstance(values, list):
+        return " ; ".join(str(v) for v in values)
+    return str(values) if values else ""
+
+
+def _label_version(label: dict) -> tuple[int, str]:
+    """라벨 버전 비교 키 (version, effective_time)"""
+    try:
+        version = int(label.get("version") or 0)
+    except (TypeError, ValueError):
+        version = 0
+    return version, label.get("effective_time") or ""
+
+
+def _label_row(label: dict) -> tuple:
+    """라벨 문서 → labels 테이블 행 (doc에는 사용하는 필드만 투영해 저장)"""
+    openfda = label.get("openfda") or {}
+    version, effective_time = _label_version(label)
+    return (
+        label["id"],
+        label.get("set_id") or label["id"],
+        _joined(openfda.get("brand_name")),
+        _joined(openfda.get("generic_name")),
+        _joined(label.get("indications_and_usage")),
+        json.dumps(LabelRecord.from_dict(label).to_dict(), ensure_ascii=False, separators=(",", ":")),
+        version,
+        effective_time,
+    )
+
+
+@dataclass
+class IngestStats:
+    """적재/동기화 결과"""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    latest_effective_time: str = ""
+
+    @property
+    def stored(self) -> int:
+        return self.inserted + self.updated
+
+    def merge(self, other: "IngestStats"):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.removed += other.removed
+        self.latest_effective_time = max(self.latest_effective_time, other.latest_effective_time)
+
+    def to_dict(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+            "latest_effective_time": self.latest_effective_time,
+        }
+
+
+class LabelMirror:
+    """
+    로컬 라벨 미러
+    - 읽기는 스레드별 커넥션 사용 (Streamlit 세션/스레드 간 공유 가능)
+    - 적재는 ingest_labels()에서 배치 트랜잭션으로 처리
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """
+        v1 → v2: version/effective_time 컬럼 추가 (기존 행은 doc JSON에서 채움)
+        set_id/effective_time 인덱스, 검색 컬럼 한정 UPDATE 트리거
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(labels)")}
+        with conn:
+            conn.execute("DROP TRIGGER IF EXISTS labels_au")
+            conn.execute(_UPDATE_TRIGGER)
+            if "version" not in columns:
+                conn.execute("ALTER TABLE labels ADD COLUMN version INTEGER")
+                conn.execute("ALTER TABLE labels ADD COLUMN effective_time TEXT")
+                conn.execute(
+                    """
+                    UPDATE labels SET
+                        version = CAST(json_extract(doc, '$.version') AS INTEGER),
+                        effective_time = json_extract(doc, '$.effective_time')
+                    """
+                )
+            conn.execute("CREATE INDEX IF NOT EXISTS labels_set_id ON labels(set_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS labels_effective_time ON labels(effective_time)")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ── 검색 ────────────────────────────────────────
+
+    def search_drug_label(self, field: str, term: str, limit: int = SEARCH_LIMIT, skip: int = 0) -> list[LabelRecord]:
+        """
+        의약품 라벨 검색 (OpenFDAClient.search_drug_label과 동일한 인터페이스)
+        - field: openfda.brand_name / openfda.generic_name / indications_and_usage
+        """
+        column = FIELD_COLUMNS.get(field)
+        safe_term = sanitize_search_term(term)
+        if column is None or not safe_term:
+            return []
+
+        # FTS5 구문: 컬럼 필터 + 구(phrase) 검색
+        phrase = safe_term.replace('"', '""')
+        query = f'{column} : "{phrase}"'
+        rows = self._connect().execute(
+            """
+            SELECT labels.doc FROM labels_fts
+            JOIN labels ON labels.rowid = labels_fts.rowid
+            WHERE labels_fts MATCH ?
+            ORDER BY labels_fts.rank
+            LIMIT ? OFFSET ?
+            """,
+            (query, limit, skip),
+        ).fetchall()
+        # 투영 이전에 적재된 미러도 같은 형태로 반환
+        return [LabelRecord.from_dict(json.loads(doc)) for (doc,) in rows]
+
+    def search_paged(self, field: str, term: str, total: int, page_size: int = SEARCH_LIMIT) -> list[LabelRecord]:
+        """로컬 미러는 페이지 제한이 없으므로 한 번에 total개 조회"""
+        return self.search_drug_label(field, term, total)
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM labels").fetchone()[0]
+
+    def iter_names(self) -> Iterator[tuple[str, str]]:
+        """모든 라벨의 (brand_name, generic_name) (이름 색인 구성용)"""
+        yield from self._connect().execute("SELECT brand_name, generic_name FROM labels")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def latest_effective_time(self) -> str:
+        """동기화 기준 시점 (마지막 동기화 시점, 없으면 미러 내 최신 effective_time)"""
+        synced = self.get_meta("synced_effective_time")
+        if synced:
+            return synced
+        row = self._connect().execute("SELECT MAX(effective_time) FROM labels").fetchone()
+        return row[0] or ""
+
+    def set_meta(self, key: str, value: str):
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO mirror_meta (key, value) VALUES (?, ?)", (key, value))
+        conn.commit()
+
+    # ── 적재 ────────────────────────────────────────
+
+    def ingest_labels(self, labels: Iterable[dict], batch_size: int = INGEST_BATCH_SIZE) -> IngestStats:
+        """
+        라벨 문서 스트림 적재 (set_id 기준 upsert)
+        - 새 set_id는 추가, 더 새로운 version/effective_time이면 같은 행을 교체, 나머지는 건너뜀
+        - 이미 있는 id가 다른 set_id로 오면 그 행을 새 set_id로 옮김
+        - Homeopathy/비승인 의약품은 적재하지 않고, 이미 있던 라벨이면 삭제
+        """
+        conn = self._connect()
+        stats = IngestStats()
+        batch = []
+        for label in labels:
+            if not label.get("id"):
+                continue
+            batch.append(label)
+            if len(batch) >= batch_size:
+                self._apply_batch(conn, batch, stats)
+                batch = []
+        if batch:
+            self._apply_batch(conn, batch, stats)
+        return stats
+
+    @staticmethod
+    def _apply_batch(conn: sqlite3.Connection, batch: list[dict], stats: IngestStats):
+        """배치 하나를 한 트랜잭션으로 반영"""
+        with conn:
+            for label in batch:
+                set_id = label.get("set_id") or label["id"]
+                effective_time = label.get("effective_time") or ""
+                if effective_time > stats.latest_effective_time:
+                    stats.latest_effective_time = effective_time
+
+                # id는 UNIQUE이므로 set_id가 바뀐 같은 id 문서도 함께 조회
+                matches = conn.execute(
+                    "SELECT rowid, set_id, version, effective_time FROM labels WHERE set_id = ? OR id = ?",
+                    (set_id, label["id"]),
+                ).fetchall()
+
+                if default_filter.is_unapproved(label):
+                    for match in matches:
+                        conn.execute("DELETE FROM labels WHERE rowid = ?", (match[0],))
+                        stats.removed += 1
+                    continue
+
+                existing = next((m for m in matches if m[1] == set_id), None)
+                moved = next((m for m in matches if m[1] != set_id), None)
+                if existing is not None and moved is not None:
+                    # 같은 id가 다른 set_id 행에 남아 있으면 제거 (UPDATE 시 id 충돌 방지)
+                    conn.execute("DELETE FROM labels WHERE rowid = ?", (moved[0],))
+                    stats.removed += 1
+                    moved = None
+
+                row = _label_row(label)
+                if existing is None and moved is not None:
+                    # set_id만 바뀐 문서: 기존 행을 새 set_id로 교체
+                    conn.execute(
+                        """
+                        UPDATE labels SET
+                            id = ?, set_id = ?, brand_name = ?, generic_name = ?,
+                            indications_and_usage = ?, doc = ?, version = ?, effective_time = ?
+                        WHERE rowid = ?
+                        """,
+                        row + (moved[0],),
+                    )
+                    stats.updated += 1
+                elif existing is None:
+                    conn.execute(
+                        """
+                        INSERT INTO labels (
+                            id, set_id, brand_name, generic_name, indications_and_usage, doc, version, effective_time
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        row,
+                    )
+                    stats.inserted += 1
+                elif _label_version(label) > (existing[2] or 0, existing[3] or ""):
+                    conn.execute(
+                        """
+                        UPDATE labels SET
+                            id = ?, set_id = ?, brand_name = ?, generic_name = ?,
+                            indications_and_usage = ?, doc = ?, version = ?, effective_time = ?
+                        WHERE rowid = ?
+                        """,
+                        row + (existing[0],),
+                    )
+                    stats.updated += 1
+                else:
+                    stats.unchanged += 1
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# ── bulk 파일 처리 ──────────────────────────────────
+
+
+def iter_bulk_file(path: str) -> Iterator[dict]:
+    """bulk 파일(.json.zip 또는 .json)의 라벨 문서를 하나씩 반환"""
+    path = Path(path)
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if not member.endswith(".json"):
+                    continue
+                with archive.open(member) as raw:
+                    yield from iter_array_items(io.TextIOWrapper(raw, encoding="utf-8"))
+    else:
+        with open(path, "r", encoding="utf-8") as fp:
+            yield from iter_array_items(fp)
+
+
+def fetch_partitions(session: Optional[requests.Session] = None) -> tuple[str, list[str]]:
+    """OpenFDA 다운로드 색인에서 drug/label 파티션 URL 목록 조회 → (export_date, URL 목록)"""
+    session = session or requests.Session()
+    response = session.get(OPENFDA_DOWNLOAD_INDEX_URL, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    label_index = response.json()["results"]["drug"]["label"]
+    return label_index.get("export_date", ""), [p["file"] for p in label_index["partitions"]]
+
+
+def download_file(url: str, dest_dir: str, session: Optional[requests.Session] = None) -> Path:
+    """파일을 청크 단위로 디스크에 저장 (메모리에 올리지 않음)"""
+    session = session or requests.Session()
+    dest = Path(dest_dir) / url.rsplit("/", 1)[-1]
+    with session.get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        with open(dest, "wb") as fp:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                fp.write(chunk)
+    return dest
+
+
+def ingest_files(
+    mirror: LabelMirror, paths: Iterable[str], on_progress: Optional[Callable[[str], None]] = None
+) -> IngestStats:
+    """로컬 bulk 파일들을 미러에 적재 (on_progress: 파일별 진행 메시지 콜백)"""
+    total = IngestStats()
+    for path in paths:
+        stats = mirror.ingest_labels(iter_bulk_file(path))
+        if on_progress is not None:
+            on_progress(f"  {Path(path).name}: 추가 {stats.inserted} / 갱신 {stats.updated} / 삭제 {stats.removed}")
+        total.merge(stats)
+    mirror.set_meta("ingested_at", datetime.now().isoformat())
+    return total
+
+
+def download_and_ingest(
+    mirror: LabelMirror, work_dir: Optional[str] = None, on_progress: Optional[Callable[[str], None]] = None
+) -> IngestStats:
+    """
+    OpenFDA bulk 파티션을 하나씩 내려받아 적재
+    파티션 파일은 적재 직후 삭제하므로 디스크에는 한 번에 하나만 남음
+    """
+    session = requests.Session()
+    export_date, urls = fetch_partitions(session)
+    total = IngestStats()
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        for i, url in enumerate(urls, 1):
+            if on_progress is not None:
+                on_progress(f"[{i}/{len(urls)}] {url}")
+            path = download_file(url, tmp, session)
+            try:
+                total.merge(ingest_files(mirror, [str(path)], on_progress))
+            finally:
+                path.unlink(missing_ok=True)
+    mirror.set_meta("export_date", export_date)
+    if total.latest_effective_time:
+        mirror.set_meta("synced_effective_time", total.latest_effective_time)
+    return total
+
+
+def sync_updates(mirror: LabelMirror, client=None, since: str = "", page_size: int = OPENFDA_PAGE_SIZE) -> IngestStats:
+    """
+    증분 동기화: 마지막 동기화 이후 effective_time이 바뀐 라벨만 API로 받아 반영
+    - effective_time 오름차순으로 페이지를 넘기고, skip 상한에 닿으면 마지막 effective_time부터 다시 조회
+    - 경계일의 라벨은 다시 받게 되지만 version 비교로 건너뜀
+    - 오류 시 RuntimeError (기준 시점은 이미 반영한 라벨까지만 전진)
+    """
+    if client is None:
+        from src.api.openfda_client import get_client
+        client = get_client()
+
+    since = since or mirror.latest_effective_time()
+    if not since:
+        raise RuntimeError("동기화 기준 시점이 없습니다. 먼저 bulk 파일을 적재하세요.")
+
+    with request_priority(PRIORITY_BACKGROUND):
+        return _sync_from(mirror, client, since, page_size)
+
+
+def _sync_from(mirror: LabelMirror, client, since: str, page_size: int) -> IngestStats:
+    """since부터 끝까지 페이지 조회 + 반영"""
+    total = IngestStats()
+    while True:
+        window = IngestStats()
+        skip = 0
+        exhausted = False
+        while skip <= OPENFDA_MAX_SKIP:
+            data = client.fetch_label_updates(since, page_size, skip)
+            error = data.get("error")
+            if error == "No results found":
+                exhausted = True
+                break
+            if error:
+                total.merge(window)
+                if total.latest_effective_time:
+                    mirror.set_meta("synced_effective_time", total.latest_effective_time)
+                raise RuntimeError(f"OpenFDA 동기화 실패 (since={since}, skip={skip}): {error}")
+
+            results = data.get("results", [])
+            window.merge(mirror.ingest_labels(results))
+            if len(results) < page_size:
+                exhausted = True
+                break
+            skip += page_size
+
+        total.merge(window)
+        if exhausted or window.latest_effective_time <= since:
+            # 끝까지 받았거나, 같은 effective_time 라벨이 skip 상한보다 많아 더 전진할 수 없음
+            break
+        since = window.latest_effective_time
+
+    if total.latest_effective_time:
+        mirror.set_meta("synced_effective_time", total.latest_effective_time)
+    mirror.set_meta("synced_at", datetime.now().isoformat())
+    return total
+
+
+_mirror: Optional[LabelMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror(path: str) -> LabelMirror:
+    """프로세스 전역 LabelMirror 반환"""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = LabelMirror(path)
+    return _mirror
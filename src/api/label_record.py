@@ -0,0 +1,101 @@
+"""
+투영된 라벨 레코드 (__slots__)
+검색 결과 → 후처리 → 컨텍스트 → 세션 출처 표시까지 라벨을 중첩 dict 대신 이 형태로 전달
+- 사용하는 필드만 보관 (formatter.PROJECTED_* 기준)
+- 기존 dict 접근(get / [] / in)과 호환: label.get("openfda", {}).get("brand_name") 등 그대로 동작
+- 중복 제거/재정렬용 소문자 키를 생성 시 한 번만 계산
+"""
+from typing import Any, Iterator
+
+from src.api.formatter import PROJECTED_LABEL_FIELDS, PROJECTED_OPENFDA_FIELDS
+
+
+class LabelRecord:
+    """OpenFDA 라벨 한 건 (투영 필드 + 소문자 키)"""
+
+    __slots__ = PROJECTED_LABEL_FIELDS + PROJECTED_OPENFDA_FIELDS + ("brand_keys", "generic_keys")
+
+    def __init__(self, fields: dict, openfda: dict):
+        for field in PROJECTED_LABEL_FIELDS:
+            setattr(self, field, fields.get(field))
+        for field in PROJECTED_OPENFDA_FIELDS:
+            setattr(self, field, openfda.get(field))
+        self.brand_keys = tuple(name.lower().strip() for name in self.brand_name or ())
+        self.generic_keys = tuple(name.lower().strip() for name in self.generic_name or ())
+
+    @classmethod
+    def from_dict(cls, label: "dict | LabelRecord") -> "LabelRecord":
+        """라벨 문서(원본 또는 투영된 dict)에서 생성"""
+        if isinstance(label, LabelRecord):
+            return label
+        return cls(label, label.get("openfda") or {})
+
+    @property
+    def primary_generic(self) -> str:
+        """첫 번째 성분명 (소문자), 없으면 빈 문자열"""
+        return self.generic_keys[0] if self.generic_keys else ""
+
+    # ── dict 호환 접근 ───────────────────────────────
+
+    def _openfda(self) -> dict:
+        return {
+            field: value
+            for field in PROJECTED_OPENFDA_FIELDS
+            if (value := getattr(self, field)) is not None
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "openfda":
+            return self._openfda()
+        if key in PROJECTED_LABEL_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def keys(self) -> Iterator[str]:
+        for field in PROJECTED_LABEL_FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+        yield "openfda"
+
+    def to_dict(self) -> dict:
+        """JSON 직렬화용 dict (디스크 캐시/평가 결과 저장)"""
+        data = {field: value for field in PROJECTED_LABEL_FIELDS if (value := getattr(self, field)) is not None}
+        data["openfda"] = self._openfda()
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LabelRecord):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # 같은 내용(__eq__)이면 id/set_id도 같으므로 일관됨 (set/dict 키로 중복 제거 가능)
+        return hash((self.id, self.set_id))
+
+    def __repr__(self) -> str:
+        brand = self.brand_name[0] if self.brand_name else None
+        return f"LabelRecord(id={self.id!r}, brand_name={brand!r})"
+
+
+def brand_keys(label: "dict | LabelRecord") -> tuple[str, ...]:
+    """소문자 브랜드명 목록 (LabelRecord면 미리 계산된 값 사용)"""
+    if isinstance(label, LabelRecord):
+        return label.brand_keys
+    return tuple(name.lower().strip() for name in (label.get("openfda") or {}).get("brand_name", []))
+
+
+def generic_keys(label: "dict | LabelRecord") -> tuple[str, ...]:
+    """소문자 성분명 목록 (LabelRecord면 미리 계산된 값 사용)"""
+    if isinstance(label, LabelRecord):
+        return label.generic_keys
+    return tuple(name.lower().strip() for name in (label.get("openfda") or {}).get("generic_name", []))
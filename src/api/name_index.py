@@ -0,0 +1,266 @@
+"""
+브랜드명/성분명 색인 + 오타 교정
+- 단어 단위 어휘(vocabulary)에 SymSpell 방식 삭제 색인(오타)과 정렬 배열 기반 접두어 검색(부분 입력)을 구성
+- "tylenal" → "tylenol", "ibuprophen" → "ibuprofen", "advi" → "advil"
+- 검색 결과가 비었을 때만 교정어로 재검색 (사전에 없는 실제 약품명을 잘못 바꾸지 않도록)
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterable, Optional
+
+from src.config import (
+    LABEL_BACKEND,
+    LABEL_MIRROR_PATH,
+    NAME_INDEX_API_TERMS,
+    NAME_INDEX_RETRY_SECONDS,
+)
+
+NAME_FIELDS = ("openfda.brand_name", "openfda.generic_name")
+
+MAX_EDIT_DISTANCE = 2
+INDEX_DELETE_DISTANCE = 1   # 어휘 쪽은 1자 삭제까지만 색인 (질의 쪽 2자 삭제와 합쳐 거리 2까지 후보 확보, 색인 크기 1/3)
+PREFIX_LENGTH = 7           # SymSpell: 단어 앞 7자만 삭제 색인 (색인 크기 제한)
+MIN_PREFIX_QUERY = 3        # 부분 입력 보완을 시도할 최소 길이
+MAX_PREFIX_SCAN = 256       # 접두어 범위가 넓을 때 확인할 최대 어휘 수
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """소문자 영숫자 단어 목록 (OpenFDA 분석기처럼 하이픈/공백/구두점 기준 분리)"""
+    return _TOKEN.findall(text.lower())
+
+
+def _deletes(word: str, max_distance: int) -> set[str]:
+    """word 앞부분에서 최대 max_distance개 문자를 지운 모든 문자열"""
+    word = word[:PREFIX_LENGTH]
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    제한 Damerau-Levenshtein 거리 (인접 문자 교환 포함)
+    max_distance를 넘으면 max_distance + 1 반환
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class _Vocabulary:
+    """필드 하나의 단어 어휘 (빈도 포함)"""
+
+    def __init__(self):
+        self.frequency: Counter = Counter()
+        self._sorted: list[str] = []
+        self._deletes: dict[str, list[str]] = {}
+
+    def add(self, name: str, count: int = 1):
+        for token in tokenize(name):
+            self.frequency[token] += count
+
+    def build(self):
+        """접두어 배열 + 삭제 색인 구성"""
+        self._sorted = sorted(self.frequency)
+        deletes: dict[str, list[str]] = {}
+        for word in self._sorted:
+            for deleted in _deletes(word, INDEX_DELETE_DISTANCE):
+                deletes.setdefault(deleted, []).append(word)
+        self._deletes = deletes
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.frequency
+
+    def complete(self, prefix: str) -> Optional[str]:
+        """prefix로 시작하는 가장 흔한 단어"""
+        words = self._sorted
+        start = bisect_left(words, prefix)
+        best, best_count = None, 0
+        for word in words[start:start + MAX_PREFIX_SCAN]:
+            if not word.startswith(prefix):
+                break
+            count = self.frequency[word]
+            if count > best_count:
+                best, best_count = word, count
+        return best
+
+    def closest(self, token: str) -> Optional[str]:
+        """편집 거리가 가장 가까운 단어 (동률이면 빈도가 높은 단어), 짧은 단어는 거리 1까지만 허용"""
+        max_distance = 1 if len(token) <= 4 else MAX_EDIT_DISTANCE
+        candidates = set()
+        for deleted in _deletes(token, max_distance):
+            candidates.update(self._deletes.get(deleted, ()))
+
+        best, best_key = None, None
+        for word in candidates:
+            distance = edit_distance(token, word, max_distance)
+            if distance > max_distance:
+                continue
+            key = (distance, -self.frequency[word], word)
+            if best_key is None or key < best_key:
+                best, best_key = word, key
+        return best
+
+
+class NameIndex:
+    """브랜드명/성분명 필드별 어휘 색인"""
+
+    def __init__(self):
+        self._vocabularies = {field: _Vocabulary() for field in NAME_FIELDS}
+        # 원천 조회가 실패/빈 결과였으면 False (get_name_index가 나중에 다시 구성)
+        self.complete = True
+
+    def add_names(self, field: str, names: Iterable[tuple[str, int]]):
+        """(이름, 빈도) 목록 추가 (build() 호출 전)"""
+        vocabulary = self._vocabularies[field]
+        for name, count in names:
+            vocabulary.add(name, count)
+
+    def build(self) -> "NameIndex":
+        for vocabulary in self._vocabularies.values():
+            vocabulary.build()
+        return self
+
+    def size(self) -> dict:
+        return {field: len(vocabulary.frequency) for field, vocabulary in self._vocabularies.items()}
+
+    def correct(self, field: str, term: str) -> Optional[str]:
+        """
+        검색어 교정
+        - 모든 단어가 어휘에 있으면 None (교정 불필요)
+        - 마지막 단어는 부분 입력으로 보고 접두어 보완을 먼저 시도
+        - 교정할 수 없는 단어가 있으면 None
+        """
+        vocabulary = self._vocabularies.get(field)
+        tokens = tokenize(term or "")
+        if vocabulary is None or not tokens or all(token in vocabulary for token in tokens):
+            return None
+
+        corrected = []
+        for i, token in enumerate(tokens):
+            if token in vocabulary:
+                corrected.append(token)
+                continue
+            replacement = None
+            if i == len(tokens) - 1 and len(token) >= MIN_PREFIX_QUERY:
+                replacement = vocabulary.complete(token)
+            if replacement is None and not token.isdigit():
+                replacement = vocabulary.closest(token)
+            if replacement is None:
+                return None
+            corrected.append(replacement)
+        return " ".join(corrected)
+
+
+# ── 색인 원천 ───────────────────────────────────────
+
+
+def _router_names() -> dict[str, list[tuple[str, int]]]:
+    """로컬 라우터 사전의 영문 표기"""
+    from src.chain.router import BRAND_NAMES, GENERIC_NAMES
+
+    def english(names: dict) -> list[tuple[str, int]]:
+        return [(alias, 1) for canonical, aliases in names.items() for alias in [canonical, *aliases] if alias.isascii()]
+
+    return {
+        "openfda.brand_name": english(BRAND_NAMES),
+        "openfda.generic_name": english(GENERIC_NAMES),
+    }
+
+
+def _mirror_names() -> dict[str, list[tuple[str, int]]]:
+    """로컬 미러의 모든 라벨 이름 (라벨 하나당 빈도 1)"""
+    from src.api.label_mirror import get_mirror
+
+    names = {field: [] for field in NAME_FIELDS}
+    for brand_name, generic_name in get_mirror(LABEL_MIRROR_PATH).iter_names():
+        if brand_name:
+            names["openfda.brand_name"].append((brand_name, 1))
+        if generic_name:
+            names["openfda.generic_name"].append((generic_name, 1))
+    return names
+
+
+def _api_names() -> dict[str, list[tuple[str, int]]]:
+    """
+    OpenFDA count 쿼리로 라벨 수 상위 이름 조회 (실패하면 빈 목록)
+    대화형 검색보다 뒤로 밀리도록 background 우선순위로 요청
+    """
+    from src.api.openfda_client import get_client
+    from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND
+
+    client = get_client()
+    with request_priority(PRIORITY_BACKGROUND):
+        return {
+            field: [(row["term"], row["count"]) for row in client.count_field(f"{field}.exact", NAME_INDEX_API_TERMS)]
+            for field in NAME_FIELDS
+        }
+
+
+def build_name_index() -> NameIndex:
+    """
+    라우터 사전 + (미러 전체 또는 API 상위 이름)으로 색인 구성
+    미러/API 원천에 비어 있는 필드가 있으면 complete=False (라우터 사전만으로 우선 동작)
+    """
+    index = NameIndex()
+    source = _mirror_names() if LABEL_BACKEND == "mirror" else _api_names()
+    for names in (_router_names(), source):
+        for field, field_names in names.items():
+            index.add_names(field, field_names)
+    index.complete = all(source.get(field) for field in NAME_FIELDS)
+    return index.build()
+
+
+_index: Optional[NameIndex] = None
+_index_retry_at = 0.0   # 불완전한 색인을 다시 구성할 시각 (monotonic)
+_index_lock = threading.Lock()
+
+
+def get_name_index() -> NameIndex:
+    """
+    프로세스 전역 NameIndex 반환 (최초 호출 시 구성)
+    - 원천 조회가 실패/빈 결과였던 색인은 NAME_INDEX_RETRY_SECONDS 후 다시 구성
+    - 재구성 중에는 다른 호출자가 기다리지 않고 기존 색인 사용
+    """
+    global _index, _index_retry_at
+    index = _index
+    if index is not None and (index.complete or time.monotonic() < _index_retry_at):
+        return index
+    if not _index_lock.acquire(blocking=index is None):
+        return index
+    try:
+        index = _index
+        if index is None or (not index.complete and time.monotonic() >= _index_retry_at):
+            index = build_name_index()
+            _index = index
+            _index_retry_at = time.monotonic() + NAME_INDEX_RETRY_SECONDS
+        return index
+    finally:
+        _index_lock.release()
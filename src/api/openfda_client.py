@@ -1,135 +1,452 @@
 """OpenFDA API 클라이언트 - 실시간 API 호출"""
+import io
+import random
 import re
+import threading
+import time
+from typing import AsyncIterator, Callable, Optional, TextIO
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote
-from src.config import OPENFDA_BASE_URL, OPENFDA_API_KEY, OPENFDA_LABEL_ENDPOINT, SEARCH_LIMIT
+from src.config import (
+    OPENFDA_BASE_URL,
+    OPENFDA_API_KEY,
+    OPENFDA_LABEL_ENDPOINT,
+    SEARCH_LIMIT,
+    OPENFDA_PAGE_SIZE,
+    OPENFDA_MAX_SKIP,
+    HTTP_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_RETRY_STATUS,
+    LABEL_CACHE_ENABLED,
+    LABEL_CACHE_MAXSIZE,
+    LABEL_CACHE_TTL,
+    LABEL_DISK_CACHE_PATH,
+    LABEL_DISK_CACHE_FRESH_TTL,
+    LABEL_DISK_CACHE_MAX_STALE,
+    LABEL_DISK_CACHE_PURGE_INTERVAL,
+    LABEL_BACKEND,
+    LABEL_MIRROR_PATH,
+    NAME_INDEX_ENABLED,
+)
+from src.api.cache import TTLCache
+from src.api.disk_cache import DiskLabelCache
+from src.api.label_filter import default_filter
+from src.api.label_record import LabelRecord
+from src.api.json_stream import aiter_array_items, iter_array_items
+from src.utils.singleflight import SingleFlight
+from src.api.rate_limiter import RequestScheduler, get_scheduler, request_priority, PRIORITY_BACKGROUND
+
+
+def sanitize_search_term(term: str) -> str:
+    """검색어 정화 - 위험한 문자 제거"""
+    if not term or not isinstance(term, str):
+        return ""
+
+    # 길이 제한
+    term = term[:100].strip()
+
+    # 허용 문자만 유지 (영문, 숫자, 공백, 일부 안전한 특수문자)
+    term = re.sub(r'[^a-zA-Z0-9\s\-\.,\'\"]', '', term)
+
+    # 연속 공백 정리
+    term = re.sub(r'\s+', ' ', term).strip()
+
+    return term
+
+
+def build_search_query(field: str, safe_term: str) -> str:
+    """정화된 검색어로 search 파라미터 값 생성"""
+    # URL 인코딩
+    encoded_term = quote(safe_term, safe='')
+
+    # 검색어에 공백이 있으면 따옴표로 감싸기
+    if " " in safe_term:
+        return f'{field}:"{encoded_term}"'
+    return f"{field}:{encoded_term}"
+
+
+def project_approved(label: dict) -> Optional[LabelRecord]:
+    """비승인 라벨은 버리고, 나머지는 사용하는 필드만 남긴 LabelRecord로 변환"""
+    if default_filter.is_unapproved(label):
+        return None
+    return LabelRecord.from_dict(label)
+
+
+def read_projected(stream: TextIO, project: Callable[[dict], Optional[dict]]) -> dict:
+    """
+    응답 본문의 results 배열을 라벨 단위로 파싱 + 투영
+    반환: {"results": 투영된 결과, "raw_count": 투영 전 결과 수}
+    """
+    results = []
+    raw_count = 0
+    for item in iter_array_items(stream):
+        raw_count += 1
+        projected = project(item)
+        if projected is not None:
+            results.append(projected)
+    return {"results": results, "raw_count": raw_count}
+
+
+async def aread_projected(chunks: AsyncIterator[str], project: Callable[[dict], Optional[dict]]) -> dict:
+    """read_projected()의 비동기 버전 (응답 본문 청크를 받는 대로 파싱, 비동기 클라이언트용)"""
+    results = []
+    raw_count = 0
+    async for item in aiter_array_items(chunks):
+        raw_count += 1
+        projected = project(item)
+        if projected is not None:
+            results.append(projected)
+    return {"results": results, "raw_count": raw_count}
+
+
+def _read_projected_response(response: requests.Response, project: Callable[[dict], Optional[dict]]) -> dict:
+    """스트리밍 응답을 읽으면서 투영"""
+    response.raw.decode_content = True  # gzip 응답 해제
+    response.raw.auto_close = False     # 본문을 다 읽어도 닫지 않음 (TextIOWrapper가 EOF를 읽을 수 있도록)
+    return read_projected(io.TextIOWrapper(response.raw, encoding="utf-8"), project)
+
+
+def retry_delay(attempt: int, retry_after: Optional[str], backoff_factor: float = HTTP_BACKOFF_FACTOR) -> float:
+    """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 지수 백오프 + jitter, 동기/비동기 클라이언트 공용)"""
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return backoff_factor * (2 ** attempt) + random.uniform(0, backoff_factor)
+
+
+def _create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+) -> requests.Session:
+    """
+    keep-alive 커넥션 풀이 적용된 세션 생성
+    재시도는 어댑터가 아닌 OpenFDAClient._send_request에서 처리 (시도마다 요청 한도 토큰 소비)
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=0,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 class OpenFDAClient:
     """OpenFDA API 호출을 담당하는 클라이언트 클래스"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        cache: TTLCache | None = None,
+        disk_cache: DiskLabelCache | None = None,
+        scheduler: RequestScheduler | None = None,
+    ):
         self.base_url = OPENFDA_BASE_URL
         self.api_key = OPENFDA_API_KEY
-        self.timeout = 30
+        self.timeout = HTTP_TIMEOUT
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = _create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        if cache is None and LABEL_CACHE_ENABLED:
+            cache = TTLCache(maxsize=LABEL_CACHE_MAXSIZE, ttl=LABEL_CACHE_TTL)
+        self.cache = cache
+        if disk_cache is None and LABEL_DISK_CACHE_PATH:
+            disk_cache = DiskLabelCache(
+                LABEL_DISK_CACHE_PATH,
+                fresh_ttl=LABEL_DISK_CACHE_FRESH_TTL,
+                max_stale=LABEL_DISK_CACHE_MAX_STALE,
+                purge_interval=LABEL_DISK_CACHE_PURGE_INTERVAL,
+            )
+        self.disk_cache = disk_cache
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+        self._search_flight = SingleFlight()
+        self._refreshing: set = set()
+        self._refresh_lock = threading.Lock()
 
-    def _build_url(self, endpoint: str, search_query: str, limit: int = SEARCH_LIMIT) -> str:
+    def close(self):
+        """커넥션 풀 및 디스크 캐시 정리"""
+        self.session.close()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
+    def _build_url(
+        self, endpoint: str, search_query: str, limit: int = SEARCH_LIMIT, skip: int = 0, sort: str = ""
+    ) -> str:
         """API 요청 URL 생성"""
         url = f"{self.base_url}{endpoint}"
         params = f"?search={search_query}&limit={limit}"
+        if skip:
+            params += f"&skip={skip}"
+        if sort:
+            params += f"&sort={sort}"
         if self.api_key:
             params += f"&api_key={self.api_key}"
         return url + params
 
-    def _make_request(self, url: str) -> dict:
-        """API 요청 실행 및 응답 반환"""
-        try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 404:
-                return {"error": "No results found", "results": []}
-            return {"error": str(e), "results": []}
-        except requests.RequestException as e:
-            return {"error": str(e), "results": []}
+    def _make_request(self, url: str, project: Optional[Callable[[dict], Optional[dict]]] = None) -> dict:
+        """
+        API 요청 실행 및 응답 반환 (같은 요청이 진행 중이면 그 결과를 공유)
+        - project: 지정하면 응답 본문을 스트리밍으로 파싱하며 results 원소마다 적용 (None 반환 시 버림)
+          전체 응답을 dict로 만들지 않고 라벨 하나씩 처리 → 남긴 필드만 메모리에 유지
+        """
+        return self.scheduler.coalesce((url, project), lambda: self._send_request(url, project))
+
+    def _send_request(self, url: str, project: Optional[Callable[[dict], Optional[dict]]] = None) -> dict:
+        """
+        요청 한도 토큰을 받은 뒤 API 호출
+        429/5xx/연결 오류는 max_retries번까지 재시도 (재시도도 한도에 포함되므로 시도마다 토큰 획득)
+        """
+        for attempt in range(self.max_retries + 1):
+            if not self.scheduler.acquire():
+                # 일시적 오류와 같이 취급 → 캐시하지 않음
+                return {"error": "OpenFDA rate limit exceeded (client queue)", "results": []}
+            retry_after = None
+            try:
+                with self.session.get(url, timeout=self.timeout, stream=project is not None) as response:
+                    if response.status_code in HTTP_RETRY_STATUS and attempt < self.max_retries:
+                        retry_after = response.headers.get("Retry-After")
+                    else:
+                        response.raise_for_status()
+                        if project is None:
+                            return response.json()
+                        return _read_projected_response(response, project)
+            except requests.exceptions.HTTPError as e:
+                if response.status_code == 404:
+                    return {"error": "No results found", "results": []}
+                return {"error": str(e), "results": []}
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    return {"error": str(e), "results": []}
+            except (requests.RequestException, urllib3.exceptions.HTTPError, ValueError) as e:
+                # 스트리밍 중 연결 끊김/잘린 본문도 일시적 오류로 처리
+                return {"error": str(e), "results": []}
+            time.sleep(retry_delay(attempt, retry_after, self.backoff_factor))
+        return {"error": "OpenFDA request failed after retries", "results": []}
 
     def _sanitize_search_term(self, term: str) -> str:
         """검색어 정화 - 위험한 문자 제거"""
-        if not term or not isinstance(term, str):
-            return ""
+        return sanitize_search_term(term)
 
-        # 길이 제한
-        term = term[:100].strip()
+    def search_drug_label(self, field: str, term: str, limit: int = SEARCH_LIMIT, skip: int = 0) -> list[LabelRecord]:
+        """
+        의약품 라벨 정보 검색 (보안 강화 + 캐시)
+        - field: 검색 필드 (openfda.brand_name, openfda.generic_name, indications_and_usage 등)
+        - term: 검색어
+        - limit: 최대 결과 수 (한 페이지)
+        - skip: 건너뛸 결과 수 (페이지 이동)
+        """
+        # 검색어 정화
+        safe_term = self._sanitize_search_term(term)
+        if not safe_term:
+            return []
 
-        # 허용 문자만 유지 (영문, 숫자, 공백, 일부 안전한 특수문자)
-        term = re.sub(r'[^a-zA-Z0-9\s\-\.,\'\"]', '', term)
+        cache_key = (field, safe_term.lower(), limit) if not skip else (field, safe_term.lower(), limit, skip)
 
-        # 연속 공백 정리
-        term = re.sub(r'\s+', ' ', term).strip()
+        def fetch():
+            results, cacheable, _ = self._fetch_drug_label(field, safe_term, limit, skip)
+            return results, cacheable
 
-        return term
+        return self._cached_search(cache_key, fetch)
 
-    def search_drug_label(self, field: str, term: str) -> list[dict]:
+    def search_paged(self, field: str, term: str, total: int, page_size: int = OPENFDA_PAGE_SIZE) -> list[LabelRecord]:
         """
-        의약품 라벨 정보 검색 (보안 강화)
-        - field: 검색 필드 (openfda.brand_name, openfda.generic_name, indications_and_usage 등)
-        - term: 검색어
+        최대 total개까지 skip으로 페이지를 넘기며 검색 (2단계 검색의 1단계용)
+        - 한 페이지에 page_size개씩 요청하고, 마지막 페이지(결과 부족/404)에서 중단
+        - 합쳐진 결과 전체를 하나의 캐시 항목으로 저장
         """
-        # 검색어 정화
+        if total <= page_size:
+            return self.search_drug_label(field, term, total)
+
         safe_term = self._sanitize_search_term(term)
         if not safe_term:
             return []
 
-        # URL 인코딩
-        encoded_term = quote(safe_term, safe='')
+        cache_key = (field, safe_term.lower(), total, "paged")
+        return self._cached_search(cache_key, lambda: self._fetch_paged(field, safe_term, total, page_size))
+
+    def _fetch_paged(self, field: str, safe_term: str, total: int, page_size: int) -> tuple[list[dict], bool]:
+        """페이지 단위 API 호출 (일부 페이지가 실패하면 받은 만큼 반환하고 캐시하지 않음)"""
+        combined = []
+        for skip in range(0, min(total, OPENFDA_MAX_SKIP + page_size), page_size):
+            limit = min(page_size, total - skip)
+            results, cacheable, raw_count = self._fetch_drug_label(field, safe_term, limit, skip)
+            if not cacheable:
+                return combined, False
+            combined.extend(results)
+            if raw_count < limit:
+                break
+        return combined, True
+
+    def _cached_search(self, cache_key: tuple, fetch: Callable[[], tuple[list[dict], bool]]) -> list[dict]:
+        """메모리 캐시 → 디스크 캐시 → API 순으로 조회"""
+        # 1. 메모리 캐시
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+        # 2. 디스크 캐시 (stale이면 즉시 반환하고 백그라운드에서 갱신)
+        if self.disk_cache is not None:
+            stored = self.disk_cache.get(cache_key)
+            if stored is not None:
+                results, is_stale = stored
+                if is_stale:
+                    self._schedule_refresh(cache_key, fetch)
+                elif self.cache is not None:
+                    self.cache.set(cache_key, results)
+                return list(results)
+
+        # 3. API 호출 (같은 검색이 진행 중이면 그 결과를 공유)
+        return list(self._search_flight.do(cache_key, lambda: self._fetch_and_store(cache_key, fetch)))
+
+    def _fetch_and_store(self, cache_key: tuple, fetch: Callable[[], tuple[list[dict], bool]]) -> list[dict]:
+        """API 호출 후 결과를 메모리/디스크 캐시에 저장"""
+        results, cacheable = fetch()
+        if cacheable:
+            if self.cache is not None:
+                self.cache.set(cache_key, results)
+            if self.disk_cache is not None:
+                self.disk_cache.set(cache_key, results)
+        return results
 
-        # 검색어에 공백이 있으면 따옴표로 감싸기
-        if " " in safe_term:
-            search_query = f'{field}:"{encoded_term}"'
-        else:
-            search_query = f"{field}:{encoded_term}"
+    def _schedule_refresh(self, cache_key: tuple, fetch: Callable[[], tuple[list[dict], bool]]):
+        """stale 항목 백그라운드 갱신 (같은 키는 동시에 한 번만)"""
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
 
-        url = self._build_url(OPENFDA_LABEL_ENDPOINT, search_query)
-        data = self._make_request(url)
+        def _refresh():
+            try:
+                # 실패(429/5xx/네트워크) 시 저장하지 않으므로 기존 stale 항목이 유지됨
+                with request_priority(PRIORITY_BACKGROUND):
+                    self._fetch_and_store(cache_key, fetch)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+
+        threading.Thread(target=_refresh, name="openfda-refresh", daemon=True).start()
+
+    def _fetch_drug_label(self, field: str, safe_term: str, limit: int, skip: int = 0) -> tuple[list[dict], bool, int]:
+        """
+        API 호출 + Homeopathy 필터링 + 필드 투영
+        반환: (필터링된 결과, 캐시 가능 여부, 필터링 전 결과 수)
+        - 일시적 오류(429/5xx/네트워크)는 캐시하지 않음
+        """
+        url = self._build_url(OPENFDA_LABEL_ENDPOINT, build_search_query(field, safe_term), limit, skip)
+        # Homeopathy 필터링 + 필드 투영은 스트리밍 파싱 중에 라벨 단위로 적용
+        data = self._make_request(url, project=project_approved)
         results = data.get("results", [])
+        cacheable = data.get("error") in (None, "No results found")
+
+        return results, cacheable, data.get("raw_count", len(results))
+
+    def fetch_label_updates(self, since: str, limit: int = OPENFDA_PAGE_SIZE, skip: int = 0) -> dict:
+        """
+        effective_time이 since(YYYYMMDD) 이후인 라벨을 오래된 순으로 조회 (미러 동기화용)
+        - 캐시/필터를 거치지 않은 원본 응답 반환 (비승인으로 바뀐 라벨도 미러에서 지워야 하므로)
+        """
+        search_query = f"effective_time:[{since}+TO+99991231]"
+        url = self._build_url(OPENFDA_LABEL_ENDPOINT, search_query, limit, skip, sort="effective_time:asc")
+        return self._make_request(url)
+
+    def count_field(self, field: str, limit: int = 1000) -> list[dict]:
+        """
+        필드 값별 라벨 수 조회 (count 쿼리, 이름 색인 구성용)
+        반환: [{"term": ..., "count": ...}, ...] (실패 시 빈 목록)
+        """
+        url = f"{self.base_url}{OPENFDA_LABEL_ENDPOINT}?count={field}&limit={limit}"
+        if self.api_key:
+            url += f"&api_key={self.api_key}"
+        return self._make_request(url).get("results", [])
+
+    def scheduler_stats(self) -> dict:
+        """요청 스케줄러 대기열/한도 통계 + 검색 single-flight 통계"""
+        return {**self.scheduler.metrics(), "search_flight": self._search_flight.stats()}
+
+    def cache_stats(self) -> dict:
+        """캐시 적중/실패/축출 통계"""
+        if self.cache is None:
+            return {}
+        stats = self.cache.stats.to_dict()
+        stats["size"] = len(self.cache)
+        return stats
+
+
+# 분류 카테고리 → OpenFDA 검색 필드
+CATEGORY_FIELDS = {
+    "brand_name": "openfda.brand_name",
+    "generic_name": "openfda.generic_name",
+    "indication": "indications_and_usage",
+}
+
+
+# 프로세스 전역 클라이언트 (세션/커넥션 풀 재사용)
+_client: OpenFDAClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> OpenFDAClient:
+    """프로세스 전역 OpenFDAClient 반환 (최초 호출 시 생성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenFDAClient()
+    return _client
+
+
+def get_label_source():
+    """
+    설정된 라벨 검색 백엔드 반환 (LABEL_BACKEND)
+    - "api": OpenFDAClient / "mirror": 로컬 LabelMirror
+    두 백엔드 모두 search_drug_label(field, term, limit, skip) / search_paged(field, term, total) 제공
+    """
+    if LABEL_BACKEND == "mirror":
+        from src.api.label_mirror import get_mirror
+        return get_mirror(LABEL_MIRROR_PATH)
+    return get_client()
+
+
+def search_by_name(field: str, term: str, limit: int = SEARCH_LIMIT) -> list[LabelRecord]:
+    """
+    브랜드명/성분명 검색 (limit이 한 페이지를 넘으면 페이지 검색)
+    결과가 없으면 이름 색인으로 오타/부분 입력을 교정해 한 번 더 검색 ("tylenal" → "tylenol")
+    """
+    source = get_label_source()
+    results = source.search_paged(field, term, limit)
+    if results or not NAME_INDEX_ENABLED:
+        return results
+
+    from src.api.name_index import get_name_index
+    corrected = get_name_index().correct(field, term)
+    if corrected is None:
+        return results
+    return source.search_paged(field, corrected, limit)
+
 
-        # Homeopathy 필터링
-        filtered_results = []
-        for result in results:
-            is_homeopathic = False
-            
-            # 1. openfda.product_type 확인
-            openfda = result.get("openfda", {})
-            if not openfda:
-                # OpenFDA 메타데이터가 없는 경우 (매칭되지 않은 비승인 약물 등)
-                is_homeopathic = True
-            
-            if not is_homeopathic:
-                product_types = openfda.get("product_type", [])
-                for pt in product_types:
-                    pt_lower = pt.lower()
-                    if "homeopathic" in pt_lower or "unapproved homeopathic" in pt_lower:
-                        is_homeopathic = True
-                        break
-            
-            # 2. unapproved_pharmaceutical 필드 확인 (OpenFDA flag)
-            # 및 Application Number 부재 확인 (Sabal Serrulata 등 비승인 약물 필터링)
-            if not is_homeopathic:
-                # HUMAN OTC DRUG 또는 HUMAN PRESCRIPTION DRUG인데 application_number가 없으면 승인받지 않은(unapproved) 제품일 확률 높음
-                is_drug = any("human" in pt.lower() and "drug" in pt.lower() for pt in product_types)
-                if is_drug and not openfda.get("application_number"):
-                     is_homeopathic = True
-
-            # 3. spl_product_data_elements 확인
-            if not is_homeopathic:
-                spl_elements = result.get("spl_product_data_elements", [])
-                if isinstance(spl_elements, list):
-                    for elem in spl_elements:
-                        elem_lower = elem.lower()
-                        if "homeopathic" in elem_lower or "unapproved homeopathic" in elem_lower:
-                            is_homeopathic = True
-                            break
-            
-            if not is_homeopathic:
-                filtered_results.append(result)
-
-        return filtered_results
-
-
-def search_by_brand_name(brand_name: str) -> list[dict]:
+def search_by_brand_name(brand_name: str) -> list[LabelRecord]:
     """브랜드명으로 검색"""
-    client = OpenFDAClient()
-    return client.search_drug_label("openfda.brand_name", brand_name)
+    return search_by_name("openfda.brand_name", brand_name)
 
 
-def search_by_generic_name(generic_name: str) -> list[dict]:
+def search_by_generic_name(generic_name: str) -> list[LabelRecord]:
     """일반명(성분명)으로 검색"""
-    client = OpenFDAClient()
-    return client.search_drug_label("openfda.generic_name", generic_name)
+    return search_by_name("openfda.generic_name", generic_name)
 
 
-def search_by_indication(indication: str) -> list[dict]:
+def search_by_indication(indication: str) -> list[LabelRecord]:
     """적응증(효능)으로 검색"""
-    client = OpenFDAClient()
-    return client.search_drug_label("indications_and_usage", indication)
+    return get_label_source().search_drug_label("indications_and_usage", indication)
@@ -0,0 +1,275 @@
+"""
+OpenFDA 요청 스케줄러 (토큰 버킷)
+- 분당 한도(토큰 버킷) + 일일 한도, 프로세스 전역 공유 (스레드/Streamlit 세션/asyncio 루프 공용)
+- 다른 프로세스와는 공유하지 않음 (uvicorn 워커 여러 개면 WEB_CONCURRENCY로 한도를 나눔, config 참고)
+- 우선순위 대기열: 사용자 요청이 백그라운드 갱신/동기화보다 먼저 토큰을 받음
+- 같은 URL 동시 요청 병합 (한 번만 호출하고 결과 공유)
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Hashable, Optional
+
+from src.utils.singleflight import SingleFlight
+from src.config import (
+    OPENFDA_RATE_PER_MINUTE,
+    OPENFDA_RATE_BURST,
+    OPENFDA_DAILY_LIMIT,
+    OPENFDA_QUEUE_TIMEOUT,
+)
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_INTERACTIVE = 0    # 사용자 질문
+PRIORITY_BATCH = 1          # 평가/비교 스크립트
+PRIORITY_BACKGROUND = 2     # stale 캐시 갱신, 미러 동기화, 색인 구성
+
+_priority: ContextVar[int] = ContextVar("openfda_request_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """with 블록 안에서 보내는 OpenFDA 요청의 우선순위 지정"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+@dataclass
+class SchedulerStats:
+    """스케줄러 통계"""
+    granted: int = 0            # 토큰을 받은 요청
+    throttled: int = 0          # 토큰을 기다린 요청
+    rejected: int = 0           # 일일 한도/대기 시간 초과로 거절된 요청
+    wait_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "wait_seconds": self.wait_seconds,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class _Waiter:
+    """대기열 항목 (스레드 대기자는 Condition, 비동기 대기자는 자기 루프의 future로 깨움)"""
+    __slots__ = ("granted", "loop", "future")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.granted: Optional[bool] = None    # None: 대기 중, True: 토큰 획득, False: 거절
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class RequestScheduler:
+    """
+    토큰 버킷 + 우선순위 대기열
+    - rate_per_minute: 분당 토큰 보충량 (OpenFDA: 키 유무와 관계없이 240/분)
+    - burst: 버킷 크기 (순간 최대 요청 수)
+    - daily_limit: 일일 요청 한도 (자정에 초기화)
+    - 한도는 프로세스 단위 (여러 워커 프로세스면 config에서 워커 수로 나눠 설정)
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: int = OPENFDA_RATE_PER_MINUTE,
+        burst: int = OPENFDA_RATE_BURST,
+        daily_limit: int = OPENFDA_DAILY_LIMIT,
+        queue_timeout: float = OPENFDA_QUEUE_TIMEOUT,
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.daily_limit = daily_limit
+        self.queue_timeout = queue_timeout
+        self.stats = SchedulerStats()
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._day = date.today()
+        self._daily_used = 0
+        self._waiters: list[tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._flight = SingleFlight()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._daily_used = 0
+
+    def _enqueue(self, priority: int, waiter: _Waiter):
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, len(self._waiters))
+
+    def _resolve(self, waiter: _Waiter, granted: bool):
+        waiter.granted = granted
+        if waiter.future is not None:
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:
+                # 루프가 이미 닫힘 (대기하던 코루틴도 없음)
+                pass
+
+    def _dispatch(self, now: float):
+        """
+        대기열 맨 앞(우선순위 → 도착 순)부터 토큰이 있는 만큼 배분 (_cond 보유 상태에서 호출)
+        일일 한도를 다 쓰면 남은 대기자는 모두 거절
+        """
+        self._refill(now)
+        changed = False
+        while self._waiters:
+            if self._daily_used >= self.daily_limit:
+                _, _, waiter = heapq.heappop(self._waiters)
+                self.stats.rejected += 1
+                self._resolve(waiter, False)
+            elif self._tokens >= 1:
+                _, _, waiter = heapq.heappop(self._waiters)
+                self._tokens -= 1
+                self._daily_used += 1
+                self.stats.granted += 1
+                self._resolve(waiter, True)
+            else:
+                break
+            changed = True
+        if changed:
+            self._cond.notify_all()
+
+    def _next_token_in(self) -> float:
+        """다음 토큰이 찰 때까지 남은 시간"""
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    def _withdraw(self, waiter: _Waiter):
+        """시간 초과/취소된 대기자를 대기열에서 제거"""
+        self._waiters = [entry for entry in self._waiters if entry[2] is not waiter]
+        heapq.heapify(self._waiters)
+        self._cond.notify_all()
+
+    def _finish(self, waiter: _Waiter, started: float, now: float, waited: bool) -> bool:
+        if waiter.granted and waited:
+            self.stats.throttled += 1
+            self.stats.wait_seconds += now - started
+        return bool(waiter.granted)
+
+    def acquire(self, priority: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        요청 1건 분량의 토큰 획득 (필요하면 대기)
+        대기열 맨 앞(우선순위 → 도착 순)인 요청만 토큰을 가져감
+        반환: 일일 한도 소진 또는 timeout 초과 시 False
+        """
+        priority = current_priority() if priority is None else priority
+        timeout = self.queue_timeout if timeout is None else timeout
+        started = now = time.monotonic()
+        deadline = started + timeout
+        waiter = _Waiter()
+        waited = False
+
+        with self._cond:
+            self._enqueue(priority, waiter)
+            self._dispatch(now)
+            while waiter.granted is None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._withdraw(waiter)
+                    self.stats.rejected += 1
+                    return False
+                # 다음 토큰이 찰 때 다시 배분 (다른 대기자가 먼저 배분하면 notify로 깨어남)
+                self._cond.wait(min(self._next_token_in(), remaining))
+                waited = True
+                now = time.monotonic()
+                self._dispatch(now)
+            return self._finish(waiter, started, now, waited)
+
+    async def acquire_async(self, priority: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        acquire()의 비동기 버전 (같은 우선순위 대기열 사용)
+        워커 스레드를 점유하지 않고 루프의 future로 대기, 토큰이 배분되면 루프로 깨움
+        """
+        priority = current_priority() if priority is None else priority
+        timeout = self.queue_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waiter = _Waiter(asyncio.get_running_loop())
+        waited = False
+
+        with self._cond:
+            self._enqueue(priority, waiter)
+        try:
+            while True:
+                with self._cond:
+                    now = time.monotonic()
+                    self._dispatch(now)
+                    if waiter.granted is not None:
+                        return self._finish(waiter, started, now, waited)
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._withdraw(waiter)
+                        self.stats.rejected += 1
+                        return False
+                    wait = min(self._next_token_in(), remaining)
+                await asyncio.wait((waiter.future,), timeout=wait)
+                waited = True
+        except asyncio.CancelledError:
+            with self._cond:
+                if waiter.granted:
+                    # 이미 받은 토큰은 반납
+                    self._tokens = min(self.capacity, self._tokens + 1)
+                    self._daily_used -= 1
+                    self.stats.granted -= 1
+                    self._dispatch(time.monotonic())
+                elif waiter.granted is None:
+                    self._withdraw(waiter)
+            raise
+
+    def coalesce(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """같은 key의 호출이 진행 중이면 그 결과를 기다려 공유, 아니면 fn() 실행"""
+        return self._flight.do(key, fn)
+
+    def metrics(self) -> dict:
+        """현재 상태 + 누적 통계"""
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                **self.stats.to_dict(),
+                "queue_depth": len(self._waiters),
+                "coalesced": self._flight.shared,
+                "in_flight": self._flight.in_flight(),
+                "tokens": self._tokens,
+                "daily_used": self._daily_used,
+                "daily_limit": self.daily_limit,
+            }
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """프로세스 전역 RequestScheduler 반환 (동기/비동기 클라이언트 공용)"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler()
+    return _scheduler
@@ -0,0 +1,179 @@
+"""
+반복 질문용 답변 캐시
+- 질문을 정규화(약품명/증상 표기 통일, 문장부호·어미 제거)한 키로 prepare_context 결과와 답변을 저장
+- 답변은 정규화 키가 정확히 같을 때만 재사용
+- 키가 다르지만 같은 약품/증상을 묻는 거의 같은 질문(문자 trigram 유사도)은 검색 컨텍스트만 재사용하고 답변은 새로 생성
+  ("술을 마셔도 되나요" / "물을 마셔도 되나요"처럼 한 글자 차이로 뜻이 달라질 수 있으므로)
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from src.api.cache import TTLCache
+from src.chain.router import get_router, normalize_text
+from src.config import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_MAXSIZE,
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_SIMILARITY,
+)
+
+# 문장 끝 의문/종결 어미 ("어떤 약인가요?" / "어떤 약이에요" → "어떤 약")
+_SENTENCE_ENDING = re.compile(
+    r"(인가요|인가여|이에요|이예요|예요|에요|입니까|인지요|인지|일까요|나요|가요|죠|요|니|냐|까)$"
+)
+_NON_WORD = re.compile(r"[^\w]")
+
+
+@dataclass
+class CachedAnswer:
+    """캐시 항목: prepare_context 결과 + (있다면) 완성된 답변"""
+    context_data: dict
+    answer: Optional[str] = None
+
+
+def normalize_question(question: str) -> tuple[str, tuple]:
+    """
+    질문 정규화
+    반환: (정규화 키, 엔티티 서명) - 서명은 질문에 등장한 (category, keyword) 목록
+    """
+    text = normalize_text(question).strip()
+    spans = get_router().find_spans(text)
+
+    # 약품명/증상 표기를 대표 키워드로 통일 ("타이레놀" / "Tylenol" → "tylenol")
+    parts = []
+    last = 0
+    for start, end, (_, keyword) in spans:
+        parts.append(text[last:start])
+        parts.append(keyword.lower())
+        last = end
+    parts.append(text[last:])
+
+    key = _NON_WORD.sub("", "".join(parts))
+    key = _SENTENCE_ENDING.sub("", key)
+    signature = tuple(sorted({value for _, _, value in spans}))
+    return key, signature
+
+
+def _trigrams(text: str) -> frozenset:
+    if len(text) < 3:
+        return frozenset({text})
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class AnswerCache:
+    """
+    정규화 질문 키 기반 답변 캐시 (스레드 안전)
+    - 정확 일치: TTLCache 조회 (저장된 답변 포함)
+    - 근사 일치: 같은 엔티티 서명을 가진 항목 중 trigram Jaccard 유사도 >= similarity (컨텍스트만)
+    - enabled=False이면 조회/저장 모두 하지 않음 (평가 스크립트 등)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = ANSWER_CACHE_MAXSIZE,
+        ttl: float = ANSWER_CACHE_TTL,
+        similarity: float = ANSWER_CACHE_SIMILARITY,
+        enabled: bool = ANSWER_CACHE_ENABLED,
+    ):
+        self.enabled = enabled
+        self.similarity = similarity
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # 엔티티 서명 → {정규화 키: trigram 집합}
+        self._index: dict[tuple, "OrderedDict[str, frozenset]"] = {}
+        self._lock = threading.Lock()
+        self.near_hits = 0
+
+    @property
+    def stats(self):
+        return self._entries.stats
+
+    def lookup(self, question: str) -> Optional[CachedAnswer]:
+        """
+        질문에 해당하는 캐시 항목 조회
+        근사 일치 항목은 answer=None으로 반환 (다른 질문의 답변을 돌려주지 않음)
+        """
+        if not self.enabled:
+            return None
+        key, signature = normalize_question(question)
+        if not key:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        # 엔티티가 없는 질문은 근사 일치를 허용하지 않음 (다른 약을 묻는 질문과 섞이지 않도록)
+        if not signature:
+            return None
+
+        grams = _trigrams(key)
+        with self._lock:
+            candidates = list(self._index.get(signature, {}).items())
+
+        best_key, best_score = None, self.similarity
+        for other_key, other_grams in candidates:
+            score = _jaccard(grams, other_grams)
+            if score >= best_score:
+                best_key, best_score = other_key, score
+        if best_key is None:
+            return None
+
+        entry = self._entries.get(best_key)
+        if entry is None:
+            # 만료/축출된 항목은 색인에서도 정리
+            with self._lock:
+                self._index.get(signature, {}).pop(best_key, None)
+            return None
+        self.near_hits += 1
+        return CachedAnswer(context_data=entry.context_data)
+
+    def store_context(self, question: str, context_data: dict):
+        """prepare_context 결과 저장"""
+        self._store(question, CachedAnswer(context_data=context_data))
+
+    def store_answer(self, question: str, context_data: dict, answer: str):
+        """완성된 답변 저장"""
+        self._store(question, CachedAnswer(context_data=context_data, answer=answer))
+
+    def _store(self, question: str, entry: CachedAnswer):
+        if not self.enabled:
+            return
+        key, signature = normalize_question(question)
+        if not key:
+            return
+        self._entries.set(key, entry)
+        if signature:
+            with self._lock:
+                bucket = self._index.setdefault(signature, OrderedDict())
+                bucket[key] = _trigrams(key)
+                bucket.move_to_end(key)
+                while len(bucket) > self._entries.maxsize:
+                    bucket.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        with self._lock:
+            self._index.clear()
+
+
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """프로세스 전역 AnswerCache 반환"""
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache()
+    return _answer_cache
@@ -0,0 +1,72 @@
+"""
+ChatOpenAI 인스턴스 레지스트리
+(model, temperature, streaming) 조합마다 인스턴스를 하나만 만들어 재사용
+→ 요청/스레드 간 HTTP 커넥션 풀과 TLS 세션 공유
+"""
+import threading
+import time
+from langchain_openai import ChatOpenAI
+
+from src.config import OPENAI_API_KEY
+
+_models: dict[tuple, ChatOpenAI] = {}
+_lock = threading.Lock()
+# 통계 카운터 전용 락 (인스턴스 생성 중인 _lock을 기다리지 않도록 분리)
+_stats_lock = threading.Lock()
+_stats = {
+    "created": 0,
+    "reused": 0,
+    "construct_seconds": 0.0,
+}
+
+
+def get_chat_model(model: str, temperature: float = 0.0, streaming: bool = False) -> ChatOpenAI:
+    """캐시된 ChatOpenAI 반환 (없으면 생성)"""
+    key = (model, temperature, streaming)
+    llm = _models.get(key)
+    if llm is not None:
+        with _stats_lock:
+            _stats["reused"] += 1
+        return llm
+
+    with _lock:
+        llm = _models.get(key)
+        if llm is None:
+            started = time.perf_counter()
+            llm = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                openai_api_key=OPENAI_API_KEY,
+                streaming=streaming,
+            )
+            with _stats_lock:
+                _stats["construct_seconds"] += time.perf_counter() - started
+                _stats["created"] += 1
+            _models[key] = llm
+        else:
+            with _stats_lock:
+                _stats["reused"] += 1
+    return llm
+
+
+def registry_stats() -> dict:
+    """
+    재사용 통계
+    - saved_seconds_estimate: 재사용 횟수 × 평균 생성 시간 (클라이언트 생성 비용만, 핸드셰이크 절감은 제외)
+    """
+    with _stats_lock:
+        created, reused, construct_seconds = _stats["created"], _stats["reused"], _stats["construct_seconds"]
+    avg_construct = construct_seconds / created if created else 0.0
+    return {
+        "models": len(_models),
+        "created": created,
+        "reused": reused,
+        "avg_construct_seconds": avg_construct,
+        "saved_seconds_estimate": reused * avg_construct,
+    }
+
+
+def clear_registry():
+    """레지스트리 초기화 (테스트/설정 변경 시)"""
+    with _lock:
+        _models.clear()
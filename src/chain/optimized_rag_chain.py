@@ -1,31 +1,32 @@
 """
 최적화된 RAG 체인
 OptimizationConfig를 적용한 RAG 파이프라인
+- 분류 + 검색(retrieve)은 설정과 무관하므로 여러 설정을 비교할 때는 질문당 한 번만 수행하고
+  prepare_context_from()으로 설정별 후처리(중복 제거, 재정렬, 2단계 선택)만 적용
 """
 import json
-from typing import Generator, Dict
+from dataclasses import dataclass
+from typing import Generator, Dict, Iterable
 from langchain_openai import ChatOpenAI
 
 from src.chain.prompts import CLASSIFIER_PROMPT, ANSWER_PROMPT as GENERATOR_PROMPT
 from src.api.openfda_client import (
-    search_by_brand_name,
-    search_by_generic_name,
-    search_by_indication,
+    CATEGORY_FIELDS,
+    get_label_source,
+    search_by_name,
 )
+from src.api.label_record import LabelRecord
 from src.api.formatter import format_label_results
-from src.config import OPENAI_API_KEY
+from src.chain.llm_registry import get_chat_model
 from src.optimization_config import OptimizationConfig, BASELINE
 from src.optimizations import apply_optimizations
+from src.config import SEARCH_LIMIT
 
 
 def _get_classifier(config: OptimizationConfig) -> ChatOpenAI:
     """분류용 LLM (GPT-4 사용 여부에 따라)"""
     model = "gpt-4o-mini" if config.use_gpt4 else "gpt-4o-mini"
-    return ChatOpenAI(
-        model=model,
-        temperature=0.0,
-        openai_api_key=OPENAI_API_KEY,
-    )
+    return get_chat_model(model, temperature=0.0)
 
 
 def _get_generator(config: OptimizationConfig, streaming: bool = False) -> ChatOpenAI:
@@ -33,12 +34,8 @@ def _get_generator(config: OptimizationConfig, streaming: bool = False) -> ChatO
     # GPT-4 사용 여부에 따라 모델 선택
     model = "gpt-4o" if config.use_gpt4 else "gpt-4o-mini"
     
-    return ChatOpenAI(
-        model=model,
-        temperature=0.0,  # Faithfulness 향상을 위해 낮은 temperature
-        openai_api_key=OPENAI_API_KEY,
-        streaming=streaming,
-    )
+    # Faithfulness 향상을 위해 낮은 temperature
+    return get_chat_model(model, temperature=0.0, streaming=streaming)
 
 
 def classify(question: str, config: OptimizationConfig = BASELINE) -> dict:
@@ -59,63 +56,109 @@ def classify(question: str, config: OptimizationConfig = BASELINE) -> dict:
     }
 
 
+@dataclass
+class Retrieval:
+    """설정과 무관한 분류 + 검색 결과 (검색 순서 그대로, 최대 limit개)"""
+    question: str
+    category: str
+    keyword: str
+    results: list[LabelRecord]
+
+    def to_dict(self) -> dict:
+        """JSON 직렬화용 dict (비교 스크립트 checkpoint 저장)"""
+        return {
+            "question": self.question,
+            "category": self.category,
+            "keyword": self.keyword,
+            "results": [label.to_dict() for label in self.results],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Retrieval":
+        return cls(
+            data["question"],
+            data["category"],
+            data["keyword"],
+            [LabelRecord.from_dict(label) for label in data["results"]],
+        )
+
+
+def retrieval_limit(configs: Iterable[OptimizationConfig]) -> int:
+    """설정들이 필요로 하는 최대 검색 결과 수 (2단계 검색은 stage1_limit, 그 외는 SEARCH_LIMIT)"""
+    return max(config.stage1_limit if config.two_stage_retrieval else SEARCH_LIMIT for config in configs)
+
+
+def search_candidates(category: str, keyword: str, limit: int) -> list[LabelRecord]:
+    """분류 결과에 따라 최대 limit개 검색 (브랜드명/성분명은 결과가 없으면 이름 교정 후 재검색)"""
+    if category == "invalid":
+        return []
+    field = CATEGORY_FIELDS.get(category, CATEGORY_FIELDS["brand_name"])
+    if field == CATEGORY_FIELDS["indication"]:
+        return get_label_source().search_paged(field, keyword, limit)
+    return search_by_name(field, keyword, limit)
+
+
+def retrieve(question: str, limit: int = SEARCH_LIMIT) -> Retrieval:
+    """분류 + 검색 (분류 모델은 모든 설정에서 같으므로 설정과 무관)"""
+    classification = classify(question)
+    category, keyword = classification["category"], classification["keyword"]
+    return Retrieval(question, category, keyword, search_candidates(category, keyword, limit))
+
+
 def search_openfda(category: str, keyword: str, config: OptimizationConfig = BASELINE) -> tuple[str, list[dict]]:
     """분류 결과에 따라 OpenFDA API 호출 및 최적화 적용"""
+    # 두 단계 검색의 1단계: stage1_limit개까지 광범위 검색 (2단계 재정렬은 apply_optimizations)
+    results = search_candidates(category, keyword, retrieval_limit([config]))
+    return _optimize(results, category, keyword, config)
+
+
+def _optimize(results: list, category: str, keyword: str, config: OptimizationConfig) -> tuple[str, list[dict]]:
+    """검색 결과에 설정별 최적화 적용 후 컨텍스트 포맷팅"""
     if category == "invalid":
         return "(invalid query)", []
-    
-    # 두 단계 검색 설정
-    if config.two_stage_retrieval:
-        # 1단계: 광범위 검색을 위해 더 많은 결과 가져오기
-        # OpenFDAClient에서 SEARCH_LIMIT을 config.stage1_limit으로 변경해야 하지만
-        # 지금은 기본 검색 후 필터링하는 방식 사용
-        pass
-    
-    # 기본 검색
-    if category == "brand_name":
-        results = search_by_brand_name(keyword)
-    elif category == "generic_name":
-        results = search_by_generic_name(keyword)
-    elif category == "indication":
-        results = search_by_indication(keyword)
-    else:
-        results = search_by_brand_name(keyword)
-    
+
     # 최적화 적용 (중복 제거, 재정렬 등)
     optimized_results = apply_optimizations(results, config, keyword)
-    
+
     # 컨텍스트 포맷팅
     context = format_label_results(optimized_results)
-    
-    return context, optimized_results
 
+    return context, optimized_results
 
-def prepare_context(question: str, config: OptimizationConfig = BASELINE) -> dict:
-    """
-    분류 + API 호출 + 컨텍스트 구성
-    config에 따라 최적화 적용
-    """
-    # 1단계: 분류
-    classification = classify(question, config)
-
-    # 2단계: API 호출 및 최적화
-    context, raw_results = search_openfda(
-        classification["category"],
-        classification["keyword"],
-        config
-    )
 
+def _context_data(question: str, category: str, keyword: str, context: str, results: list, config: OptimizationConfig) -> dict:
+    """생성 단계에 넘길 context_data"""
     return {
         "question": question,
-        "category": classification["category"],
-        "keyword": classification["keyword"],
+        "category": category,
+        "keyword": keyword,
         "context": context,
-        "raw_results": raw_results,
+        "raw_results": results,
         "dur_context": "(OpenFDA 데이터에서는 병용금지(DUR) 정보를 제공하지 않습니다.)",
         "config_name": config.name,  # 설정 정보 포함
     }
 
 
+def prepare_context(question: str, config: OptimizationConfig = BASELINE) -> dict:
+    """
+    분류 + API 호출 + 컨텍스트 구성
+    config에 따라 최적화 적용
+    """
+    return prepare_context_from(retrieve(question, retrieval_limit([config])), config)
+
+
+def prepare_context_from(retrieval: Retrieval, config: OptimizationConfig = BASELINE) -> dict:
+    """
+    미리 가져온 검색 결과로 컨텍스트 구성 (API 호출 없음)
+    retrieval은 retrieval_limit()개 이상 검색한 결과여야 하며, 설정이 쓰는 만큼만 앞에서 잘라 사용
+    """
+    results = retrieval.results[:retrieval_limit([config])]
+    context, optimized_results = _optimize(results, retrieval.category, retrieval.keyword, config)
+    return _context_data(
+        retrieval.question, retrieval.category, retrieval.keyword, context, optimized_results, config
+    )
+
+
 def stream_answer(context_data: dict, config: OptimizationConfig = BASELINE) -> Generator[str, None, None]:
     """컨텍스트 데이터로 스트리밍 답변 생성"""
     llm = _get_generator(config, streaming=True)
@@ -1,45 +1,107 @@
-"""분류 → OpenFDA API 호출 → 답변 생성 RAG 체인"""
+"""
+분류 → OpenFDA API 호출 → 답변 생성 RAG 체인
+- 동기 API: prepare_context / stream_answer / generate_answer (Streamlit)
+- 비동기 API: aprepare_context / astream_answer / agenerate_answer (ASGI 서버 등 이벤트 루프 하나에서 다수 질문 처리)
+- 배치 API: answer_batch (FAQ 사전 생성/평가 등 대량 질문 처리)
+"""
+import asyncio
 import json
-from typing import Generator
+import weakref
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import AsyncGenerator, Generator, Iterator, Optional, Sequence
 from langchain_openai import ChatOpenAI
 
 from src.chain.prompts import CLASSIFIER_PROMPT, ANSWER_PROMPT as GENERATOR_PROMPT
 from src.api.openfda_client import (
+    CATEGORY_FIELDS,
     search_by_brand_name,
     search_by_generic_name,
     search_by_indication,
+    get_label_source,
 )
-from src.api.formatter import format_label_results
-from src.config import CLASSIFIER_MODEL, LLM_MODEL, LLM_TEMPERATURE, OPENAI_API_KEY
+from src.api.async_openfda_client import FANOUT_FIELDS, get_async_client
+from src.api.label_record import LabelRecord
+from src.api.formatter import build_context
+from src.chain.router import route, extract_candidate, normalize_text
+from src.chain.answer_cache import get_answer_cache
+from src.chain.llm_registry import get_chat_model
+from src.api.rate_limiter import request_priority, PRIORITY_BATCH
+from src.utils.singleflight import SingleFlight, AsyncSingleFlight
+from src.config import (
+    LABEL_BACKEND,
+    NAME_INDEX_ENABLED,
+    CLASSIFIER_MODEL,
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    ROUTER_ENABLED,
+    SPECULATIVE_SEARCH_ENABLED,
+    SPECULATIVE_SEARCH_WORKERS,
+    BATCH_CONCURRENCY,
+)
+
+# LLM 분류와 동시에 실행할 추측 검색용 스레드 풀
+_speculative_executor = ThreadPoolExecutor(
+    max_workers=SPECULATIVE_SEARCH_WORKERS,
+    thread_name_prefix="speculative-search",
+)
+
+
+# 같은 질문의 동시 LLM 분류 호출 병합
+_classify_flight = SingleFlight()
+# 비동기 병합은 future가 생성된 이벤트 루프에 묶이므로 루프별로 둠 (종료된 루프는 약한 참조로 정리)
+_aclassify_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSingleFlight]" = weakref.WeakKeyDictionary()
+
+
+def _aclassify_flight() -> AsyncSingleFlight:
+    """현재 이벤트 루프의 분류 병합기"""
+    loop = asyncio.get_running_loop()
+    flight = _aclassify_flights.get(loop)
+    if flight is None:
+        flight = _aclassify_flights[loop] = AsyncSingleFlight()
+    return flight
 
 
 def _get_classifier() -> ChatOpenAI:
     """분류용 LLM"""
-    return ChatOpenAI(
-        model=CLASSIFIER_MODEL,
-        temperature=0.0,
-        openai_api_key=OPENAI_API_KEY,
-    )
+    return get_chat_model(CLASSIFIER_MODEL, temperature=0.0)
 
 
 def _get_generator(streaming: bool = False) -> ChatOpenAI:
     """답변 생성용 LLM"""
-    return ChatOpenAI(
-        model=LLM_MODEL,
-        temperature=LLM_TEMPERATURE,
-        openai_api_key=OPENAI_API_KEY,
-        streaming=streaming,
-    )
+    return get_chat_model(LLM_MODEL, temperature=LLM_TEMPERATURE, streaming=streaming)
 
 
 def classify(question: str) -> dict:
     """사용자 질문을 분류하여 category, keyword 반환"""
+    # 로컬 라우터로 판단 가능한 질문은 LLM 호출 생략
+    if ROUTER_ENABLED:
+        routed = route(question)
+        if routed is not None:
+            return routed
+
+    return _classify_with_llm(question)
+
+
+def _classify_with_llm(question: str) -> dict:
+    """LLM 분류기로 질문 분류 (같은 질문이 동시에 들어오면 한 번만 호출)"""
+    key = normalize_text(question.strip())
+    classification = _classify_flight.do(key, lambda: _invoke_classifier(question))
+    return dict(classification, question=question)
+
+
+def _invoke_classifier(question: str) -> dict:
+    """분류 LLM 호출 + JSON 파싱"""
     llm = _get_classifier()
     prompt = CLASSIFIER_PROMPT.format(question=question)
     result = llm.invoke(prompt)
+    return _parse_classification(question, result.content)
 
+
+def _parse_classification(question: str, content: str) -> dict:
+    """분류 LLM 응답(JSON) 파싱"""
     try:
-        parsed = json.loads(result.content.strip())
+        parsed = json.loads(content.strip())
     except json.JSONDecodeError:
         # 파싱 실패 시 기본값: 브랜드명 검색
         parsed = {"category": "brand_name", "keyword": question}
@@ -51,24 +113,27 @@ def classify(question: str) -> dict:
     }
 
 
-def search_openfda(category: str, keyword: str) -> tuple[str, list[dict]]:
-    """분류 결과에 따라 OpenFDA API 호출"""
+def search_openfda(category: str, keyword: str, question: str = "") -> tuple[str, list[dict]]:
+    """분류 결과에 따라 OpenFDA API 호출 후 토큰 예산 내 컨텍스트 구성"""
     # invalid 카테고리 처리
     if category == "invalid":
         return "(invalid query)", []
-    
+
+    results = _search_labels(category, keyword)
+    context = build_context(results, category=category, question=question)
+    return context, results
+
+
+def _search_labels(category: str, keyword: str) -> list[LabelRecord]:
+    """카테고리별 라벨 검색 (invalid 제외)"""
     if category == "brand_name":
-        results = search_by_brand_name(keyword)
+        return search_by_brand_name(keyword)
     elif category == "generic_name":
-        results = search_by_generic_name(keyword)
+        return search_by_generic_name(keyword)
     elif category == "indication":
-        results = search_by_indication(keyword)
-    else:
-        # 기본: 브랜드명 검색
-        results = search_by_brand_name(keyword)
-
-    context = format_label_results(results)
-    return context, results
+        return search_by_indication(keyword)
+    # 기본: 브랜드명 검색
+    return search_by_brand_name(keyword)
 
 
 def prepare_context(question: str) -> dict:
@@ -76,16 +141,42 @@ def prepare_context(question: str) -> dict:
     분류 + API 호출 + 컨텍스트 구성
     Streamlit에서 스트리밍 전에 호출
     """
-    # 1단계: 분류
-    classification = classify(question)
+    # 0단계: 반복 질문이면 저장된 컨텍스트(및 답변) 재사용
+    cached = _cached_context(question)
+    if cached is not None:
+        return cached
 
-    # 2단계: API 호출
-    context, raw_results = search_openfda(
-        classification["category"],
-        classification["keyword"]
-    )
+    # 1단계: 로컬 라우터 분류
+    classification = route(question) if ROUTER_ENABLED else None
 
-    return {
+    if classification is not None:
+        # 2단계: API 호출
+        context, raw_results = search_openfda(
+            classification["category"],
+            classification["keyword"],
+            question,
+        )
+    else:
+        # 1+2단계: LLM 분류와 추측 검색을 동시에 실행
+        classification, (context, raw_results) = _classify_and_search(question)
+
+    return _build_context_data(question, classification, context, raw_results)
+
+
+def _cached_context(question: str) -> Optional[dict]:
+    """답변 캐시에 저장된 context_data (답변이 있으면 cached_answer 포함)"""
+    cached = get_answer_cache().lookup(question)
+    if cached is None:
+        return None
+    context_data = dict(cached.context_data, question=question)
+    if cached.answer is not None:
+        context_data["cached_answer"] = cached.answer
+    return context_data
+
+
+def _build_context_data(question: str, classification: dict, context: str, raw_results: list) -> dict:
+    """생성 단계에 넘길 context_data 구성 + 답변 캐시에 컨텍스트 저장"""
+    context_data = {
         "question": question,
         "category": classification["category"],
         "keyword": classification["keyword"],
@@ -93,6 +184,43 @@ def prepare_context(question: str) -> dict:
         "raw_results": raw_results,
         "dur_context": "(OpenFDA 데이터에서는 병용금지(DUR) 정보를 제공하지 않습니다.)",
     }
+    if _is_cacheable(context_data):
+        get_answer_cache().store_context(question, context_data)
+    return context_data
+
+
+def _is_cacheable(context_data: dict) -> bool:
+    """검색 결과가 있거나 invalid로 분류된 경우만 캐시 (일시적 API 오류로 빈 결과가 저장되지 않도록)"""
+    return context_data["category"] == "invalid" or bool(context_data["raw_results"])
+
+
+def _store_answer(context_data: dict, answer: str):
+    """완성된 답변을 답변 캐시에 저장"""
+    if answer and _is_cacheable(context_data):
+        stored = {k: v for k, v in context_data.items() if k != "cached_answer"}
+        get_answer_cache().store_answer(context_data["question"], stored, answer)
+
+
+def _classify_and_search(question: str) -> tuple[dict, tuple[str, list[dict]]]:
+    """
+    LLM 분류가 진행되는 동안 로컬 후보 검색어로 미리 검색 (speculative retrieval)
+    분류 결과가 후보와 같으면 미리 가져온 결과를 사용하고, 다르면 버리고 다시 검색
+    """
+    candidate: Optional[tuple[str, str]] = None
+    speculative = None
+    if SPECULATIVE_SEARCH_ENABLED:
+        candidate = extract_candidate(question)
+        if candidate is not None:
+            speculative = _speculative_executor.submit(search_openfda, *candidate, question)
+
+    classification = _classify_with_llm(question)
+    category, keyword = classification["category"], classification["keyword"]
+
+    if speculative is not None and (category, keyword.lower()) == (candidate[0], candidate[1].lower()):
+        return classification, speculative.result()
+
+    # 추측이 빗나간 경우: 진행 중인 검색은 그대로 두면 캐시만 채우고 끝남
+    return classification, search_openfda(category, keyword, question)
 
 
 def stream_answer(context_data: dict) -> Generator[str, None, None]:
@@ -100,6 +228,11 @@ def stream_answer(context_data: dict) -> Generator[str, None, None]:
     컨텍스트 데이터로 스트리밍 답변 생성
     Generator로 청크 단위 반환
     """
+    cached_answer = context_data.get("cached_answer")
+    if cached_answer is not None:
+        yield cached_answer
+        return
+
     llm = _get_generator(streaming=True)
 
     prompt_value = GENERATOR_PROMPT.format_messages(
@@ -110,15 +243,24 @@ def stream_answer(context_data: dict) -> Generator[str, None, None]:
         dur_context=context_data["dur_context"],
     )
 
+    chunks = []
     for chunk in llm.stream(prompt_value):
         if chunk.content:
+            chunks.append(chunk.content)
             yield chunk.content
 
+    # 끝까지 스트리밍된 경우에만 저장
+    _store_answer(context_data, "".join(chunks))
+
 
 def generate_answer(context_data: dict) -> str:
     """
     컨텍스트 데이터로 전체 답변 생성 (비스트리밍)
     """
+    cached_answer = context_data.get("cached_answer")
+    if cached_answer is not None:
+        return cached_answer
+
     llm = _get_generator(streaming=False)
 
     prompt_value = GENERATOR_PROMPT.format_messages(
@@ -130,4 +272,315 @@ def generate_answer(context_data: dict) -> str:
     )
 
     result = llm.invoke(prompt_value)
+    _store_answer(context_data, result.content)
     return result.content
+
+
+# ── 비동기 파이프라인 ───────────────────────────────
+# 동기 버전과 같은 단계(답변 캐시 → 라우터/LLM 분류 + 추측 검색 → 컨텍스트 → 생성)를
+# 스레드 대신 코루틴으로 실행 (LLM: ainvoke/astream, OpenFDA: AsyncOpenFDAClient)
+
+# 결과를 쓰지 않는 추측 검색 태스크 참조 보관 (완료 전 GC 방지)
+_background_tasks: set = set()
+
+
+async def aclassify(question: str) -> dict:
+    """classify()의 비동기 버전"""
+    if ROUTER_ENABLED:
+        routed = route(question)
+        if routed is not None:
+            return routed
+
+    return await _aclassify_with_llm(question)
+
+
+async def _aclassify_with_llm(question: str) -> dict:
+    """LLM 분류 (같은 질문이 동시에 들어오면 한 번만 호출)"""
+    key = normalize_text(question.strip())
+    classification = await _aclassify_flight().do(key, lambda: _ainvoke_classifier(question))
+    return dict(classification, question=question)
+
+
+async def _ainvoke_classifier(question: str) -> dict:
+    """분류 LLM 비동기 호출 + JSON 파싱"""
+    llm = _get_classifier()
+    prompt = CLASSIFIER_PROMPT.format(question=question)
+    result = await llm.ainvoke(prompt)
+    return _parse_classification(question, result.content)
+
+
+async def _asearch_labels(field: str, term: str) -> list[LabelRecord]:
+    """라벨 검색 (mirror 백엔드는 SQLite 조회를 워커 스레드에서 실행)"""
+    if LABEL_BACKEND == "mirror":
+        return await asyncio.to_thread(get_label_source().search_drug_label, field, term)
+    return await get_async_client().search_drug_label(field, term)
+
+
+async def _asearch_by_name(field: str, term: str) -> list[LabelRecord]:
+    """
+    search_by_name()의 비동기 버전
+    결과가 없으면 이름 색인으로 교정 후 재검색, 그래도 없으면 (API 백엔드) 나머지 필드를 동시 검색
+    (브랜드명/성분명 오분류를 두 번째 질문 없이 한 번의 왕복 시간으로 보완)
+    """
+    results = await _asearch_labels(field, term)
+    if results:
+        return results
+
+    if NAME_INDEX_ENABLED:
+        from src.api.name_index import get_name_index
+        # 최초 호출 시 색인 구성(API/미러 조회)이 있으므로 워커 스레드에서 실행
+        index = await asyncio.to_thread(get_name_index)
+        corrected = index.correct(field, term)
+        if corrected is not None:
+            results = await _asearch_labels(field, corrected)
+            if results:
+                return results
+
+    if LABEL_BACKEND == "mirror":
+        return results
+    return await get_async_client().search_many(term, fields=[f for f in FANOUT_FIELDS if f != field])
+
+
+async def asearch_openfda(category: str, keyword: str, question: str = "") -> tuple[str, list[dict]]:
+    """search_openfda()의 비동기 버전"""
+    if category == "invalid":
+        return "(invalid query)", []
+
+    field = CATEGORY_FIELDS.get(category, CATEGORY_FIELDS["brand_name"])
+    if field == CATEGORY_FIELDS["indication"]:
+        results = await _asearch_labels(field, keyword)
+    else:
+        results = await _asearch_by_name(field, keyword)
+
+    context = build_context(results, category=category, question=question)
+    return context, results
+
+
+async def aprepare_context(question: str) -> dict:
+    """prepare_context()의 비동기 버전"""
+    cached = _cached_context(question)
+    if cached is not None:
+        return cached
+
+    classification = route(question) if ROUTER_ENABLED else None
+
+    if classification is not None:
+        context, raw_results = await asearch_openfda(
+            classification["category"],
+            classification["keyword"],
+            question,
+        )
+    else:
+        classification, (context, raw_results) = await _aclassify_and_search(question)
+
+    return _build_context_data(question, classification, context, raw_results)
+
+
+async def _aclassify_and_search(question: str) -> tuple[dict, tuple[str, list[dict]]]:
+    """_classify_and_search()의 비동기 버전 (추측 검색을 태스크로 실행)"""
+    candidate: Optional[tuple[str, str]] = None
+    speculative: Optional[asyncio.Task] = None
+    if SPECULATIVE_SEARCH_ENABLED:
+        candidate = extract_candidate(question)
+        if candidate is not None:
+            speculative = asyncio.create_task(asearch_openfda(*candidate, question))
+
+    try:
+        classification = await _aclassify_with_llm(question)
+    except BaseException:
+        if speculative is not None:
+            speculative.cancel()
+        raise
+    category, keyword = classification["category"], classification["keyword"]
+
+    if speculative is not None and (category, keyword.lower()) == (candidate[0], candidate[1].lower()):
+        return classification, await speculative
+
+    # 추측이 빗나간 경우: 진행 중인 검색은 캐시만 채우고 끝나도록 둠
+    if speculative is not None:
+        _background_tasks.add(speculative)
+        speculative.add_done_callback(_discard_background_task)
+    return classification, await asearch_openfda(category, keyword, question)
+
+
+def _discard_background_task(task: asyncio.Task):
+    _background_tasks.discard(task)
+    # 결과를 쓰지 않는 검색이므로 예외는 확인만 하고 무시 ("never retrieved" 경고 방지)
+    if not task.cancelled():
+        task.exception()
+
+
+async def astream_answer(context_data: dict) -> AsyncGenerator[str, None]:
+    """stream_answer()의 비동기 버전"""
+    cached_answer = context_data.get("cached_answer")
+    if cached_answer is not None:
+        yield cached_answer
+        return
+
+    llm = _get_generator(streaming=True)
+
+    prompt_value = GENERATOR_PROMPT.format_messages(
+        question=context_data["question"],
+        category=context_data["category"],
+        keyword=context_data["keyword"],
+        context=context_data["context"],
+        dur_context=context_data["dur_context"],
+    )
+
+    chunks = []
+    async for chunk in llm.astream(prompt_value):
+        if chunk.content:
+            chunks.append(chunk.content)
+            yield chunk.content
+
+    _store_answer(context_data, "".join(chunks))
+
+
+async def agenerate_answer(context_data: dict) -> str:
+    """generate_answer()의 비동기 버전"""
+    cached_answer = context_data.get("cached_answer")
+    if cached_answer is not None:
+        return cached_answer
+
+    llm = _get_generator(streaming=False)
+
+    prompt_value = GENERATOR_PROMPT.format_messages(
+        question=context_data["question"],
+        category=context_data["category"],
+        keyword=context_data["keyword"],
+        context=context_data["context"],
+        dur_context=context_data["dur_context"],
+    )
+
+    result = await llm.ainvoke(prompt_value)
+    _store_answer(context_data, result.content)
+    return result.content
+
+
+# ── 배치 처리 ───────────────────────────────────────
+# 같은 질문/검색어는 한 번만 처리하고, 분류는 LLM batch() 한 번, 검색은 (category, keyword) 그룹당 한 번
+
+
+@dataclass
+class BatchAnswer:
+    """answer_batch 결과 한 건 (index: 입력 질문 순서)"""
+    index: int
+    question: str
+    context_data: Optional[dict] = None
+    answer: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        context_data = self.context_data or {}
+        return {
+            "index": self.index,
+            "question": self.question,
+            "category": context_data.get("category"),
+            "keyword": context_data.get("keyword"),
+            "answer": self.answer,
+            "error": self.error,
+        }
+
+
+def _classify_batch(questions: list[str], concurrency: int) -> list[dict | Exception]:
+    """라우터로 분류되지 않는 질문만 모아 분류 LLM batch() 호출"""
+    classifications: list[dict | Exception | None] = [
+        route(question) if ROUTER_ENABLED else None for question in questions
+    ]
+    pending = [i for i, classification in enumerate(classifications) if classification is None]
+    if pending:
+        prompts = [CLASSIFIER_PROMPT.format(question=questions[i]) for i in pending]
+        responses = _get_classifier().batch(
+            prompts, config={"max_concurrency": concurrency}, return_exceptions=True
+        )
+        for i, response in zip(pending, responses):
+            if isinstance(response, Exception):
+                classifications[i] = response
+            else:
+                classifications[i] = _parse_classification(questions[i], response.content)
+    return classifications
+
+
+def _search_labels_batch(category: str, keyword: str) -> list[LabelRecord]:
+    """배치 우선순위로 라벨 검색 (워커 스레드에는 호출자의 우선순위가 전달되지 않음)"""
+    with request_priority(PRIORITY_BATCH):
+        return _search_labels(category, keyword)
+
+
+def answer_batch(questions: Sequence[str], concurrency: int = BATCH_CONCURRENCY) -> Iterator[BatchAnswer]:
+    """
+    여러 질문에 답변 생성 (완료되는 순서대로 반환, 입력 순서는 BatchAnswer.index)
+    1. 같은 질문(정규화 기준)은 한 번만 처리하고 결과를 공유
+    2. 답변 캐시에 있는 질문은 바로 반환
+    3. 분류: 라우터 → 나머지는 분류 LLM batch() 한 번
+    4. 검색: (category, keyword) 그룹당 한 번, 검색이 끝난 그룹부터 답변 생성 시작
+    질문별 오류는 BatchAnswer.error로 전달하고 나머지 질문은 계속 처리
+    """
+    # 정규화한 질문 → 입력 인덱스 목록 (대표 질문은 처음 나온 것)
+    indices: dict[str, list[int]] = {}
+    for i, question in enumerate(questions):
+        indices.setdefault(normalize_text(question.strip()), []).append(i)
+    representatives = {key: questions[ids[0]] for key, ids in indices.items()}
+
+    def results_for(key: str, context_data=None, answer=None, error=None) -> Iterator[BatchAnswer]:
+        for i in indices[key]:
+            shared = None if context_data is None else dict(context_data, question=questions[i])
+            yield BatchAnswer(i, questions[i], shared, answer, error)
+
+    # 답변 캐시
+    contexts: dict[str, dict] = {}
+    unresolved = []
+    for key, question in representatives.items():
+        cached = _cached_context(question)
+        if cached is None:
+            unresolved.append(key)
+        elif "cached_answer" in cached:
+            yield from results_for(key, cached, cached["cached_answer"])
+        else:
+            contexts[key] = cached
+
+    # 분류 + (category, keyword) 그룹핑
+    groups: dict[tuple[str, str], list[tuple[str, dict]]] = {}
+    classifications = _classify_batch([representatives[key] for key in unresolved], concurrency)
+    for key, classification in zip(unresolved, classifications):
+        if isinstance(classification, Exception):
+            yield from results_for(key, error=f"분류 실패: {classification}")
+            continue
+        if classification["category"] == "invalid":
+            contexts[key] = _build_context_data(representatives[key], classification, "(invalid query)", [])
+            continue
+        group = (classification["category"], classification["keyword"].lower())
+        groups.setdefault(group, []).append((key, classification))
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="answer-batch") as executor:
+        futures: dict[Future, tuple] = {}
+
+        def submit_answer(key: str, context_data: dict):
+            contexts[key] = context_data
+            futures[executor.submit(generate_answer, context_data)] = ("answer", key)
+
+        for key, context_data in list(contexts.items()):
+            submit_answer(key, context_data)
+        for (category, _), members in groups.items():
+            keyword = members[0][1]["keyword"]
+            futures[executor.submit(_search_labels_batch, category, keyword)] = ("search", members)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, item = futures.pop(future)
+                error = future.exception()
+
+                if stage == "search":
+                    for key, classification in item:
+                        if error is not None:
+                            yield from results_for(key, error=f"검색 실패: {error}")
+                            continue
+                        question = representatives[key]
+                        results = future.result()
+                        context = build_context(results, category=classification["category"], question=question)
+                        submit_answer(key, _build_context_data(question, classification, context, results))
+                elif error is not None:
+                    yield from results_for(item, contexts[item], error=f"답변 생성 실패: {error}")
+                else:
+                    yield from results_for(item, contexts[item], future.result())
@@ -0,0 +1,301 @@
+"""
+로컬 Fast-path 라우터
+자주 나오는 약품명/성분명/증상은 LLM 분류기 없이 사전(trie) 매칭으로 즉시 분류
+판단이 애매한 질문(약품+증상 동시 언급, 제외 표현, 의약품이 아닌 주제)은 None을 반환하여 LLM 분류기로 넘김
+"""
+import re
+from typing import Optional
+
+# 브랜드명 (별칭 → OpenFDA 검색용 영문 표기)
+BRAND_NAMES = {
+    "Tylenol": ["tylenol", "타이레놀"],
+    "Advil": ["advil", "애드빌"],
+    "Motrin": ["motrin", "모트린"],
+    "Aleve": ["aleve", "알리브"],
+    "Excedrin": ["excedrin", "엑세드린"],
+    "Bayer": ["bayer", "바이엘"],
+    "Benadryl": ["benadryl", "베나드릴"],
+    "Claritin": ["claritin", "클라리틴"],
+    "Zyrtec": ["zyrtec", "지르텍"],
+    "Allegra": ["allegra", "알레그라"],
+    "Nexium": ["nexium", "넥시움"],
+    "Prilosec": ["prilosec", "프릴로섹"],
+    "Pepcid": ["pepcid", "펩시드"],
+    "Tums": ["tums", "텀스"],
+    "Pepto-Bismol": ["pepto-bismol", "pepto bismol", "펩토비스몰"],
+    "Imodium": ["imodium", "이모디움"],
+    "Mucinex": ["mucinex", "뮤시넥스"],
+    "Sudafed": ["sudafed", "슈다페드"],
+    "DayQuil": ["dayquil", "데이퀼"],
+    "NyQuil": ["nyquil", "나이퀼"],
+    "Robitussin": ["robitussin", "로비투신"],
+    "Dramamine": ["dramamine", "드라마민"],
+    "Midol": ["midol", "미돌"],
+    "Lipitor": ["lipitor", "리피토"],
+    "Zoloft": ["zoloft", "졸로프트"],
+    "Prozac": ["prozac", "프로작"],
+    "Xanax": ["xanax", "자낙스"],
+    "Viagra": ["viagra", "비아그라"],
+    "Cialis": ["cialis", "시알리스"],
+    "Ambien": ["ambien", "앰비엔"],
+}
+
+# 성분명 (별칭 → OpenFDA 검색용 영문 표기)
+GENERIC_NAMES = {
+    "acetaminophen": ["acetaminophen", "paracetamol", "아세트아미노펜", "파라세타몰"],
+    "ibuprofen": ["ibuprofen", "이부프로펜"],
+    "naproxen": ["naproxen", "나프록센"],
+    "aspirin": ["aspirin", "아스피린"],
+    "caffeine": ["caffeine", "카페인"],
+    "diphenhydramine": ["diphenhydramine", "디펜히드라민", "디펜하이드라민"],
+    "loratadine": ["loratadine", "로라타딘"],
+    "cetirizine": ["cetirizine", "세티리진"],
+    "fexofenadine": ["fexofenadine", "펙소페나딘"],
+    "omeprazole": ["omeprazole", "오메프라졸"],
+    "esomeprazole": ["esomeprazole", "에소메프라졸"],
+    "famotidine": ["famotidine", "파모티딘"],
+    "loperamide": ["loperamide", "로페라마이드"],
+    "bismuth subsalicylate": ["bismuth subsalicylate", "비스무트"],
+    "pseudoephedrine": ["pseudoephedrine", "슈도에페드린"],
+    "phenylephrine": ["phenylephrine", "페닐에프린"],
+    "guaifenesin": ["guaifenesin", "구아이페네신"],
+    "dextromethorphan": ["dextromethorphan", "덱스트로메토르판"],
+    "dimenhydrinate": ["dimenhydrinate", "디멘히드리네이트"],
+    "melatonin": ["melatonin", "멜라토닌"],
+    "metformin": ["metformin", "메트포르민"],
+    "atorvastatin": ["atorvastatin", "아토르바스타틴"],
+    "simvastatin": ["simvastatin", "심바스타틴"],
+    "lisinopril": ["lisinopril", "리시노프릴"],
+    "amlodipine": ["amlodipine", "암로디핀"],
+    "losartan": ["losartan", "로사르탄"],
+    "sertraline": ["sertraline", "설트랄린", "서트랄린"],
+    "fluoxetine": ["fluoxetine", "플루옥세틴"],
+    "alprazolam": ["alprazolam", "알프라졸람"],
+    "zolpidem": ["zolpidem", "졸피뎀"],
+    "sildenafil": ["sildenafil", "실데나필"],
+    "amoxicillin": ["amoxicillin", "아목시실린"],
+    "hydrocortisone": ["hydrocortisone", "하이드로코르티손"],
+}
+
+# 한국어 증상/효능 표현 → 영문 적응증
+SYMPTOM_INDICATIONS = {
+    "headache": ["두통", "머리 아플", "머리가 아플", "머리 아파", "머리가 아파", "headache"],
+    "toothache": ["치통", "이가 아플", "이가 아파", "toothache"],
+    "menstrual cramps": ["생리통", "menstrual cramps"],
+    "backache": ["요통", "허리 아플", "허리가 아플", "허리 아파", "허리가 아파", "backache"],
+    "muscle aches": ["근육통", "muscle aches"],
+    "arthritis": ["관절염", "관절통", "arthritis"],
+    "fever": ["발열", "해열", "열이 나", "열날", "fever"],
+    "common cold": ["감기", "common cold"],
+    "cough": ["기침", "cough"],
+    "runny nose": ["콧물", "runny nose"],
+    "nasal congestion": ["코막힘", "코가 막", "nasal congestion"],
+    "sore throat": ["인후통", "목이 아플", "목이 아파", "sore throat"],
+    "allergy": ["알레르기", "알러지", "비염", "allergy"],
+    "indigestion": ["소화불량", "소화가 안", "체했", "indigestion"],
+    "heartburn": ["속쓰림", "속이 쓰", "위산", "heartburn"],
+    "diarrhea": ["설사", "diarrhea"],
+    "constipation": ["변비", "constipation"],
+    "nausea": ["메스꺼", "구역질", "구토", "nausea"],
+    "motion sickness": ["멀미", "motion sickness"],
+    "sleeplessness": ["불면", "잠이 안", "sleeplessness", "insomnia"],
+    "hypertension": ["고혈압", "hypertension"],
+    "diabetes": ["당뇨", "diabetes"],
+    "acne": ["여드름", "acne"],
+    "itching": ["가려움", "가렵", "itching"],
+    "athlete's foot": ["무좀", "athlete's foot"],
+}
+
+# 후보 검색어 추출 시 제외할 영문 단어
+_ENGLISH_STOPWORDS = {
+    "the", "and", "for", "with", "what", "how", "can", "drug", "drugs", "medicine",
+    "tablet", "tablets", "capsule", "capsules", "mg", "otc", "side", "effect", "effects",
+}
+_ENGLISH_WORD = re.compile(r"[a-zA-Z][a-zA-Z\-']{2,}")
+
+# 제외/대체 표현: 언급된 약품이 찾는 대상이 아닐 수 있음 ("타이레놀 말고 두통약")
+_EXCLUSION_MARKERS = re.compile(
+    r"말고|빼고|대신|제외|외에|아닌|instead of|other than|except|besides|without|alternative"
+)
+# 의약품 질문 표현 (증상만 언급된 질문은 이 표현이 있어야 적응증 검색으로 확정)
+_MEDICATION_CUES = re.compile(
+    r"(?<![예요절계공조])약(?!속|간|점|자)|의약품|진통제|해열제|소화제|지사제|변비약|치료제|연고|복용|처방|성분"
+    r"|medicine|medication|drug|pill|tablet|capsule|remed|treat|reliev|otc"
+)
+# 의약품이 아닌 주제 ("감기에 좋은 음식", "두통에 좋은 운동")
+_NON_MEDICATION_TOPICS = re.compile(
+    r"음식|식품|식단|요리|레시피|과일|채소|차를|운동|스트레칭|마사지|지압|민간요법|음료|영양제"
+    r"|food|diet|recipe|exercise|stretch|massage|tea\b|home remed"
+)
+
+_HANGUL_JAMO_ONLY = re.compile(r"^[ㄱ-ㅎㅏ-ㅣ\s\W]+$")
+_MEANINGFUL_CHAR = re.compile(r"[a-zA-Z0-9가-힣]")
+
+
+def normalize_text(question: str) -> str:
+    """소문자 변환 + 연속 공백 정리"""
+    return re.sub(r"\s+", " ", question.lower())
+
+
+def _is_ascii_letter(ch: str) -> bool:
+    return ch.isascii() and ch.isalpha()
+
+
+class _TrieNode:
+    __slots__ = ("children", "value", "bounded")
+
+    def __init__(self):
+        self.children: dict = {}
+        self.value: Optional[tuple[str, str]] = None
+        # True면 텍스트 시작 또는 공백 뒤에서 시작할 때만 매칭 ("이가 아플" ↔ "아이가 아플")
+        self.bounded = False
+
+
+class LocalRouter:
+    """사전(trie) 기반 질문 분류기"""
+
+    def __init__(self):
+        self._root = _TrieNode()
+        for canonical, aliases in BRAND_NAMES.items():
+            self._add_aliases(aliases, ("brand_name", canonical))
+        for canonical, aliases in GENERIC_NAMES.items():
+            self._add_aliases(aliases, ("generic_name", canonical))
+        for canonical, aliases in SYMPTOM_INDICATIONS.items():
+            self._add_aliases(aliases, ("indication", canonical))
+
+    def _add_aliases(self, aliases: list[str], value: tuple[str, str]):
+        for alias in aliases:
+            alias = alias.lower()
+            # 한글 구(句) 별칭은 앞 단어의 일부와 겹칠 수 있으므로 어절 시작에서만 매칭
+            bounded = " " in alias and not alias.isascii()
+            self._insert(alias, value, bounded)
+            # 띄어쓰기 없이 입력한 경우도 매칭 ("머리아플때")
+            if bounded:
+                self._insert(alias.replace(" ", ""), value, bounded)
+
+    def _insert(self, alias: str, value: tuple[str, str], bounded: bool = False):
+        node = self._root
+        for ch in alias:
+            node = node.children.setdefault(ch, _TrieNode())
+        node.value = value
+        node.bounded = bounded
+
+    def find_spans(self, text: str) -> list[tuple[int, int, tuple[str, str]]]:
+        """소문자/공백 정리된 text에서 사전 항목을 왼쪽부터 최장 일치로 찾아 (start, end, (category, keyword)) 반환"""
+        spans = []
+        i = 0
+        while i < len(text):
+            # 영문 단어 중간에서 시작하는 매칭은 무시
+            if i > 0 and _is_ascii_letter(text[i]) and _is_ascii_letter(text[i - 1]):
+                i += 1
+                continue
+
+            node = self._root
+            best_end, best_value = -1, None
+            j = i
+            while j < len(text) and text[j] in node.children:
+                node = node.children[text[j]]
+                j += 1
+                if node.value is not None:
+                    if node.bounded and i > 0 and not text[i - 1].isspace():
+                        continue
+                    # 영문 별칭은 단어 경계에서 끝나야 함 (한글은 조사가 붙으므로 검사하지 않음)
+                    if _is_ascii_letter(text[j - 1]) and j < len(text) and _is_ascii_letter(text[j]):
+                        continue
+                    best_end, best_value = j, node.value
+
+            if best_value is not None:
+                spans.append((i, best_end, best_value))
+                i = best_end
+            else:
+                i += 1
+        return spans
+
+    def find_matches(self, question: str) -> list[tuple[str, str]]:
+        """질문에서 사전 항목을 찾아 (category, keyword) 목록 반환"""
+        return [value for _, _, value in self.find_spans(normalize_text(question))]
+
+    def route(self, question: str) -> Optional[dict]:
+        """
+        질문 분류 (classify()와 같은 형식 반환)
+        확신할 수 없는 경우 None → LLM 분류기 사용
+        """
+        if not question or not question.strip():
+            return None
+
+        if self._is_gibberish(question):
+            return {"question": question, "category": "invalid", "keyword": "none"}
+
+        text = normalize_text(question)
+        # 제외/대체 표현이 있으면 언급된 약품이 검색 대상인지 판단할 수 없음
+        if _EXCLUSION_MARKERS.search(text):
+            return None
+
+        matches = self.find_matches(question)
+        drugs = list(dict.fromkeys(m for m in matches if m[0] != "indication"))
+        symptoms = list(dict.fromkeys(m for m in matches if m[0] == "indication"))
+
+        # 약품 하나만 언급된 경우 ("타이레놀 부작용")
+        # 약품과 증상이 함께 나오면 어느 쪽을 검색할지 LLM에 맡김 ("타이레놀은 두통에 효과 있나요?")
+        if len(drugs) == 1 and not symptoms:
+            category, keyword = drugs[0]
+        elif not drugs and len(symptoms) == 1 and self._asks_for_medication(text):
+            category, keyword = symptoms[0]
+        else:
+            return None
+
+        return {"question": question, "category": category, "keyword": keyword}
+
+    def extract_candidate(self, question: str) -> Optional[tuple[str, str]]:
+        """
+        추측 검색(speculative search)용 후보 (category, keyword)
+        route()가 판단을 보류한 질문에서 가장 그럴듯한 검색어 하나를 고름
+        """
+        matches = self.find_matches(question)
+        for match in matches:
+            if match[0] != "indication":
+                return match
+        if matches:
+            return matches[0]
+
+        # 사전에 없는 영문 단어는 브랜드명으로 가정 (classify() 기본값과 동일)
+        for word in _ENGLISH_WORD.findall(question):
+            if word.lower() not in _ENGLISH_STOPWORDS:
+                return ("brand_name", word)
+        return None
+
+    @staticmethod
+    def _asks_for_medication(text: str) -> bool:
+        """증상 질문이 의약품에 관한 것인지 (의약품 표현이 있고, 음식/운동 등 다른 주제가 아님)"""
+        return bool(_MEDICATION_CUES.search(text)) and not _NON_MEDICATION_TOPICS.search(text)
+
+    @staticmethod
+    def _is_gibberish(question: str) -> bool:
+        """명백히 무의미한 입력 판별 (자음/모음만, 한 글자 반복)"""
+        compact = re.sub(r"\s+", "", question)
+        if _HANGUL_JAMO_ONLY.match(compact):
+            return True
+        if not _MEANINGFUL_CHAR.search(compact):
+            return True
+        return len(compact) >= 4 and len(set(compact)) == 1
+
+
+_router: Optional[LocalRouter] = None
+
+
+def get_router() -> LocalRouter:
+    """모듈 전역 LocalRouter 반환 (최초 호출 시 trie 구성)"""
+    global _router
+    if _router is None:
+        _router = LocalRouter()
+    return _router
+
+
+def route(question: str) -> Optional[dict]:
+    """로컬 라우터로 질문 분류, 판단 불가 시 None"""
+    return get_router().route(question)
+
+
+def extract_candidate(question: str) -> Optional[tuple[str, str]]:
+    """추측 검색용 후보 (category, keyword), 없으면 None"""
+    return get_router().extract_candidate(question)
@@ -15,12 +15,88 @@ OPENFDA_LABEL_ENDPOINT = "/label.json"
 
 # Search Configuration
 SEARCH_LIMIT = 20
+OPENFDA_PAGE_SIZE = 100         # 페이지 검색 시 한 번에 요청할 결과 수
+OPENFDA_MAX_SKIP = 25000        # OpenFDA skip 파라미터 상한
+
+# Context Configuration (생성기 프롬프트에 넣을 라벨 컨텍스트)
+CONTEXT_TOKEN_BUDGET = 3000     # 컨텍스트 전체 토큰 예산
+CONTEXT_MAX_RESULTS = 5         # 컨텍스트에 포함할 최대 라벨 수
+
+# HTTP Connection Pool Configuration (OpenFDA)
+HTTP_TIMEOUT = 30
+HTTP_POOL_CONNECTIONS = 4       # 호스트별 커넥션 풀 개수
+HTTP_POOL_MAXSIZE = 16          # 풀 하나당 최대 keep-alive 커넥션 수
+HTTP_MAX_RETRIES = 3            # 429/5xx 재시도 횟수
+HTTP_BACKOFF_FACTOR = 0.5       # 재시도 간격: factor * 2^(n-1) 초
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# OpenFDA Rate Limit Configuration (분당 240회, 일일 한도는 API 키 유무에 따라 다름)
+# 토큰 버킷은 프로세스별로 따로 계산되므로, 여러 워커 프로세스로 실행하면(WEB_CONCURRENCY)
+# 전체 한도를 워커 수로 나눠 프로세스마다 할당
+OPENFDA_WORKER_PROCESSES = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+OPENFDA_RATE_PER_MINUTE = 240 // OPENFDA_WORKER_PROCESSES
+OPENFDA_RATE_BURST = max(1, 40 // OPENFDA_WORKER_PROCESSES)     # 토큰 버킷 크기 (순간 최대 요청 수)
+OPENFDA_DAILY_LIMIT = (120_000 if OPENFDA_API_KEY else 1_000) // OPENFDA_WORKER_PROCESSES
+OPENFDA_QUEUE_TIMEOUT = 30      # 토큰 대기 최대 시간 (초)
+
+# Label Cache Configuration (메모리 LRU + TTL)
+LABEL_CACHE_ENABLED = True
+LABEL_CACHE_MAXSIZE = 1024      # 최대 캐시 항목 수 (field, term, limit 조합)
+LABEL_CACHE_TTL = 6 * 60 * 60   # 라벨 데이터는 최대 하루 1회 갱신 → 6시간 보관
+
+# Label Disk Cache Configuration (SQLite, 미설정 시 비활성화)
+LABEL_DISK_CACHE_PATH = os.getenv("LABEL_DISK_CACHE_PATH")
+LABEL_DISK_CACHE_FRESH_TTL = 24 * 60 * 60       # 이후에는 stale 응답 + 백그라운드 갱신
+LABEL_DISK_CACHE_MAX_STALE = 7 * 24 * 60 * 60   # API 장애 시에도 이 기간까지는 stale 응답 제공
+LABEL_DISK_CACHE_PURGE_INTERVAL = 60 * 60       # max_stale을 넘긴 항목 정리 주기 (열 때 + 저장 시)
+
+# Label Backend Configuration ("api": 실시간 OpenFDA API, "mirror": 로컬 bulk 미러)
+LABEL_BACKEND = os.getenv("LABEL_BACKEND", "api")
+LABEL_MIRROR_PATH = os.getenv("LABEL_MIRROR_PATH", ".cache/openfda_label_mirror.sqlite3")
+OPENFDA_DOWNLOAD_INDEX_URL = "https://api.fda.gov/download.json"
+
+# Name Index Configuration (브랜드명/성분명 오타 교정, 검색 결과가 없을 때만 재검색)
+NAME_INDEX_ENABLED = True
+NAME_INDEX_API_TERMS = 1000     # API 백엔드: count 쿼리로 가져올 상위 이름 수 (OpenFDA 최대 1000)
+NAME_INDEX_RETRY_SECONDS = 10 * 60  # API 원천이 비었거나 실패한 색인은 이 시간 후 다시 구성
 
 # LLM Configuration
 CLASSIFIER_MODEL = "gpt-5-nano"
 LLM_MODEL = "gpt-4.1-mini"
 LLM_TEMPERATURE = 0.0
 
+# Local Router Configuration (사전 매칭으로 LLM 분류 생략)
+ROUTER_ENABLED = True
+
+# Speculative Search Configuration (LLM 분류 중 후보 검색어로 미리 검색)
+SPECULATIVE_SEARCH_ENABLED = True
+SPECULATIVE_SEARCH_WORKERS = 8
+
+# Batch Answering Configuration (answer_batch: FAQ 사전 생성/평가)
+BATCH_CONCURRENCY = 8               # 동시 OpenFDA 검색/답변 생성 수
+
+# Parallel Runner Configuration (평가/비교 스크립트 병렬 실행)
+PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "4"))  # 동시에 처리할 질문 수
+PARALLEL_MAX_RETRIES = 3            # 429/5xx/연결 오류 재시도 횟수
+PARALLEL_BACKOFF_FACTOR = 2.0       # 재시도 간격: factor * 2^(n-1) 초 (+ jitter)
+
+# Answer Cache Configuration (반복 질문 답변 재사용)
+ANSWER_CACHE_ENABLED = True
+ANSWER_CACHE_MAXSIZE = 512
+ANSWER_CACHE_TTL = 6 * 60 * 60
+ANSWER_CACHE_SIMILARITY = 0.8   # 근사 일치 기준 (문자 trigram Jaccard 유사도)
+
+# Chat History Configuration (Streamlit 세션별 대화 기록)
+CHAT_HISTORY_WINDOW = 10            # 전체 내용을 보관/표시할 최근 턴 수
+CHAT_HISTORY_MAX_SUMMARIES = 50     # 그 이전 턴의 요약 보관 수
+CHAT_SUMMARY_CHARS = 200            # 요약에 남길 답변 앞부분 길이
+CHAT_SOURCES_PER_TURN = 3           # 턴마다 보관할 출처 수 (화면 표시 수와 동일)
+
+# Server Configuration (server.py ASGI 서비스, 워커 프로세스 하나 기준)
+SERVER_MAX_CONCURRENCY = int(os.getenv("SERVER_MAX_CONCURRENCY", "64"))  # 동시에 처리할 질문 수
+SERVER_QUEUE_TIMEOUT = 5            # 처리 슬롯 대기 한도 (초과 시 503)
+SERVER_REQUEST_TIMEOUT = 60         # 질문 하나(컨텍스트 + 답변) 처리 한도 (초과 시 504 / SSE error 이벤트)
+
 # 필수 환경 변수 검증
 REQUIRED_ENV_VARS = ["OPENAI_API_KEY"]
 
@@ -21,8 +21,11 @@ class OptimizationConfig:
     # 개선사항 3: 두 단계 검색
     two_stage_retrieval: bool = False
     
+    # 개선사항 4: BM25 재정렬 (기존 부분 문자열 점수 대신)
+    bm25_rerank: bool = False
+    
     # 두 단계 검색 설정
-    stage1_limit: int = 20  # 1단계: 광범위 검색
+    stage1_limit: int = 20  # 1단계: 광범위 검색 (100 초과 시 skip으로 페이지 검색)
     stage2_limit: int = 5   # 2단계: 정밀 선택
     
     def __str__(self):
@@ -34,6 +37,8 @@ class OptimizationConfig:
             features.append("중복제거")
         if self.two_stage_retrieval:
             features.append("2단계검색")
+        if self.bm25_rerank:
+            features.append("BM25")
         
         if not features:
             return f"{self.name} (베이스라인)"
@@ -118,8 +123,22 @@ ALL_CONFIGS = [
     V7_ALL,
 ]
 
+# V8: 두 단계 검색 + BM25 재정렬 (일괄 비교 대상 외 추가 설정)
+V8_TWOSTAGE_BM25 = OptimizationConfig(
+    name="v8_twostage_bm25",
+    use_gpt4=False,
+    deduplicate_results=False,
+    two_stage_retrieval=True,
+    bm25_rerank=True,
+    stage1_limit=100,
+)
+
+EXTRA_CONFIGS = [
+    V8_TWOSTAGE_BM25,
+]
+
 # 이름으로 설정 찾기
-CONFIG_MAP = {config.name: config for config in ALL_CONFIGS}
+CONFIG_MAP = {config.name: config for config in ALL_CONFIGS + EXTRA_CONFIGS}
 
 
 def get_config(name: str) -> OptimizationConfig:
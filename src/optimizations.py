@@ -1,9 +1,14 @@
 """
 RAG 최적화 기능 모듈
-중복 제거, 두 단계 검색 등의 개선 기능 구현
+중복 제거, 두 단계 검색, BM25 재정렬 등의 개선 기능 구현
 """
+import re
 from typing import List, Dict, Set
 
+import numpy as np
+
+from src.api.label_record import brand_keys, generic_keys
+
 
 def deduplicate_by_generic_name(results: List[Dict]) -> List[Dict]:
     """
@@ -22,8 +27,7 @@ def deduplicate_by_generic_name(results: List[Dict]) -> List[Dict]:
     deduplicated = []
     
     for result in results:
-        openfda = result.get("openfda", {})
-        generic_names = openfda.get("generic_name", [])
+        generic_names = generic_keys(result)
         
         # generic_name이 없으면 그냥 포함
         if not generic_names:
@@ -31,7 +35,7 @@ def deduplicate_by_generic_name(results: List[Dict]) -> List[Dict]:
             continue
         
         # 첫 번째 generic_name 사용
-        primary_generic = generic_names[0].lower().strip()
+        primary_generic = generic_names[0]
         
         # 이미 본 성분이 아니면 추가
         if primary_generic not in seen_generics:
@@ -60,22 +64,19 @@ def rerank_by_relevance(results: List[Dict], keyword: str) -> List[Dict]:
     def calculate_relevance(result: Dict) -> int:
         """관련성 점수 계산 (높을수록 관련성 높음)"""
         score = 0
-        openfda = result.get("openfda", {})
         
-        # 브랜드명 매칭
-        brand_names = openfda.get("brand_name", [])
-        for brand in brand_names:
-            if keyword_lower in brand.lower():
+        # 브랜드명 매칭 (소문자 키는 LabelRecord 생성 시 계산됨)
+        for brand in brand_keys(result):
+            if keyword_lower in brand:
                 score += 10
-            if keyword_lower == brand.lower():
+            if keyword_lower == brand:
                 score += 20
         
         # 성분명 매칭
-        generic_names = openfda.get("generic_name", [])
-        for generic in generic_names:
-            if keyword_lower in generic.lower():
+        for generic in generic_keys(result):
+            if keyword_lower in generic:
                 score += 10
-            if keyword_lower == generic.lower():
+            if keyword_lower == generic:
                 score += 20
         
         # 적응증 매칭
@@ -107,15 +108,95 @@ def rerank_by_relevance(results: List[Dict], keyword: str) -> List[Dict]:
     return [result for result, score in scored_results]
 
 
-def two_stage_search(search_fn, keyword: str, stage1_limit: int = 20, stage2_limit: int = 5) -> List[Dict]:
+# BM25 재정렬 대상 섹션과 가중치 (BM25F 방식: 섹션별 tf/길이에 가중치 적용)
+BM25_FIELD_WEIGHTS = {
+    "brand_name": 3.0,
+    "generic_name": 3.0,
+    "purpose": 1.5,
+    "active_ingredient": 1.5,
+    "indications_and_usage": 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _section_text(result: Dict, field: str) -> str:
+    """라벨 섹션 텍스트 (openfda 중첩 필드 포함, 소문자)"""
+    if field == "brand_name":
+        return " ".join(brand_keys(result))
+    if field == "generic_name":
+        return " ".join(generic_keys(result))
+    value = result.get(field, [])
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value).lower()
+    return str(value).lower() if value else ""
+
+
+def bm25_rerank(results: List[Dict], keyword: str, k1: float = BM25_K1, b: float = BM25_B) -> List[Dict]:
+    """
+    BM25(F) 점수로 검색 결과 재정렬
+    
+    - 질의어 출현 횟수는 정규식(findall) 한 번으로 섹션별 집계하고
+      점수 계산은 NumPy 행렬 연산으로 수행 (후보 수백 개도 수 ms)
+    - 점수가 같으면 원래 순서 유지
+    
+    Args:
+        results: 검색 결과 리스트
+        keyword: 검색 키워드
+        k1, b: BM25 파라미터
+        
+    Returns:
+        재정렬된 결과 리스트
+    """
+    if not results or not keyword:
+        return results
+    
+    terms = list(dict.fromkeys(_TOKEN_PATTERN.findall(keyword.lower())))
+    if not terms:
+        return results
+    
+    term_index = {term: i for i, term in enumerate(terms)}
+    term_pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\b")
+    
+    # 문서 × 질의어 가중 tf 행렬, 문서 가중 길이
+    tf = np.zeros((len(results), len(terms)), dtype=np.float64)
+    doc_len = np.zeros(len(results), dtype=np.float64)
+    for row, result in enumerate(results):
+        for field, weight in BM25_FIELD_WEIGHTS.items():
+            text = _section_text(result, field)
+            if not text:
+                continue
+            doc_len[row] += weight * (text.count(" ") + 1)
+            # 부분 문자열 검사로 질의어가 없는 섹션은 정규식 스캔 생략
+            if not any(term in text for term in terms):
+                continue
+            for match in term_pattern.findall(text):
+                tf[row, term_index[match]] += weight
+    
+    n_docs = len(results)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    avg_len = doc_len.mean() or 1.0
+    norm = k1 * (1.0 - b + b * doc_len / avg_len)
+    scores = (idf * (tf * (k1 + 1.0)) / (tf + norm[:, None])).sum(axis=1)
+    
+    if not scores.any():
+        return results
+    order = np.argsort(-scores, kind="stable")
+    return [results[i] for i in order]
+
+
+def two_stage_search(field: str, keyword: str, stage1_limit: int = 20, stage2_limit: int = 5) -> List[Dict]:
     """
     두 단계 검색 전략
     
-    1단계: 광범위하게 검색 (stage1_limit개)
+    1단계: 광범위하게 검색 (stage1_limit개, 100개 초과 시 skip으로 페이지 검색)
     2단계: 관련성 기준으로 재정렬하여 상위 N개 선택
     
     Args:
-        search_fn: 검색 함수 (예: search_by_brand_name)
+        field: OpenFDA 검색 필드 (예: openfda.brand_name)
         keyword: 검색 키워드
         stage1_limit: 1단계 검색 개수
         stage2_limit: 2단계 최종 선택 개수
@@ -123,32 +204,13 @@ def two_stage_search(search_fn, keyword: str, stage1_limit: int = 20, stage2_lim
     Returns:
         최종 선택된 결과 리스트
     """
-    # 1단계: 광범위 검색
-    # search_fn은 이미 OpenFDAClient를 사용하므로 그대로 호출
-    # 하지만 limit을 조정해야 하므로, 별도로 처리
-    from src.api.openfda_client import OpenFDAClient
-    
-    client = OpenFDAClient()
-    
-    # 원래 SEARCH_LIMIT을 임시로 변경
-    original_limit = client.base_url  # 이 부분은 실제로는 _build_url에서 처리됨
-    
-    # search_fn을 직접 호출하는 대신, 내부적으로 limit을 조정
-    # 이를 위해 OpenFDAClient의 search_drug_label을 직접 사용
+    from src.api.openfda_client import get_label_source
     
-    # 검색 필드 결정 (이 함수는 이미 특정 검색 필드에 매핑되어 있음)
-    # 대신 더 간단하게, search_fn의 결과를 사용하되 limit은 config에서 조정
-    
-    # 실제로는 이 함수를 openfda_client에서 직접 호출하도록 수정해야 함
-    # 여기서는 일단 기본 검색 후 필터링
-    
-    results = search_fn(keyword)
-    
-    if not results:
-        return results
+    # 1단계: 광범위 검색
+    stage1_results = get_label_source().search_paged(field, keyword, stage1_limit)
     
-    # 1단계 결과 제한
-    stage1_results = results[:stage1_limit]
+    if not stage1_results:
+        return stage1_results
     
     # 2단계: 관련성 기준 재정렬 및 선택
     reranked = rerank_by_relevance(stage1_results, keyword)
@@ -175,11 +237,15 @@ def apply_optimizations(results: List[Dict], config, keyword: str = "") -> List[
     if config.deduplicate_results:
         optimized = deduplicate_by_generic_name(optimized)
     
-    # 두 단계 검색의 2단계 (재정렬 및 선택)
-    # 실제 두 단계 검색은 검색 시점에 적용되어야 하므로
-    # 여기서는 재정렬만 수행
-    if config.two_stage_retrieval:
+    # 재정렬 (BM25 또는 기존 부분 문자열 점수)
+    if config.bm25_rerank:
+        optimized = bm25_rerank(optimized, keyword)
+    elif config.two_stage_retrieval:
         optimized = rerank_by_relevance(optimized, keyword)
+    
+    # 두 단계 검색의 2단계 (상위 N개 선택)
+    # 1단계(stage1_limit개 검색)는 search_openfda에서 검색 시점에 적용됨
+    if config.two_stage_retrieval:
         optimized = optimized[:config.stage2_limit]
     
     return optimized
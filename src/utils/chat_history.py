@@ -0,0 +1,141 @@
+"""
+Streamlit 세션별 대화 기록 (크기 제한)
+- 최근 window개 턴만 전체 내용 보관, 그 이전 턴은 짧은 요약으로 압축
+- 출처는 라벨 객체 대신 화면에 표시하는 (브랜드명, 성분명, 제조사) 튜플만 보관
+→ 대화가 길어져도 세션 메모리와 재렌더링 비용이 일정
+"""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from src.config import (
+    CHAT_HISTORY_WINDOW,
+    CHAT_HISTORY_MAX_SUMMARIES,
+    CHAT_SUMMARY_CHARS,
+    CHAT_SOURCES_PER_TURN,
+)
+
+_MARKDOWN_NOISE = re.compile(r"[#*>`_|]+|-{3,}")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class ChatTurn:
+    """질문 + 답변 한 턴 (전체 내용, 답변 생성 전/실패 시에는 answer가 비어 있음)"""
+    question: str
+    answer: str = ""
+    search_info: Optional[dict] = None
+    sources: tuple[tuple[str, str, str], ...] = field(default_factory=tuple)
+    error: Optional[str] = None
+
+    @property
+    def pending(self) -> bool:
+        """답변도 오류도 기록되지 않은 턴 (생성 중이거나 중단됨)"""
+        return not self.answer and self.error is None
+
+
+@dataclass
+class TurnSummary:
+    """window 밖으로 밀려난 턴의 요약"""
+    question: str
+    answer_preview: str
+    search_info: Optional[dict] = None
+
+
+def _first(values) -> str:
+    return values[0] if values else "N/A"
+
+
+def compact_sources(results: Iterable, limit: int = CHAT_SOURCES_PER_TURN) -> tuple[tuple[str, str, str], ...]:
+    """라벨 검색 결과 → 화면 표시용 (브랜드명, 성분명, 제조사) 튜플"""
+    sources = []
+    for label in results:
+        if len(sources) >= limit:
+            break
+        openfda = label.get("openfda") or {}
+        sources.append((
+            _first(openfda.get("brand_name")),
+            _first(openfda.get("generic_name")),
+            _first(openfda.get("manufacturer_name")),
+        ))
+    return tuple(sources)
+
+
+def summarize_answer(answer: str, max_chars: int = CHAT_SUMMARY_CHARS) -> str:
+    """마크다운 기호를 걷어낸 답변 앞부분"""
+    text = _WHITESPACE.sub(" ", _MARKDOWN_NOISE.sub(" ", answer)).strip()
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + "..."
+
+
+class ChatHistory:
+    """
+    크기 제한 대화 기록
+    - window: 전체 내용을 보관할 최근 턴 수
+    - max_summaries: 보관할 요약 수 (초과분은 버리고 개수만 기록)
+    """
+
+    def __init__(
+        self,
+        window: int = CHAT_HISTORY_WINDOW,
+        max_summaries: int = CHAT_HISTORY_MAX_SUMMARIES,
+    ):
+        self.window = window
+        self.turns: deque[ChatTurn] = deque()
+        self.summaries: deque[TurnSummary] = deque(maxlen=max_summaries)
+        self.dropped = 0
+
+    def add_question(self, question: str) -> ChatTurn:
+        """
+        답변 생성 전에 질문 턴 추가 (생성이 실패/중단되어도 질문이 기록에 남음)
+        window를 넘는 가장 오래된 턴은 요약으로 이동
+        """
+        turn = ChatTurn(question)
+        self.turns.append(turn)
+        while len(self.turns) > self.window:
+            oldest = self.turns.popleft()
+            if len(self.summaries) == self.summaries.maxlen:
+                self.dropped += 1
+            preview = summarize_answer(oldest.answer or oldest.error or "")
+            self.summaries.append(TurnSummary(oldest.question, preview, oldest.search_info))
+        return turn
+
+    @staticmethod
+    def complete_turn(turn: ChatTurn, answer: str, results: Iterable = (), search_info: Optional[dict] = None):
+        """생성된 답변 기록 (출처는 화면 표시용 요약만)"""
+        turn.answer = answer
+        turn.search_info = search_info
+        turn.sources = compact_sources(results)
+
+    @staticmethod
+    def fail_turn(turn: ChatTurn, error: str, search_info: Optional[dict] = None):
+        """답변 생성 실패 기록"""
+        turn.error = error
+        turn.search_info = search_info
+
+    def add_turn(
+        self,
+        question: str,
+        answer: str,
+        results: Iterable = (),
+        search_info: Optional[dict] = None,
+    ) -> ChatTurn:
+        """완료된 턴 추가"""
+        turn = self.add_question(question)
+        self.complete_turn(turn, answer, results, search_info)
+        return turn
+
+    def clear(self):
+        self.turns.clear()
+        self.summaries.clear()
+        self.dropped = 0
+
+    @property
+    def archived_count(self) -> int:
+        """요약으로 압축되었거나 버려진 턴 수"""
+        return len(self.summaries) + self.dropped
+
+    def __len__(self) -> int:
+        return len(self.turns) + self.archived_count
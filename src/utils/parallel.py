@@ -0,0 +1,163 @@
+"""
+동시 실행 수 제한 병렬 실행기 (평가/비교 스크립트용)
+- 결과는 입력 순서대로 반환 (완료 순서와 무관)
+- 레이트 리밋(429)/일시적 서버 오류는 지수 백오프로 재시도 (Retry-After 헤더 우선)
+- checkpoint(JSONL)에 완료된 결과를 바로 기록, 중단 후 다시 실행하면 남은 항목만 처리
+"""
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+import openai
+
+from src.api.rate_limiter import request_priority
+from src.config import (
+    HTTP_RETRY_STATUS,
+    PARALLEL_WORKERS,
+    PARALLEL_MAX_RETRIES,
+    PARALLEL_BACKOFF_FACTOR,
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """재시도할 오류인지 (레이트 리밋, 5xx, 연결/타임아웃)"""
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in HTTP_RETRY_STATUS
+    return isinstance(error, (openai.APIConnectionError, TimeoutError, ConnectionError))
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """응답의 Retry-After 헤더 (초)"""
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, error: BaseException, factor: float = PARALLEL_BACKOFF_FACTOR) -> float:
+    """attempt번째 재시도 전 대기 시간: Retry-After 또는 factor * 2^(attempt-1) + jitter"""
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return retry_after
+    delay = factor * (2 ** (attempt - 1))
+    return delay + random.uniform(0, delay / 2)
+
+
+class Checkpoint:
+    """완료 결과를 한 줄씩 추가하는 JSONL 파일 ({"key": ..., "result": ...})"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> dict:
+        """저장된 결과 (끝부분이 잘린 줄은 무시)"""
+        results = {}
+        if not os.path.exists(self.path):
+            return results
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[row["key"]] = row["result"]
+        return results
+
+    def append(self, key: Hashable, result: Any):
+        line = json.dumps({"key": key, "result": result}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def run_parallel(
+    fn: Callable[[Any], Any],
+    items: Sequence[Any],
+    workers: int = PARALLEL_WORKERS,
+    max_retries: int = PARALLEL_MAX_RETRIES,
+    key: Callable[[int, Any], Hashable] = lambda i, item: i,
+    checkpoint: Optional[str] = None,
+    on_error: Optional[Callable[[Any, BaseException], Any]] = None,
+    on_done: Optional[Callable[[int, Any], None]] = None,
+    priority: Optional[int] = None,
+    keep_checkpoint: bool = False,
+) -> list:
+    """
+    items 각각에 fn 실행 후 입력 순서대로 결과 반환
+    - key: checkpoint에 기록할 항목 식별자 (JSON 직렬화 가능해야 함, 기본: 인덱스)
+    - checkpoint: 지정하면 완료 결과를 기록하고, 이미 기록된 항목은 건너뜀
+      (모든 항목이 성공하면 파일 삭제 → 다음 실행은 처음부터)
+    - on_error: 재시도 후에도 실패한 항목의 대체 결과 생성 (없으면 예외 전파)
+      대체 결과는 checkpoint에 기록하지 않음 (재실행 시 다시 시도)
+    - on_done: 항목 하나가 끝날 때마다 (index, result) 호출 (진행 표시용)
+    - priority: 워커 스레드에서 보내는 OpenFDA 요청 우선순위 (rate_limiter.PRIORITY_*)
+    - keep_checkpoint: 모든 항목이 성공해도 checkpoint 유지 (뒤 단계가 끝난 뒤 호출자가 정리)
+    """
+    store = Checkpoint(checkpoint) if checkpoint else None
+    saved = store.load() if store is not None else {}
+    keys = [key(i, item) for i, item in enumerate(items)]
+    results: list = [None] * len(items)
+    failed = 0
+
+    pending = []
+    for i, item_key in enumerate(keys):
+        if item_key in saved:
+            results[i] = saved[item_key]
+            if on_done is not None:
+                on_done(i, results[i])
+        else:
+            pending.append(i)
+
+    def call(item):
+        attempt = 0
+        while True:
+            try:
+                if priority is None:
+                    return fn(item)
+                with request_priority(priority):
+                    return fn(item)
+            except Exception as e:
+                attempt += 1
+                if attempt > max_retries or not is_retryable(e):
+                    raise
+                time.sleep(backoff_delay(attempt, e))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="parallel-runner") as executor:
+        futures = {executor.submit(call, items[i]): i for i in pending}
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    results[i] = on_error(items[i], e)
+                    failed += 1
+                else:
+                    if store is not None:
+                        store.append(keys[i], results[i])
+                if on_done is not None:
+                    on_done(i, results[i])
+        except BaseException:
+            # 중단(Ctrl+C)/실패 시 대기 중인 항목은 취소, 완료된 결과는 checkpoint에 남음
+            for future in futures:
+                future.cancel()
+            raise
+
+    if store is not None and failed == 0 and not keep_checkpoint:
+        store.remove()
+    return results
@@ -0,0 +1,91 @@
+"""
+Single-flight 호출 병합
+같은 key로 동시에 들어온 호출은 먼저 온 호출 하나만 실행하고, 나머지는 그 결과를 기다려 공유
+(같은 약품 질문이 몰릴 때 OpenFDA/LLM 중복 호출 방지)
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    스레드용 single-flight
+    - 결과는 공유 객체이므로 호출자가 수정하지 않아야 함 (필요하면 복사)
+    - 실행 중 예외는 기다리던 호출에도 그대로 전달
+    - 완료된 호출은 기억하지 않음 (결과 재사용은 캐시의 역할)
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        return {"executed": self.executed, "shared": self.shared, "in_flight": self.in_flight()}
+
+
+class AsyncSingleFlight:
+    """
+    asyncio용 single-flight (이벤트 루프 하나 안에서 사용)
+    기다리는 쪽이 취소되어도 실행 중인 호출은 계속 진행
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.executed += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
@@ -0,0 +1,4 @@
+"""pytest 공통 설정 - src.config는 import 시 필수 환경 변수를 검증하므로 테스트용 값을 먼저 지정"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,70 @@
+"""답변 캐시 정규화 / 정확 일치 / 근사 일치 테스트"""
+import pytest
+
+from src.chain.answer_cache import AnswerCache, normalize_question, _jaccard, _trigrams
+
+
+def _context(question: str) -> dict:
+    return {"question": question, "category": "brand_name", "keyword": "Tylenol", "context": "ctx", "raw_results": []}
+
+
+@pytest.fixture
+def cache():
+    return AnswerCache(maxsize=16, ttl=60, similarity=0.8, enabled=True)
+
+
+def test_normalize_unifies_drug_aliases_and_endings():
+    assert normalize_question("Tylenol은 어떤 약인가요?") == normalize_question("타이레놀은 어떤 약이에요")
+    key, signature = normalize_question("타이레놀 부작용")
+    assert "tylenol" in key
+    assert signature == (("brand_name", "Tylenol"),)
+
+
+def test_exact_hit_returns_answer(cache):
+    cache.store_answer("타이레놀은 어떤 약인가요?", _context("q"), "해열진통제입니다.")
+    hit = cache.lookup("Tylenol은 어떤 약이에요")
+    assert hit is not None
+    assert hit.answer == "해열진통제입니다."
+
+
+@pytest.mark.parametrize(
+    "stored, asked",
+    [
+        (
+            "타이레놀을 복용하고 있는데 저녁에 술을 마셔도 되는지 궁금합니다",
+            "타이레놀을 복용하고 있는데 저녁에 물을 마셔도 되는지 궁금합니다",
+        ),
+        (
+            "성인은 타이레놀을 하루에 최대 몇 알까지 복용할 수 있는지 알려주세요",
+            "성인은 타이레놀을 하루에 최소 몇 알까지 복용할 수 있는지 알려주세요",
+        ),
+    ],
+)
+def test_near_hit_never_returns_other_answer(cache, stored, asked):
+    # 두 질문은 근사 일치 기준을 넘을 만큼 비슷하지만 뜻이 다름
+    assert _jaccard(_trigrams(normalize_question(stored)[0]), _trigrams(normalize_question(asked)[0])) >= 0.8
+
+    cache.store_answer(stored, _context(stored), "저장된 다른 질문의 답변")
+    hit = cache.lookup(asked)
+    assert hit is not None
+    assert hit.answer is None
+    assert hit.context_data["context"] == "ctx"
+    assert cache.near_hits == 1
+
+
+def test_near_hit_requires_same_entities(cache):
+    cache.store_answer("타이레놀을 복용하고 있는데 저녁에 술을 마셔도 되는지 궁금합니다", _context("q"), "답변")
+    assert cache.lookup("애드빌을 복용하고 있는데 저녁에 술을 마셔도 되는지 궁금합니다") is None
+
+
+def test_questions_without_entities_need_exact_match(cache):
+    cache.store_answer("술 마셔도 되는 약이 있는지 알려주세요", _context("q"), "답변")
+    assert cache.lookup("물 마셔도 되는 약이 있는지 알려주세요") is None
+
+
+def test_disabled_cache_neither_stores_nor_returns():
+    cache = AnswerCache(maxsize=16, ttl=60, enabled=False)
+    cache.store_answer("타이레놀 부작용", _context("q"), "답변")
+    assert cache.lookup("타이레놀 부작용") is None
+    cache.enabled = True
+    assert cache.lookup("타이레놀 부작용") is None
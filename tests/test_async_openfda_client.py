@@ -0,0 +1,125 @@
+"""비동기 OpenFDA 클라이언트 fan-out / 루프별 클라이언트 수명 테스트"""
+import asyncio
+import gc
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.api import async_openfda_client
+from src.api.async_openfda_client import AsyncOpenFDAClient, get_async_client, close_async_client, merge_results
+from src.api.cache import TTLCache
+from src.api.rate_limiter import RequestScheduler
+
+LABELS = {
+    "openfda.brand_name": [{"id": "a", "openfda": {"brand_name": ["Tylenol"]}}],
+    "openfda.generic_name": [
+        {"id": "a", "openfda": {"brand_name": ["Tylenol"]}},
+        {"id": "b", "openfda": {"generic_name": ["ACETAMINOPHEN"]}},
+    ],
+}
+
+
+@pytest.fixture
+def base_url():
+    """search 파라미터의 필드에 따라 LABELS를 돌려주는 서버 (없으면 404)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            search = parse_qs(urlparse(self.path).query)["search"][0]
+            results = LABELS.get(search.split(":", 1)[0])
+            body = json.dumps({"results": results} if results else {"error": {"code": "NOT_FOUND"}}).encode()
+            self.send_response(200 if results else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/drug"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_merge_results_keeps_order_and_dedupes():
+    merged = merge_results([[{"id": "a"}, {"id": "b"}], [{"id": "b"}, {"id": "c"}]])
+    assert [label["id"] for label in merged] == ["a", "b", "c"]
+
+
+def test_search_many_fans_out_and_merges(base_url):
+    async def main():
+        async with AsyncOpenFDAClient(cache=TTLCache(maxsize=16, ttl=60)) as client:
+            client.base_url = base_url
+            client.disk_cache = None
+            client.scheduler = RequestScheduler(rate_per_minute=6000, burst=100)
+            return await client.search_many("tylenol")
+
+    results = asyncio.run(main())
+    assert [label.id for label in results] == ["a", "b"]
+
+
+def test_clients_are_per_loop_and_released_with_the_loop():
+    async def open_and_close():
+        client = get_async_client()
+        assert get_async_client() is client
+        await close_async_client()
+        return client
+
+    first = asyncio.run(open_and_close())
+    assert first.http.is_closed
+    assert len(async_openfda_client._async_clients) == 0
+
+    async def leave_open():
+        get_async_client()
+
+    asyncio.run(leave_open())
+    gc.collect()
+    # 닫힌 루프가 해제되면 약한 참조 항목도 사라짐
+    assert len(async_openfda_client._async_clients) == 0
+
+
+def test_make_request_streams_and_retries_per_token():
+    statuses = [429, 200]
+    served = []
+    labels = [{"id": str(i), "openfda": {"brand_name": ["X"]}, "unused": "y" * 1000} for i in range(50)]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            status = statuses[min(len(served), len(statuses) - 1)]
+            served.append(status)
+            body = json.dumps({"results": labels} if status == 200 else {}).encode()
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/drug/label.json"
+
+    async def main():
+        async with AsyncOpenFDAClient() as client:
+            client.scheduler = RequestScheduler(rate_per_minute=6000, burst=100)
+            data = await client._make_request(url, {}, project=lambda label: {"id": label["id"]})
+            return data, client.scheduler.metrics()["daily_used"]
+
+    try:
+        data, tokens = asyncio.run(main())
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert served == [429, 200] and tokens == 2
+    assert data["raw_count"] == 50
+    assert data["results"][0] == {"id": "0"}
@@ -0,0 +1,37 @@
+"""대화 기록 window / 실패 턴 기록 테스트"""
+from src.utils.chat_history import ChatHistory
+
+
+def test_question_is_kept_when_generation_fails():
+    history = ChatHistory(window=3)
+    turn = history.add_question("타이레놀 부작용")
+    assert turn.pending
+
+    history.fail_turn(turn, "답변 생성 중 오류가 발생했습니다: TimeoutError")
+
+    assert [t.question for t in history.turns] == ["타이레놀 부작용"]
+    assert history.turns[0].error.endswith("TimeoutError")
+    assert not history.turns[0].pending
+
+
+def test_complete_turn_records_answer_and_sources():
+    history = ChatHistory(window=3)
+    turn = history.add_question("두통약")
+    results = [{"openfda": {"brand_name": ["Tylenol"], "generic_name": ["acetaminophen"], "manufacturer_name": ["J&J"]}}]
+
+    history.complete_turn(turn, "답변", results, search_info={"category": "indications_and_usage", "keyword": "headache"})
+
+    assert turn.answer == "답변"
+    assert turn.sources == (("Tylenol", "acetaminophen", "J&J"),)
+    assert turn.search_info["keyword"] == "headache"
+
+
+def test_window_overflow_moves_failed_turn_to_summary():
+    history = ChatHistory(window=1)
+    failed = history.add_question("첫 질문")
+    history.fail_turn(failed, "오류")
+    history.add_turn("둘째 질문", "답변")
+
+    assert [t.question for t in history.turns] == ["둘째 질문"]
+    assert history.summaries[0].question == "첫 질문"
+    assert history.summaries[0].answer_preview == "오류"
@@ -0,0 +1,55 @@
+"""디스크 라벨 캐시 stale 판정 / 만료 항목 정리 테스트"""
+import time
+
+from src.api.disk_cache import DiskLabelCache
+from src.api.label_record import LabelRecord
+
+
+def _age(cache, key, seconds):
+    """항목의 저장 시각을 seconds초 전으로 조정"""
+    cache._conn.execute(
+        "UPDATE label_cache SET fetched_at = ? WHERE key = ?", (time.time() - seconds, cache._encode_key(key))
+    )
+    cache._conn.commit()
+
+
+def _rows(cache):
+    return cache._conn.execute("SELECT COUNT(*) FROM label_cache").fetchone()[0]
+
+
+def test_fresh_stale_and_expired(tmp_path):
+    cache = DiskLabelCache(str(tmp_path / "cache.db"), fresh_ttl=10, max_stale=100)
+    label = LabelRecord.from_dict({"id": "a", "openfda": {"brand_name": ["Tylenol"]}})
+    cache.set(["f", "tylenol", 20], [label])
+    assert cache.get(["f", "tylenol", 20]) == ([label], False)
+    _age(cache, ["f", "tylenol", 20], 50)
+    assert cache.get(["f", "tylenol", 20]) == ([label], True)
+    _age(cache, ["f", "tylenol", 20], 500)
+    assert cache.get(["f", "tylenol", 20]) is None
+
+
+def test_expired_rows_are_purged_on_open(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = DiskLabelCache(path, max_stale=100)
+    cache.set("old", [])
+    cache.set("new", [])
+    _age(cache, "old", 500)
+    cache.close()
+
+    reopened = DiskLabelCache(path, max_stale=100)
+    assert _rows(reopened) == 1
+    assert reopened.get("new") == ([], False)
+
+
+def test_set_purges_periodically(tmp_path):
+    cache = DiskLabelCache(str(tmp_path / "cache.db"), max_stale=100, purge_interval=3600)
+    cache.set("old", [])
+    _age(cache, "old", 500)
+    cache.set("other", [])
+    # 정리 주기 전이므로 남아 있음
+    assert _rows(cache) == 2
+
+    cache._next_purge = 0.0
+    cache.set("another", [])
+    assert _rows(cache) == 2
+    assert cache.get("old") is None
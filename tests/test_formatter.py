@@ -0,0 +1,68 @@
+"""토큰 예산 기반 컨텍스트 구성(build_context) 테스트"""
+from src.api.formatter import FIELD_TOKEN_CAP, build_context, estimate_tokens
+
+
+def _label(i: int, **fields) -> dict:
+    label = {
+        "openfda": {
+            "brand_name": [f"Brand{i}"],
+            "generic_name": [f"generic{i}"],
+            "manufacturer_name": [f"Maker{i}"],
+        },
+    }
+    label.update({field: [value] for field, value in fields.items()})
+    return label
+
+
+def _long(word: str, words: int = 1000) -> str:
+    return " ".join([word] * words)
+
+
+def test_identity_fields_survive_tiny_budget():
+    results = [_label(i, warnings=_long("warn"), indications_and_usage=_long("use")) for i in range(3)]
+
+    context = build_context(results, token_budget=10)
+
+    for i in range(3):
+        assert f"[Brand Name] Brand{i}" in context
+        assert f"[Manufacturer] Maker{i}" in context
+    assert "[Warnings]" not in context
+    assert "[Indications and Usage]" not in context
+
+
+def test_long_field_is_capped_and_cut_at_word_boundary():
+    context = build_context([_label(0, warnings=_long("warning"))], category="brand_name")
+
+    line = next(l for l in context.splitlines() if l.startswith("[Warnings] "))
+    value = line[len("[Warnings] "):]
+    assert value.endswith("warning...")
+    assert estimate_tokens(value) <= FIELD_TOKEN_CAP + 1
+
+
+def test_higher_weight_field_wins_when_budget_is_short():
+    results = [_label(0, indications_and_usage=_long("use"), warnings=_long("warn"))]
+    identity_only = estimate_tokens(build_context(results, category="indication", token_budget=0))
+
+    context = build_context(results, category="indication", token_budget=identity_only + 60)
+
+    assert "[Indications and Usage]" in context
+    assert "[Warnings]" not in context
+
+
+def test_question_hint_enables_zero_weight_field():
+    results = [_label(0, storage_and_handling="Store at room temperature.")]
+
+    assert "[Storage and Handling]" not in build_context(results, question="타이레놀 효능")
+    assert "[Storage and Handling]" in build_context(results, question="타이레놀 보관 방법")
+
+
+def test_context_stays_near_budget():
+    results = [
+        _label(i, **{field: _long(field) for field in ("purpose", "indications_and_usage", "warnings", "do_not_use")})
+        for i in range(5)
+    ]
+
+    context = build_context(results, token_budget=800)
+
+    # 줄바꿈/구분자는 예산에 포함하지 않으므로 약간의 여유만 허용
+    assert estimate_tokens(context) <= 800 * 1.1
@@ -0,0 +1,73 @@
+"""스트리밍 JSON 파서(iter_array_items) 테스트 - 청크 경계와 관계없이 json.loads와 같은 결과"""
+import asyncio
+import io
+import json
+
+import pytest
+
+from src.api.json_stream import aiter_array_items, iter_array_items
+
+CHUNK_SIZES = [1, 2, 3, 5, 7, 64, 1 << 16]
+
+DOCUMENTS = [
+    '{"results": [1.5, 2e3, {"a": 1.25}]}',
+    '{"results": [-0.5, 1E-7, 12345678901234567890, 3.0e+10, 0]}',
+    '{"meta": {"skip": 0, "nested": [1, [2, {"x": "]"}]]}, "results": [{"id": "a"}, {"id": "b"}]}',
+    '{"results": [{"text": "괄호 ] } [ { 와 \\"따옴표\\", 역슬래시 \\\\ 포함"}, "\\u0041\\n"]}',
+    '{"results": [true, false, null, {"deep": {"deeper": {"list": [1, 2, 3]}}}]}',
+    '{ "results" : [ { "id" : "a" } , { "id" : "b" } ] , "meta" : { } }',
+    '{"results": []}',
+]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_matches_json_loads(document, chunk_size):
+    expected = json.loads(document)["results"]
+    assert list(iter_array_items(io.StringIO(document), chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_missing_key_yields_nothing(chunk_size):
+    document = '{"meta": {"results": [1, 2]}, "error": {"code": "NOT_FOUND"}}'
+    assert list(iter_array_items(io.StringIO(document), chunk_size=chunk_size)) == []
+    assert list(iter_array_items(io.StringIO("{}"), chunk_size=chunk_size)) == []
+
+
+def test_custom_key():
+    document = '{"results": [1], "partitions": [{"file": "a.zip"}]}'
+    assert list(iter_array_items(io.StringIO(document), key="partitions", chunk_size=4)) == [{"file": "a.zip"}]
+
+
+def test_items_are_yielded_lazily():
+    reads = []
+
+    class Recorder(io.StringIO):
+        def read(self, size=-1):
+            reads.append(size)
+            return super().read(size)
+
+    document = '{"results": [' + ", ".join(['{"id": "%d"}' % i for i in range(1000)]) + "]}"
+    items = iter_array_items(Recorder(document), chunk_size=64)
+    assert next(items) == {"id": "0"}
+    assert len(reads) < 5
+
+
+@pytest.mark.parametrize("document", ['{"results": [1, 2', '{"results": [1 2]}', '[1, 2]'])
+def test_malformed_input_raises(document):
+    with pytest.raises(ValueError):
+        list(iter_array_items(io.StringIO(document), chunk_size=3))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_async_reader_matches_sync(document, chunk_size):
+    async def chunks():
+        for i in range(0, len(document), chunk_size):
+            yield ""
+            yield document[i:i + chunk_size]
+
+    async def collect():
+        return [item async for item in aiter_array_items(chunks())]
+
+    assert asyncio.run(collect()) == json.loads(document)["results"]
@@ -0,0 +1,37 @@
+"""Homeopathy / 비승인 의약품 필터 테스트"""
+import pytest
+
+from src.api.label_filter import LabelFilter, default_filter
+from src.api.openfda_client import project_approved
+
+APPROVED = {
+    "id": "a",
+    "openfda": {"brand_name": ["Tylenol"], "product_type": ["HUMAN OTC DRUG"], "application_number": ["M013"]},
+    "spl_product_data_elements": ["acetaminophen tablet"],
+}
+
+
+@pytest.mark.parametrize(
+    "label",
+    [
+        {"id": "x"},
+        {"id": "x", "openfda": {"product_type": ["HUMAN OTC DRUG"]}},
+        {"id": "x", "openfda": {"product_type": ["Homeopathic"], "application_number": ["1"]}},
+        dict(APPROVED, spl_product_data_elements=["arnica", "UNAPPROVED HOMEOPATHIC tablets"]),
+    ],
+)
+def test_unapproved_labels(label):
+    assert default_filter.is_unapproved(label)
+    assert project_approved(label) is None
+
+
+def test_approved_label_is_kept_and_projected():
+    assert not default_filter.is_unapproved(APPROVED)
+    assert project_approved(APPROVED).brand_name == ["Tylenol"]
+
+
+def test_custom_markers_and_batch_filter():
+    label_filter = LabelFilter(markers=("Acetaminophen",))
+    assert label_filter.filter([APPROVED, dict(APPROVED, spl_product_data_elements=[])]) == [
+        dict(APPROVED, spl_product_data_elements=[])
+    ]
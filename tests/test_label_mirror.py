@@ -0,0 +1,59 @@
+"""로컬 라벨 미러(SQLite) 적재 / 버전 갱신 테스트"""
+import json
+
+from src.api.label_mirror import LabelMirror, ingest_files
+
+
+def _label(label_id, set_id, version, brand="TYLENOL"):
+    return {
+        "id": label_id,
+        "set_id": set_id,
+        "version": str(version),
+        "effective_time": "2024010%d" % version,
+        "openfda": {
+            "brand_name": [brand],
+            "generic_name": ["ACETAMINOPHEN"],
+            "product_type": ["HUMAN OTC DRUG"],
+            "application_number": ["NDA000000"],
+        },
+        "indications_and_usage": ["temporarily relieves minor aches and pains"],
+    }
+
+
+def _rows(mirror):
+    return mirror._connect().execute("SELECT id, set_id, version FROM labels ORDER BY id").fetchall()
+
+
+def test_newer_version_replaces_row(tmp_path):
+    mirror = LabelMirror(str(tmp_path / "mirror.db"))
+    mirror.ingest_labels([_label("a", "s1", 1)])
+    stats = mirror.ingest_labels([_label("b", "s1", 2), _label("a-old", "s1", 1)])
+    assert (stats.updated, stats.unchanged) == (1, 1)
+    assert _rows(mirror) == [("b", "s1", 2)]
+
+
+def test_id_moved_to_other_set_id(tmp_path):
+    mirror = LabelMirror(str(tmp_path / "mirror.db"))
+    mirror.ingest_labels([_label("a", "s1", 1)])
+    stats = mirror.ingest_labels([_label("a", "s2", 1)])
+    assert stats.updated == 1
+    assert _rows(mirror) == [("a", "s2", 1)]
+    assert mirror.search_drug_label("openfda.brand_name", "tylenol")[0].id == "a"
+
+
+def test_id_moved_onto_existing_set_id(tmp_path):
+    mirror = LabelMirror(str(tmp_path / "mirror.db"))
+    mirror.ingest_labels([_label("a", "s1", 1), _label("b", "s2", 1, brand="ADVIL")])
+    stats = mirror.ingest_labels([_label("a", "s2", 2)])
+    assert (stats.updated, stats.removed) == (1, 1)
+    assert _rows(mirror) == [("a", "s2", 2)]
+
+
+def test_ingest_files_reports_progress(tmp_path):
+    path = tmp_path / "labels.json"
+    path.write_text(json.dumps({"results": [_label("a", "s1", 1)]}), encoding="utf-8")
+    mirror = LabelMirror(str(tmp_path / "mirror.db"))
+    messages = []
+    stats = ingest_files(mirror, [str(path)], on_progress=messages.append)
+    assert stats.inserted == 1
+    assert messages and "labels.json" in messages[0]
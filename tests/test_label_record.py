@@ -0,0 +1,30 @@
+"""라벨 레코드(LabelRecord) 변환 / 동등성 테스트"""
+from src.api.label_record import LabelRecord
+
+LABEL = {
+    "id": "a",
+    "set_id": "s1",
+    "openfda": {"brand_name": ["Tylenol"], "generic_name": ["ACETAMINOPHEN"]},
+    "indications_and_usage": ["temporarily relieves minor aches and pains"],
+}
+
+
+def test_records_with_same_content_are_equal_and_hashable():
+    first, second = LabelRecord.from_dict(LABEL), LabelRecord.from_dict(dict(LABEL))
+    assert first == second
+    assert len({first, second}) == 1
+    assert {first: 1}[second] == 1
+
+
+def test_records_with_different_content_are_distinct():
+    other = LabelRecord.from_dict({**LABEL, "id": "b"})
+    assert other != LabelRecord.from_dict(LABEL)
+    assert len({other, LabelRecord.from_dict(LABEL)}) == 2
+
+
+def test_dict_compatible_access():
+    record = LabelRecord.from_dict(LABEL)
+    assert record.get("openfda", {}).get("brand_name") == ["Tylenol"]
+    assert record["id"] == "a" and "set_id" in record
+    assert record.brand_keys == ("tylenol",)
+    assert LabelRecord.from_dict(record.to_dict()) == record
@@ -0,0 +1,59 @@
+"""브랜드/성분명 색인 (오타 보정 / 재구축) 테스트"""
+import pytest
+
+from src.api import name_index
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(name_index, "LABEL_BACKEND", "api")
+    monkeypatch.setattr(name_index, "_index", None)
+    monkeypatch.setattr(name_index, "_index_retry_at", 0.0)
+
+
+def _api_source(*brands):
+    return {
+        "openfda.brand_name": [(brand, 10) for brand in brands],
+        "openfda.generic_name": [("acetaminophen", 10)] if brands else [],
+    }
+
+
+def test_correct_typo_and_prefix():
+    index = name_index.NameIndex()
+    index.add_names("openfda.brand_name", [("Tylenol", 5), ("Advil", 3)])
+    index.build()
+    assert index.correct("openfda.brand_name", "tylenal") == "tylenol"
+    assert index.correct("openfda.brand_name", "advi") == "advil"
+    assert index.correct("openfda.brand_name", "tylenol") is None
+
+
+def test_empty_api_source_is_rebuilt_after_retry(monkeypatch, fresh_index):
+    sources = iter([_api_source(), _api_source("zyrtecx")])
+    monkeypatch.setattr(name_index, "_api_names", lambda: next(sources))
+
+    first = name_index.get_name_index()
+    assert not first.complete
+    # 재시도 시각 전에는 기존 색인 유지
+    assert name_index.get_name_index() is first
+
+    monkeypatch.setattr(name_index, "_index_retry_at", 0.0)
+    second = name_index.get_name_index()
+    assert second is not first and second.complete
+    assert "zyrtecx" in second._vocabularies["openfda.brand_name"]
+    assert name_index.get_name_index() is second
+
+
+def test_api_names_use_background_priority(monkeypatch):
+    from src.api import openfda_client
+    from src.api.rate_limiter import PRIORITY_BACKGROUND, current_priority
+
+    seen = []
+
+    class FakeClient:
+        def count_field(self, field, limit):
+            seen.append(current_priority())
+            return [{"term": "TYLENOL", "count": 1}]
+
+    monkeypatch.setattr(openfda_client, "get_client", lambda: FakeClient())
+    name_index._api_names()
+    assert seen == [PRIORITY_BACKGROUND, PRIORITY_BACKGROUND]
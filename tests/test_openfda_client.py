@@ -0,0 +1,74 @@
+"""OpenFDA 동기 클라이언트 재시도 / 요청 한도 테스트 (로컬 HTTP 서버 사용)"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.api.openfda_client import OpenFDAClient
+from src.api.rate_limiter import RequestScheduler
+
+
+@pytest.fixture
+def server():
+    """응답 상태 코드 목록을 차례로 돌려주는 서버 (마지막 값 반복)"""
+    state = {"statuses": [200], "requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            index = min(state["requests"], len(state["statuses"]) - 1)
+            state["requests"] += 1
+            status = state["statuses"][index]
+            body = json.dumps({"results": [{"id": "a"}]} if status == 200 else {"error": {}}).encode()
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{httpd.server_address[1]}/drug/label.json"
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(max_retries=3):
+    scheduler = RequestScheduler(rate_per_minute=6000, burst=100, daily_limit=1000)
+    return OpenFDAClient(max_retries=max_retries, backoff_factor=0, scheduler=scheduler)
+
+
+def test_each_attempt_consumes_a_token(server):
+    server["statuses"] = [429]
+    client = _client()
+    result = client._send_request(server["url"])
+    assert "error" in result
+    assert server["requests"] == 4
+    assert client.scheduler.metrics()["daily_used"] == 4
+
+
+def test_retry_then_success(server):
+    server["statuses"] = [503, 429, 200]
+    client = _client()
+    assert client._send_request(server["url"])["results"] == [{"id": "a"}]
+    assert server["requests"] == client.scheduler.metrics()["daily_used"] == 3
+
+
+def test_not_found_is_not_retried(server):
+    server["statuses"] = [404]
+    client = _client()
+    assert client._send_request(server["url"])["error"] == "No results found"
+    assert server["requests"] == 1
+
+
+def test_projected_streaming_response(server):
+    client = _client()
+    result = client._send_request(server["url"], project=lambda label: {"id": label["id"].upper()})
+    assert result == {"results": [{"id": "A"}], "raw_count": 1}
@@ -0,0 +1,52 @@
+"""BM25F 재정렬(bm25_rerank) 순서 테스트"""
+from src.optimizations import bm25_rerank
+
+
+def _label(name: str, brand: str = "", generic: str = "", **fields) -> dict:
+    label = {"id": name, "openfda": {}}
+    if brand:
+        label["openfda"]["brand_name"] = [brand]
+    if generic:
+        label["openfda"]["generic_name"] = [generic]
+    label.update({field: [value] for field, value in fields.items()})
+    return label
+
+
+def _ids(results):
+    return [r["id"] for r in results]
+
+
+def test_brand_match_outranks_indication_mention():
+    results = [
+        _label("mention", brand="Other", indications_and_usage="may be used with tylenol for pain relief"),
+        _label("brand", brand="Tylenol", indications_and_usage="for temporary relief of minor aches"),
+    ]
+    assert _ids(bm25_rerank(results, "tylenol")) == ["brand", "mention"]
+
+
+def test_shorter_section_wins_for_same_term_frequency():
+    filler = " ".join(["minor aches and pains due to the common cold"] * 20)
+    results = [
+        _label("long", purpose=f"headache {filler}"),
+        _label("short", purpose="headache"),
+        _label("none", purpose="antacid"),
+    ]
+    assert _ids(bm25_rerank(results, "headache")) == ["short", "long", "none"]
+
+
+def test_rare_term_weighs_more_than_common_term():
+    results = [
+        _label("common", purpose="pain reliever"),
+        _label("rare", purpose="fever reducer"),
+        _label("common2", purpose="pain reliever"),
+        _label("common3", purpose="pain reliever"),
+    ]
+    assert _ids(bm25_rerank(results, "pain fever"))[0] == "rare"
+
+
+def test_ties_and_no_match_keep_original_order():
+    results = [_label("a", purpose="antacid"), _label("b", purpose="laxative")]
+    assert _ids(bm25_rerank(results, "headache")) == ["a", "b"]
+
+    same = [_label("x", brand="Advil"), _label("y", brand="Advil")]
+    assert _ids(bm25_rerank(same, "advil")) == ["x", "y"]
@@ -0,0 +1,19 @@
+"""최적화 RAG 체인 검색 결과(Retrieval) 직렬화 테스트"""
+import json
+
+from src.chain.optimized_rag_chain import Retrieval
+from src.api.label_record import LabelRecord
+
+
+def test_retrieval_round_trips_through_json():
+    label = LabelRecord.from_dict({
+        "id": "a",
+        "set_id": "s1",
+        "openfda": {"brand_name": ["Tylenol"], "generic_name": ["ACETAMINOPHEN"]},
+        "warnings": ["Liver warning"],
+    })
+    retrieval = Retrieval("타이레놀 부작용은?", "brand_name", "Tylenol", [label])
+
+    restored = Retrieval.from_dict(json.loads(json.dumps(retrieval.to_dict(), ensure_ascii=False)))
+    assert restored == retrieval
+    assert restored.results[0].brand_keys == ("tylenol",)
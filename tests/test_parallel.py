@@ -0,0 +1,98 @@
+"""병렬 실행 / 체크포인트 재개 테스트"""
+import threading
+
+import pytest
+
+from src.utils.parallel import Checkpoint, run_parallel
+
+
+def test_results_keep_input_order():
+    assert run_parallel(lambda x: x * 2, [3, 1, 2], workers=3) == [6, 2, 4]
+
+
+def test_resume_skips_checkpointed_items(tmp_path):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    calls = []
+    lock = threading.Lock()
+
+    def fn(item):
+        with lock:
+            calls.append(item)
+        if item == "c":
+            raise KeyboardInterrupt
+        return item.upper()
+
+    with pytest.raises(KeyboardInterrupt):
+        run_parallel(fn, ["a", "b", "c"], workers=1, key=lambda i, item: item, checkpoint=path)
+    assert calls == ["a", "b", "c"]
+    assert Checkpoint(path).load() == {"a": "A", "b": "B"}
+
+    results = run_parallel(lambda item: item.upper(), ["a", "b", "c"], workers=2, key=lambda i, item: item, checkpoint=path)
+    assert results == ["A", "B", "C"]
+    # 모든 항목이 성공하면 checkpoint 삭제
+    assert not (tmp_path / "run.checkpoint.jsonl").exists()
+
+
+def test_resume_calls_only_pending_items(tmp_path):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    Checkpoint(path).append(0, "saved")
+    done = []
+    calls = []
+
+    results = run_parallel(lambda x: calls.append(x) or x, [10, 20], checkpoint=path, on_done=lambda i, r: done.append(i))
+    assert results == ["saved", 20]
+    assert calls == [20]
+    assert sorted(done) == [0, 1]
+
+
+def test_failed_items_are_not_checkpointed(tmp_path):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+
+    def fn(x):
+        if x == 2:
+            raise ValueError("bad")
+        return x
+
+    results = run_parallel(fn, [1, 2], checkpoint=path, on_error=lambda item, e: f"error: {e}")
+    assert results == [1, "error: bad"]
+    # 실패 항목이 있으면 파일 유지, 실패 항목은 다음 실행에서 다시 시도
+    assert Checkpoint(path).load() == {0: 1}
+
+
+def test_truncated_checkpoint_line_is_ignored(tmp_path):
+    path = tmp_path / "run.checkpoint.jsonl"
+    path.write_text('{"key": 0, "result": "ok"}\n{"key": 1, "res', encoding="utf-8")
+    assert Checkpoint(str(path)).load() == {0: "ok"}
+
+
+def test_retryable_errors_are_retried(monkeypatch):
+    monkeypatch.setattr("src.utils.parallel.backoff_delay", lambda attempt, error: 0)
+    attempts = []
+
+    def flaky(x):
+        attempts.append(x)
+        if len(attempts) < 3:
+            raise TimeoutError
+        return x
+
+    assert run_parallel(flaky, [7], max_retries=3) == [7]
+    assert len(attempts) == 3
+
+
+
+def test_non_retryable_errors_propagate_immediately():
+    attempts = []
+
+    def broken(x):
+        attempts.append(x)
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        run_parallel(broken, [1])
+    assert attempts == [1]
+
+
+def test_keep_checkpoint_after_success(tmp_path):
+    path = tmp_path / "run.checkpoint.jsonl"
+    assert run_parallel(lambda x: x, [1, 2], checkpoint=str(path), keep_checkpoint=True) == [1, 2]
+    assert Checkpoint(str(path)).load() == {0: 1, 1: 2}
@@ -0,0 +1,67 @@
+"""RAG 체인 분류 병합 / 배치 검색 그룹화 테스트 (LLM/OpenFDA 호출은 대체)"""
+import asyncio
+import threading
+
+from src.chain import rag_chain
+
+
+def test_async_classify_flight_is_per_loop(monkeypatch):
+    calls = []
+    barrier = threading.Barrier(2)
+
+    async def fake_classifier(question):
+        calls.append(id(asyncio.get_running_loop()))
+        await asyncio.sleep(0.05)
+        return {"category": "brand_name", "keyword": "Tylenol"}
+
+    monkeypatch.setattr(rag_chain, "_ainvoke_classifier", fake_classifier)
+
+    async def classify_twice():
+        return await asyncio.gather(*(rag_chain._aclassify_with_llm("타이레놀 뭐예요") for _ in range(2)))
+
+    results, errors = [], []
+
+    def run_loop():
+        barrier.wait()
+        try:
+            results.extend(asyncio.run(classify_twice()))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run_loop) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert not errors
+    # 루프마다 한 번씩 실행, 같은 루프 안의 두 호출은 병합
+    assert len(calls) == 2 and len(set(calls)) == 2
+    assert [r["keyword"] for r in results] == ["Tylenol"] * 4
+
+
+def test_answer_batch_groups_identical_searches(monkeypatch):
+    classifications = {
+        "타이레놀 부작용": {"category": "brand_name", "keyword": "Tylenol"},
+        "타이레놀 용량": {"category": "brand_name", "keyword": "tylenol"},
+        "애드빌 부작용": {"category": "brand_name", "keyword": "Advil"},
+    }
+    searches = []
+
+    def fake_search(category, keyword):
+        searches.append((category, keyword.lower()))
+        return []
+
+    monkeypatch.setattr(rag_chain, "_cached_context", lambda question: None)
+    monkeypatch.setattr(rag_chain, "_classify_batch", lambda questions, concurrency: [classifications[q] for q in questions])
+    monkeypatch.setattr(rag_chain, "_search_labels", fake_search)
+    monkeypatch.setattr(rag_chain, "generate_answer", lambda context_data: f"답변: {context_data['question']}")
+
+    questions = ["타이레놀 부작용", "타이레놀 용량", "애드빌 부작용", "타이레놀 부작용"]
+    answers = sorted(rag_chain.answer_batch(questions, concurrency=2), key=lambda a: a.index)
+
+    # (category, keyword) 그룹당 한 번만 검색 (키워드 대소문자 무시)
+    assert sorted(searches) == [("brand_name", "advil"), ("brand_name", "tylenol")]
+    assert [a.index for a in answers] == [0, 1, 2, 3]
+    assert [a.answer for a in answers] == [f"답변: {q}" for q in questions]
+    assert all(a.error is None for a in answers)
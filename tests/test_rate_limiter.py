@@ -0,0 +1,146 @@
+"""OpenFDA 요청 스케줄러 (레이트 리밋 / 우선순위) 테스트"""
+import asyncio
+import threading
+import time
+
+from src.api.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    RequestScheduler,
+    current_priority,
+    request_priority,
+)
+
+
+def _drained(rate_per_minute=600, daily_limit=1000, burst=1):
+    """토큰을 모두 쓴 스케줄러 (다음 토큰은 60/rate_per_minute초 후)"""
+    scheduler = RequestScheduler(rate_per_minute=rate_per_minute, burst=burst, daily_limit=daily_limit, queue_timeout=5)
+    for _ in range(burst):
+        assert scheduler.acquire(timeout=0)
+    return scheduler
+
+
+def _wait_for_queue(scheduler, depth):
+    deadline = time.monotonic() + 2
+    while scheduler.metrics()["queue_depth"] < depth:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_request_priority_context():
+    assert current_priority() == PRIORITY_INTERACTIVE
+    with request_priority(PRIORITY_BACKGROUND):
+        assert current_priority() == PRIORITY_BACKGROUND
+    assert current_priority() == PRIORITY_INTERACTIVE
+
+
+def test_threads_granted_in_priority_order():
+    scheduler = _drained()
+    order = []
+
+    def worker(name, priority):
+        assert scheduler.acquire(priority=priority)
+        order.append(name)
+
+    threads = []
+    for name, priority in [("background", PRIORITY_BACKGROUND), ("batch", PRIORITY_BATCH)]:
+        threads.append(threading.Thread(target=worker, args=(name, priority)))
+        threads[-1].start()
+        _wait_for_queue(scheduler, len(threads))
+    threads.append(threading.Thread(target=worker, args=("interactive", PRIORITY_INTERACTIVE)))
+    threads[-1].start()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["interactive", "batch", "background"]
+    assert scheduler.stats.throttled == 3
+
+
+def test_async_waiters_share_priority_queue_with_threads():
+    scheduler = _drained()
+    order = []
+
+    def thread_worker():
+        assert scheduler.acquire(priority=PRIORITY_BACKGROUND)
+        order.append("thread-background")
+
+    async def main():
+        thread = threading.Thread(target=thread_worker)
+        thread.start()
+        await asyncio.to_thread(_wait_for_queue, scheduler, 1)
+
+        async def task(name, priority):
+            assert await scheduler.acquire_async(priority=priority)
+            order.append(name)
+
+        active_threads = threading.active_count()
+        tasks = [
+            asyncio.create_task(task("async-batch", PRIORITY_BATCH)),
+            asyncio.create_task(task("async-interactive", PRIORITY_INTERACTIVE)),
+        ]
+        await asyncio.sleep(0.01)
+        # 비동기 대기자는 워커 스레드를 쓰지 않음
+        assert threading.active_count() == active_threads
+        await asyncio.gather(*tasks)
+        await asyncio.to_thread(thread.join, 5)
+
+    asyncio.run(main())
+    assert order == ["async-interactive", "async-batch", "thread-background"]
+
+
+def test_async_timeout_and_cancel_leave_queue_clean():
+    scheduler = _drained(rate_per_minute=6)
+
+    async def main():
+        assert not await scheduler.acquire_async(timeout=0.05)
+        task = asyncio.create_task(scheduler.acquire_async())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(main())
+    metrics = scheduler.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["rejected"] == 1
+
+
+def test_daily_limit_rejects_waiters():
+    scheduler = _drained(daily_limit=1)
+    assert not scheduler.acquire(timeout=1)
+    assert not asyncio.run(scheduler.acquire_async(timeout=1))
+    assert scheduler.stats.rejected == 2
+
+
+def test_coalesce_shares_in_flight_call():
+    scheduler = RequestScheduler()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"results": [1]}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(scheduler.coalesce("url", fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(scheduler.coalesce("url", fetch))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while scheduler.metrics()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"results": [1]}] * 4
+    assert scheduler.metrics()["coalesced"] == 3
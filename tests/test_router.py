@@ -0,0 +1,67 @@
+"""로컬 라우터 분류 결정 테스트"""
+import pytest
+
+from src.chain.router import route, extract_candidate, get_router
+
+
+@pytest.mark.parametrize(
+    "question, expected",
+    [
+        ("타이레놀 부작용", ("brand_name", "Tylenol")),
+        ("ibuprofen dosage", ("generic_name", "ibuprofen")),
+        ("아세트아미노펜 하루 최대 용량", ("generic_name", "acetaminophen")),
+        ("두통약 추천", ("indication", "headache")),
+        ("머리가 아플 때 먹는 약", ("indication", "headache")),
+        ("이가 아플 때 먹는 약", ("indication", "toothache")),
+        ("어제부터 이가아파서 진통제 찾아요", ("indication", "toothache")),
+        ("what medicine helps a headache", ("indication", "headache")),
+    ],
+)
+def test_routes_unambiguous_questions(question, expected):
+    routed = route(question)
+    assert routed is not None
+    assert (routed["category"], routed["keyword"]) == expected
+    assert routed["question"] == question
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        # 제외/대체 표현
+        "타이레놀 말고 두통에 좋은 약은?",
+        "애드빌 빼고 진통제 추천",
+        "타이레놀 대신 먹을 수 있는 약",
+        "아스피린 제외하고 알려줘",
+        "Tylenol instead of Advil",
+        # 약품 + 증상 동시 언급
+        "타이레놀은 두통에 효과 있나요?",
+        # 의약품이 아닌 주제 / 의약품 표현 없음
+        "감기에 좋은 음식 추천해줘",
+        "두통에 좋은 운동",
+        "두통",
+        # 약품 여러 개
+        "타이레놀과 애드빌 차이",
+        # 구 별칭이 앞 단어와 겹치는 경우 ("아이가" ⊃ "이가")
+        "아이가 아플 때 먹는 약",
+        "우리 아이가 아파요 무슨 약을 먹여야 하나요",
+        "",
+    ],
+)
+def test_defers_ambiguous_questions_to_llm(question):
+    assert route(question) is None
+
+
+@pytest.mark.parametrize("question", ["ㅋㅋㅋㅋ", "????", "aaaaaa"])
+def test_gibberish_is_invalid(question):
+    assert route(question)["category"] == "invalid"
+
+
+def test_english_alias_matches_whole_words_only():
+    assert get_router().find_matches("tumsy and stums") == []
+    assert get_router().find_matches("tums, please") == [("brand_name", "Tums")]
+
+
+def test_extract_candidate_prefers_drug_over_symptom():
+    assert extract_candidate("타이레놀은 두통에 효과 있나요?") == ("brand_name", "Tylenol")
+    assert extract_candidate("감기에 좋은 음식 추천해줘") == ("indication", "common cold")
+    assert extract_candidate("what is zzyzxal used for") == ("brand_name", "zzyzxal")
@@ -0,0 +1,68 @@
+"""ASGI 서버 엔드포인트 테스트 (Starlette TestClient, 외부 호출 없음)"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import server
+from src.chain import llm_registry
+
+
+def test_health_reports_registry_stats():
+    llm_registry.get_chat_model("gpt-4o-mini", temperature=0.0)
+    llm_registry.get_chat_model("gpt-4o-mini", temperature=0.0)
+    with TestClient(server.app) as client:
+        body = client.get("/health").json()
+    assert body["status"] == "ok"
+    assert body["llm_registry"]["reused"] >= 1
+    assert {"scheduler", "cache"} <= body.keys()
+
+
+def _slow_app(delay: float, limit: int, queue_timeout: float) -> Starlette:
+    async def slow(request):
+        await asyncio.sleep(delay)
+        return JSONResponse({"ok": True})
+
+    async def health(request):
+        return JSONResponse({"status": "ok"})
+
+    return Starlette(
+        routes=[Route("/slow", slow), Route("/health", health)],
+        middleware=[Middleware(server.ConcurrencyLimitMiddleware, limit=limit, queue_timeout=queue_timeout)],
+    )
+
+
+def test_concurrency_limit_returns_503_when_queue_times_out():
+    with TestClient(_slow_app(delay=0.5, limit=1, queue_timeout=0.05)) as client:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(client.get, "/slow")
+            time.sleep(0.1)
+            second = pool.submit(client.get, "/slow")
+            health = client.get("/health")
+            statuses = sorted([first.result().status_code, second.result().status_code])
+
+    assert statuses == [200, 503]
+    assert health.status_code == 200
+
+
+def test_concurrency_limit_releases_slot_after_response():
+    with TestClient(_slow_app(delay=0.0, limit=1, queue_timeout=0.05)) as client:
+        assert [client.get("/slow").status_code for _ in range(3)] == [200, 200, 200]
+
+
+def test_context_endpoint_returns_504_on_timeout(monkeypatch):
+    async def slow_prepare(question):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(server, "aprepare_context", slow_prepare)
+    monkeypatch.setattr(server, "SERVER_REQUEST_TIMEOUT", 0.05)
+    with TestClient(server.app) as client:
+        response = client.post("/context", json={"question": "타이레놀 부작용"})
+
+    assert response.status_code == 504
+    assert "error" in response.json()
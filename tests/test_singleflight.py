@@ -0,0 +1,113 @@
+"""동일 요청 병합(single-flight) 테스트"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _run_concurrently(flight, key, fn, count):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return "label"
+
+    threads, results, errors = _run_concurrently(flight, "tylenol", fn, 5)
+    deadline = time.monotonic() + 2
+    while flight.shared < 4 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["label"] * 5 and not errors
+    assert flight.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+
+def test_error_propagates_to_waiters_and_is_not_remembered():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, results, errors = _run_concurrently(flight, "key", fail, 3)
+    deadline = time.monotonic() + 2
+    while flight.shared < 2 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert not results and len(errors) == 3
+    assert all(isinstance(e, ValueError) for e in errors)
+    # 완료된 호출은 기억하지 않으므로 다음 호출은 새로 실행
+    assert flight.do("key", lambda: "retry") == "retry"
+    assert flight.executed == 2
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats() == {"executed": 2, "shared": 0, "in_flight": 0}
+
+
+def test_async_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"results": []}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("url", fetch) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"executed": 1, "shared": 3, "in_flight": 0}
+
+
+def test_async_cancelled_waiter_does_not_cancel_call():
+    flight = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.create_task(flight.do("url", fetch))
+        second = asyncio.create_task(flight.do("url", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"